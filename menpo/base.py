@@ -27,6 +27,27 @@ class Copyable(object):
     Interface that provides a single method for copying classes very
     efficiently.
     """
+    # no instance state of its own, so that subclasses may use __slots__
+    __slots__ = ()
+    # instance attributes that only cache state derived from the rest of
+    # the object - they are rebuilt on demand, so are neither copied nor
+    # pickled
+    _cache_attrs = ()
+
+    def __getstate__(self):
+        try:
+            state = self.__dict__
+        except AttributeError:
+            # slotted subclasses without a __dict__ - pickle the slots as
+            # the default protocol does
+            slots = {}
+            for cls in type(self).__mro__:
+                for k in cls.__dict__.get('__slots__', ()):
+                    if hasattr(self, k):
+                        slots[k] = getattr(self, k)
+            return None, slots
+        return dict((k, v) for k, v in state.items()
+                    if k not in self._cache_attrs)
 
     def copy(self):
         r"""
@@ -37,7 +58,8 @@ class Copyable(object):
         and everything else will be assigned (no copy will be made).
 
         Classes that store state other than numpy arrays and immutable types
-        should overwrite this method to ensure all state is copied.
+        should overwrite this method to ensure all state is copied. Attributes
+        listed in ``_cache_attrs`` are not copied.
 
         Returns
         -------
@@ -49,6 +71,8 @@ class Copyable(object):
         # print('copy called on {}'.format(type(self).__name__))
         new = self.__class__.__new__(self.__class__)
         for k, v in self.__dict__.items():
+            if k in self._cache_attrs:
+                continue
             try:
                 new.__dict__[k] = v.copy()
                 # if not isinstance(v, Copyable):
@@ -68,6 +92,7 @@ class Vectorizable(Copyable):
     statistical analysis of objects, which commonly requires the data
     to be provided as a single vector.
     """
+    __slots__ = ()
 
     @property
     def n_parameters(self):
@@ -10,7 +10,7 @@ from menpo.shape import PointCloud
 from menpo.landmark import Landmarkable
 from menpo.transform import (Translation, NonUniformScale,
                              AlignmentUniformScale, Affine, scale_about_centre,
-                             rotate_ccw_about_centre)
+                             rotate_ccw_about_centre, ThinPlateSplines)
 from menpo.visualize.base import ImageViewer, LandmarkableViewable, Viewable
 from .interpolation import scipy_interpolation, cython_interpolation
 from .extract_patches import extract_patches
@@ -1181,7 +1181,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
                                     as_single_array=as_single_array)
 
     def warp_to_mask(self, template_mask, transform, warp_landmarks=False,
-                     order=1, mode='constant', cval=0.0, batch_size=None):
+                     order=1, mode='constant', cval=0.0, batch_size=None,
+                     approx_tolerance=None):
         r"""
         Return a copy of this image warped into a different reference space.
 
@@ -1227,19 +1228,36 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             how many points in the image should be warped at a time, which
             keeps memory usage low. If ``None``, no batching is used and all
             points are warped at once.
+        approx_tolerance : `float` or ``None``, optional
+            Approximate a :map:`ThinPlateSplines` ``transform`` to this
+            (estimated) error - see :meth:`Image.warp_to_shape`.
 
         Returns
         -------
         warped_image : :map:`MaskedImage`
             A copy of this image, warped.
+
+        Raises
+        ------
+        ValueError
+            If ``approx_tolerance`` is given for a transform that is not a
+            :map:`ThinPlateSplines`
         """
         if self.n_dims != transform.n_dims:
             raise ValueError(
                 "Trying to warp a {}D image with a {}D transform "
                 "(they must match)".format(self.n_dims, transform.n_dims))
-        template_points = template_mask.true_indices()
-        points_to_sample = transform.apply(template_points,
-                                           batch_size=batch_size)
+        _validate_approx_tolerance(transform, approx_tolerance)
+        if approx_tolerance is not None:
+            # approximate the warp over the whole grid and keep the pixels
+            # of the mask (both are in C order)
+            points_to_sample = transform.apply_to_grid(
+                template_mask.shape, tolerance=approx_tolerance)
+            points_to_sample = points_to_sample[template_mask.mask.ravel()]
+        else:
+            template_points = template_mask.true_indices()
+            points_to_sample = transform.apply(template_points,
+                                               batch_size=batch_size)
         sampled = self.sample(points_to_sample,
                               order=order, mode=mode, cval=cval)
 
@@ -1312,7 +1330,8 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
                                    order=order,  mode=mode, cval=cval)
 
     def warp_to_shape(self, template_shape, transform, warp_landmarks=False,
-                      order=1, mode='constant', cval=0.0, batch_size=None):
+                      order=1, mode='constant', cval=0.0, batch_size=None,
+                      approx_tolerance=None):
         """
         Return a copy of this image warped into a different reference space.
 
@@ -1355,12 +1374,28 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
             how many points in the image should be warped at a time, which
             keeps memory usage low. If ``None``, no batching is used and all
             points are warped at once.
+        approx_tolerance : `float` or ``None``, optional
+            Only supported if ``transform`` is a :map:`ThinPlateSplines`. If
+            not ``None``, the transform is evaluated exactly on a coarse grid
+            and bilinearly interpolated to every pixel, which makes large TPS
+            warps much faster. The grid is refined until the interpolation
+            error, measured only at the centres of the grid cells, is below
+            this value (in pixels) - so this is an estimate of the error of
+            the sampled positions, not a bound on it. If ``None``, the
+            transform is evaluated exactly at every pixel.
 
         Returns
         -------
         warped_image : `type(self)`
             A copy of this image, warped.
+
+        Raises
+        ------
+        ValueError
+            If ``approx_tolerance`` is given for a transform that is not a
+            :map:`ThinPlateSplines`
         """
+        _validate_approx_tolerance(transform, approx_tolerance)
         template_shape = np.array(template_shape, dtype=np.int)
         if (isinstance(transform, Affine) and order in range(4) and
             self.n_dims == 2):
@@ -1392,9 +1427,13 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
                                            transform, order=order,
                                            mode=mode, cval=cval)
         else:
-            template_points = indices_for_image_of_shape(template_shape)
-            points_to_sample = transform.apply(template_points,
-                                               batch_size=batch_size)
+            if approx_tolerance is not None:
+                points_to_sample = transform.apply_to_grid(
+                    template_shape, tolerance=approx_tolerance)
+            else:
+                template_points = indices_for_image_of_shape(template_shape)
+                points_to_sample = transform.apply(template_points,
+                                                   batch_size=batch_size)
             sampled = self.sample(points_to_sample,
                                   order=order, mode=mode, cval=cval)
 
@@ -1997,6 +2036,14 @@ class Image(Vectorizable, Landmarkable, Viewable, LandmarkableViewable):
         return self.from_vector(v_new.T.ravel())
 
 
+def _validate_approx_tolerance(transform, approx_tolerance):
+    if (approx_tolerance is not None and
+            not isinstance(transform, ThinPlateSplines)):
+        raise ValueError('approx_tolerance can only be used with a '
+                         'ThinPlateSplines transform, not a '
+                         '{}'.format(type(transform).__name__))
+
+
 def round_image_shape(shape, round):
     if round not in ['ceil', 'round', 'floor']:
         raise ValueError('round must be either ceil, round or floor')
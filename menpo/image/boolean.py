@@ -7,7 +7,8 @@ from .base import Image
 from menpo.base import MenpoDeprecationWarning
 
 
-def pwa_point_in_pointcloud(pcloud, indices, batch_size=None):
+def pwa_point_in_pointcloud(pcloud, indices, batch_size=None,
+                            configuration=None):
     """
     Make sure that the decision of whether a point is inside or outside
     the PointCloud is exactly the same as how PWA calculates triangle
@@ -25,6 +26,10 @@ def pwa_point_in_pointcloud(pcloud, indices, batch_size=None):
     batch_size : `int` or ``None``, optional
         See constrain_to_pointcloud for more information about the batch_size
         parameter.
+    configuration : `hashable`, optional
+        The landmark configuration of the pointcloud, whose registered
+        template triangle list is used instead of a Delaunay triangulation -
+        see :func:`register_template_trilist`.
 
     Returns
     -------
@@ -36,13 +41,27 @@ def pwa_point_in_pointcloud(pcloud, indices, batch_size=None):
     from menpo.transform.piecewiseaffine import TriangleContainmentError
 
     try:
-        pwa = PiecewiseAffine(pcloud, pcloud)
+        pwa = PiecewiseAffine(pcloud, pcloud, configuration=configuration)
         pwa.apply(indices, batch_size=batch_size)
         return np.ones(indices.shape[0], dtype=np.bool)
     except TriangleContainmentError as e:
         return ~e.points_outside_source_domain
 
 
+def _landmarks_configuration(pcloud, group, configuration):
+    r"""
+    The landmark configuration to constrain to a landmark group with - the
+    given ``configuration``, or else the ``group`` label if a template
+    triangle list is registered for it (e.g. by a trimesh labeller).
+    """
+    from menpo.shape import has_template_trilist
+
+    if (configuration is None and group is not None and
+            has_template_trilist(group, pcloud.n_points)):
+        return group
+    return configuration
+
+
 def convex_hull_point_in_pointcloud(pcloud, indices):
     """
     Uses the matplotlib ``contains_points`` method, which in turn uses:
@@ -377,7 +396,8 @@ class BooleanImage(Image):
 
     # noinspection PyMethodOverriding
     def warp_to_mask(self, template_mask, transform, warp_landmarks=True,
-                     mode='constant', cval=False, batch_size=None):
+                     mode='constant', cval=False, batch_size=None,
+                     approx_tolerance=None):
         r"""
         Return a copy of this :map:`BooleanImage` warped into a different
         reference space.
@@ -410,6 +430,9 @@ class BooleanImage(Image):
             how many points in the image should be warped at a time, which
             keeps memory usage low. If ``None``, no batching is used and all
             points are warped at once.
+        approx_tolerance : `float` or ``None``, optional
+            Approximate a :map:`ThinPlateSplines` ``transform`` to this
+            (estimated) error - see :meth:`Image.warp_to_shape`.
 
         Returns
         -------
@@ -420,11 +443,13 @@ class BooleanImage(Image):
         return Image.warp_to_mask(self, template_mask, transform,
                                   warp_landmarks=warp_landmarks,
                                   order=0, mode=mode, cval=cval,
-                                  batch_size=batch_size)
+                                  batch_size=batch_size,
+                                  approx_tolerance=approx_tolerance)
 
     # noinspection PyMethodOverriding
     def warp_to_shape(self, template_shape, transform, warp_landmarks=True,
-                      mode='constant', cval=False, order=None, batch_size=None):
+                      mode='constant', cval=False, order=None, batch_size=None,
+                      approx_tolerance=None):
         """
         Return a copy of this :map:`BooleanImage` warped into a different
         reference space.
@@ -458,6 +483,9 @@ class BooleanImage(Image):
             how many points in the image should be warped at a time, which
             keeps memory usage low. If ``None``, no batching is used and all
             points are warped at once.
+        approx_tolerance : `float` or ``None``, optional
+            Approximate a :map:`ThinPlateSplines` ``transform`` to this
+            (estimated) error - see :meth:`Image.warp_to_shape`.
 
         Returns
         -------
@@ -469,7 +497,8 @@ class BooleanImage(Image):
         warped = Image.warp_to_shape(self, template_shape, transform,
                                      warp_landmarks=warp_landmarks,
                                      order=0, mode=mode, cval=cval,
-                                     batch_size=batch_size)
+                                     batch_size=batch_size,
+                                     approx_tolerance=approx_tolerance)
         # unfortunately we can't escape copying here, let BooleanImage
         # convert us to np.bool
         boolean_image = BooleanImage(warped.pixels.reshape(template_shape))
@@ -496,7 +525,7 @@ class BooleanImage(Image):
         return warped_img
 
     def constrain_to_landmarks(self, group=None, label=None, trilist=None,
-                               batch_size=None):
+                               batch_size=None, configuration=None):
         r"""
         Restricts this mask to be equal to the convex hull around the
         landmarks chosen. This is not a per-pixel convex hull, but instead
@@ -520,12 +549,21 @@ class BooleanImage(Image):
             how many points in the image should be checked at a time, which
             keeps memory usage low. If ``None``, no batching is used and all
             points are checked at once.
+        configuration : `hashable`, optional
+            The landmark configuration of the chosen landmarks - see
+            :meth:`constrain_to_pointcloud`. If ``None``, defaults to
+            ``group`` if a template triangle list is registered for it
+            (as the trimesh labellers do for their group labels).
         """
-        self.constrain_to_pointcloud(self.landmarks[group][label],
-                                     trilist=trilist)
+        pointcloud = self.landmarks[group][label]
+        configuration = _landmarks_configuration(pointcloud, group,
+                                                 configuration)
+        self.constrain_to_pointcloud(pointcloud, trilist=trilist,
+                                     configuration=configuration)
 
     def constrain_to_pointcloud(self, pointcloud, batch_size=None,
-                                point_in_pointcloud='pwa', trilist=None,):
+                                point_in_pointcloud='pwa', trilist=None,
+                                configuration=None):
         r"""
         Restricts this mask to be equal to the convex hull around a pointcloud.
         The choice of whether a pixel is inside or outside of the pointcloud
@@ -559,6 +597,12 @@ class BooleanImage(Image):
         trilist: ``(t, 3)`` `ndarray`, optional
             Deprecated. Please provide a Trimesh instead of relying on this
             parameter.
+        configuration : `hashable`, optional
+            The landmark configuration of the pointcloud (e.g. the group
+            label of a labeller such as ``'ibug_face_68_trimesh'``). If
+            provided, the template triangle list registered for it with
+            :func:`register_template_trilist` is used by the 'pwa'
+            point_in_pointcloud instead of a Delaunay triangulation.
 
         Raises
         ------
@@ -566,6 +610,9 @@ class BooleanImage(Image):
             If the image is not 2D and a default implementation is chosen.
         ValueError
             If the chosen ``point_in_pointcloud`` is unknown.
+        ValueError
+            If a ``configuration`` is provided for a point_in_pointcloud
+            other than 'pwa'.
         """
         if point_in_pointcloud in {'pwa', 'convex_hull'} and self.n_dims != 2:
             raise ValueError('Can only constrain mask on 2D images with the '
@@ -579,9 +626,14 @@ class BooleanImage(Image):
                           'ignored. Please provide a Trimesh instead of '
                           'relying on this parameter.', MenpoDeprecationWarning)
 
+        if configuration is not None and point_in_pointcloud != 'pwa':
+            raise ValueError('A landmark configuration can only be used with '
+                             'the pwa point_in_pointcloud')
+
         if point_in_pointcloud == 'pwa':
             point_in_pointcloud = partial(pwa_point_in_pointcloud,
-                                          batch_size=batch_size)
+                                          batch_size=batch_size,
+                                          configuration=configuration)
         elif point_in_pointcloud == 'convex_hull':
             point_in_pointcloud = convex_hull_point_in_pointcloud
         elif not hasattr(point_in_pointcloud, '__call__'):
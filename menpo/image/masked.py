@@ -6,7 +6,7 @@ binary_erosion = None  # expensive, from scipy.ndimage
 from menpo.visualize.base import ImageViewer
 
 from .base import Image
-from .boolean import BooleanImage
+from .boolean import BooleanImage, _landmarks_configuration
 
 
 class OutOfMaskSampleError(ValueError):
@@ -274,6 +274,48 @@ class MaskedImage(Image):
         else:
             return self.masked_pixels().ravel()
 
+    def _vector_gatherer(self):
+        r"""
+        Returns a function ``gather(image, out)`` which writes the vectorized
+        form of ``image`` directly into the ``out`` vector, provided that
+        ``image`` has the same shape, dtype and mask as this image. The flat
+        indices of the masked elements are computed only once, so each
+        gather avoids the boolean indexing and the intermediate vector of
+        :meth:`as_vector`. Used by :map:`as_matrix` to fill data matrices.
+
+        ``gather`` returns ``True`` if ``image`` was written, or ``False``
+        (leaving ``out`` untouched) if ``image`` is not compatible with this
+        image, in which case :meth:`as_vector` must be used.
+        """
+        mask_pixels = self.mask.pixels
+        mask = mask_pixels[0]
+        shape, dtype = self.pixels.shape, self.pixels.dtype
+        n_pixels = mask.size
+        flat = np.flatnonzero(mask)
+        all_true = flat.shape[0] == n_pixels
+        # the masked pixels of every channel, as indices into the raveled
+        # (channels first) pixels
+        index = (np.arange(self.n_channels)[:, None] * n_pixels +
+                 flat).ravel()
+
+        def gather(image, out):
+            if (not isinstance(image, MaskedImage) or
+                    image.pixels.shape != shape or
+                    image.pixels.dtype != dtype or out.dtype != dtype):
+                return False
+            image_mask = image.mask.pixels
+            if (image_mask is not mask_pixels and
+                    not np.array_equal(image_mask[0], mask)):
+                return False
+            pixels = image.pixels.reshape(-1)
+            if all_true:
+                out[...] = pixels
+            else:
+                np.take(pixels, index, out=out)
+            return True
+
+        return gather
+
     def from_vector(self, vector, n_channels=None):
         r"""
         Takes a flattened vector and returns a new image formed by reshaping
@@ -753,7 +795,8 @@ class MaskedImage(Image):
 
     # noinspection PyMethodOverriding
     def warp_to_mask(self, template_mask, transform, warp_landmarks=False,
-                     order=1, mode='constant', cval=0., batch_size=None):
+                     order=1, mode='constant', cval=0., batch_size=None,
+                     approx_tolerance=None):
         r"""
         Warps this image into a different reference space.
 
@@ -795,6 +838,9 @@ class MaskedImage(Image):
             how many points in the image should be warped at a time, which
             keeps memory usage low. If ``None``, no batching is used and all
             points are warped at once.
+        approx_tolerance : `float` or ``None``, optional
+            Approximate a :map:`ThinPlateSplines` ``transform`` to this
+            (estimated) error - see :meth:`Image.warp_to_shape`.
 
         Returns
         -------
@@ -806,14 +852,16 @@ class MaskedImage(Image):
         warped_image = Image.warp_to_mask(self, template_mask, transform,
                                           warp_landmarks=warp_landmarks,
                                           order=order, mode=mode, cval=cval,
-                                          batch_size=batch_size)
+                                          batch_size=batch_size,
+                                          approx_tolerance=approx_tolerance)
         # Set the template mask as our mask
         warped_image.mask = template_mask
         return warped_image
 
     # noinspection PyMethodOverriding
     def warp_to_shape(self, template_shape, transform, warp_landmarks=False,
-                      order=1, mode='constant', cval=0., batch_size=None):
+                      order=1, mode='constant', cval=0., batch_size=None,
+                      approx_tolerance=None):
         """
         Return a copy of this :map:`MaskedImage` warped into a different
         reference space.
@@ -857,6 +905,9 @@ class MaskedImage(Image):
             how many points in the image should be warped at a time, which
             keeps memory usage low. If ``None``, no batching is used and all
             points are warped at once.
+        approx_tolerance : `float` or ``None``, optional
+            Approximate a :map:`ThinPlateSplines` ``transform`` to this
+            (estimated) error - see :meth:`Image.warp_to_shape`.
 
         Returns
         -------
@@ -867,11 +918,13 @@ class MaskedImage(Image):
         warped_image = Image.warp_to_shape(self, template_shape, transform,
                                            warp_landmarks=warp_landmarks,
                                            order=order, mode=mode, cval=cval,
-                                           batch_size=batch_size)
+                                           batch_size=batch_size,
+                                           approx_tolerance=approx_tolerance)
         # warp the mask separately and reattach.
         mask = self.mask.warp_to_shape(template_shape, transform,
                                        warp_landmarks=warp_landmarks,
-                                       mode=mode, cval=cval)
+                                       mode=mode, cval=cval,
+                                       approx_tolerance=approx_tolerance)
         # efficiently turn the Image into a MaskedImage, attaching the
         # landmarks
         masked_warped_image = warped_image.as_masked(mask=mask, copy=False)
@@ -953,7 +1006,7 @@ class MaskedImage(Image):
 
     def constrain_mask_to_landmarks(self, group=None, label=None,
                                     batch_size=None, point_in_pointcloud='pwa',
-                                    trilist=None):
+                                    trilist=None, configuration=None):
         r"""
         Restricts this mask to be equal to the convex hull around the chosen
         landmarks.
@@ -993,10 +1046,21 @@ class MaskedImage(Image):
         trilist: ``(t, 3)`` `ndarray`, optional
             Deprecated. Please provide a Trimesh instead of relying on this
             parameter.
+        configuration : `hashable`, optional
+            The landmark configuration of the chosen landmarks - see
+            :meth:`BooleanImage.constrain_to_pointcloud`. If ``None`` and the
+            'pwa' point_in_pointcloud is used, defaults to ``group`` if a
+            template triangle list is registered for it (as the trimesh
+            labellers do for their group labels).
         """
+        pointcloud = self.landmarks[group][label]
+        if point_in_pointcloud == 'pwa':
+            configuration = _landmarks_configuration(pointcloud, group,
+                                                     configuration)
         self.mask.constrain_to_pointcloud(
-            self.landmarks[group][label], trilist=trilist,
-            batch_size=batch_size, point_in_pointcloud=point_in_pointcloud)
+            pointcloud, trilist=trilist,
+            batch_size=batch_size, point_in_pointcloud=point_in_pointcloud,
+            configuration=configuration)
 
     def build_mask_around_landmarks(self, patch_size, group=None, label=None):
         r"""
@@ -126,6 +126,46 @@ def test_warp_to_shape_batch():
     assert_allclose(m_shape.pixels, b.pixels)
 
 
+def test_warp_to_shape_tps_approx():
+    b = mio.import_builtin_asset('takeo.ppm')
+    src = PointCloud(np.array([[20., 20], [20, 120], [120, 20], [120, 120],
+                               [70, 70]]))
+    tgt = PointCloud(src.points + np.array([[2., 1], [-1, 3], [0, -2], [1, 1],
+                                            [3, -3]]))
+    tps = menpo.transform.ThinPlateSplines(src, tgt)
+    exact = b.warp_to_shape(b.shape, tps, order=0)
+    approx = b.warp_to_shape(b.shape, tps, order=0, approx_tolerance=0.01)
+    # nearest neighbour sampling is unaffected by such small errors
+    # everywhere except at the rounding boundaries
+    assert np.mean(exact.pixels == approx.pixels) > 0.99
+
+
+def test_warp_to_mask_tps_approx_equal_warp_to_shape():
+    b = mio.import_builtin_asset('takeo.ppm')
+    src = PointCloud(np.array([[20., 20], [20, 120], [120, 20], [120, 120]]))
+    tgt = PointCloud(src.points + np.array([[2., 1], [-1, 3], [0, -2], [1, 1]]))
+    tps = menpo.transform.ThinPlateSplines(src, tgt)
+    mask = BooleanImage.init_blank(b.shape)
+    mask.pixels[0, :10] = False
+    m_shape = b.warp_to_shape(b.shape, tps, approx_tolerance=0.5)
+    m_mask = b.warp_to_mask(mask, tps, approx_tolerance=0.5)
+    assert_allclose(m_mask.pixels[:, 10:], m_shape.pixels[:, 10:])
+
+
+@raises(ValueError)
+def test_warp_to_shape_approx_tolerance_non_tps_raises_value_error():
+    b = Image.init_blank((10, 10))
+    b.warp_to_shape(b.shape, menpo.transform.Scale(0.5, n_dims=2),
+                    order=4, approx_tolerance=0.5)
+
+
+@raises(ValueError)
+def test_warp_to_mask_approx_tolerance_non_tps_raises_value_error():
+    b = MaskedImage.init_blank((10, 10))
+    b.warp_to_mask(b.mask, menpo.transform.Scale(0.5, n_dims=2),
+                   approx_tolerance=0.5)
+
+
 def test_rescale_boolean():
     mask = BooleanImage.init_blank((100, 100))
     mask.resize((10, 10))
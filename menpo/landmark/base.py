@@ -19,6 +19,7 @@ class Landmarkable(Copyable):
     are wrapped inside a :map:`LandmarkGroup` object that performs
     useful tasks like label filtering and viewing.
     """
+    __slots__ = ()
 
     def __init__(self):
         self._landmarks = None
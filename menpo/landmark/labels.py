@@ -527,7 +527,7 @@ def ibug_face_68_trimesh(landmark_group):
     ----------
     .. [1] http://www.multipie.org/
     """
-    from menpo.shape import TriMesh
+    from menpo.shape import TriMesh, register_template_trilist
 
     group = 'ibug_face_68_trimesh'
     n_expected_points = 68
@@ -571,6 +571,7 @@ def ibug_face_68_trimesh(landmark_group):
                          [46, 47, 44], [25, 44, 24], [25, 26, 44],
                          [16, 15, 45], [16, 45, 26], [22, 42, 43],
                          [50, 51, 61], [27, 22, 42]])
+    register_template_trilist(group, n_expected_points, tri_list)
     new_landmark_group = LandmarkGroup(
         TriMesh(landmark_group.lms.points, tri_list, copy=False),
         OrderedDict([('tri', np.ones(n_points, dtype=np.bool))]))
@@ -610,7 +611,7 @@ def ibug_face_66_trimesh(landmark_group):
     ----------
     .. [1] http://www.multipie.org/
     """
-    from menpo.shape import TriMesh
+    from menpo.shape import TriMesh, register_template_trilist
 
     # apply ibug_face_66
     _, landmark_group = ibug_face_66(landmark_group)
@@ -656,6 +657,7 @@ def ibug_face_66_trimesh(landmark_group):
                          [46, 47, 44], [25, 44, 24], [25, 26, 44],
                          [16, 15, 45], [16, 45, 26], [22, 42, 43],
                          [50, 60, 51], [27, 22, 42]])
+    register_template_trilist(group, n_expected_points, tri_list)
     new_landmark_group = LandmarkGroup(
         TriMesh(landmark_group.lms.points, tri_list, copy=False),
         OrderedDict([('tri', np.ones(n_points, dtype=np.bool))]))
@@ -695,7 +697,7 @@ def ibug_face_51_trimesh(landmark_group):
     ----------
     .. [1] http://www.multipie.org/
     """
-    from menpo.shape import TriMesh
+    from menpo.shape import TriMesh, register_template_trilist
 
     # apply ibug_face_51
     _, landmark_group = ibug_face_51(landmark_group)
@@ -731,6 +733,7 @@ def ibug_face_51_trimesh(landmark_group):
                          [26, 30, 25], [29, 18, 30], [ 9, 28, 27],
                          [29, 30, 27], [ 8, 27,  7], [ 8,  9, 27],
                          [ 5, 25, 26], [33, 34, 44], [10,  5, 25]])
+    register_template_trilist(group, n_expected_points, tri_list)
     new_landmark_group = LandmarkGroup(
         TriMesh(landmark_group.lms.points, tri_list, copy=False),
         OrderedDict([('tri', np.ones(n_points, dtype=np.bool))]))
@@ -770,7 +773,7 @@ def ibug_face_49_trimesh(landmark_group):
     ----------
     .. [1] http://www.multipie.org/
     """
-    from menpo.shape import TriMesh
+    from menpo.shape import TriMesh, register_template_trilist
 
     # apply ibug_face_49
     _, landmark_group = ibug_face_49(landmark_group)
@@ -805,6 +808,7 @@ def ibug_face_49_trimesh(landmark_group):
                          [ 9, 28, 27], [29, 30, 27], [ 8, 27,  7],
                          [ 8,  9, 27], [ 5, 25, 26], [33, 43, 34],
                          [10,  5, 25], [34, 35, 45], [44, 45, 46]])
+    register_template_trilist(group, n_expected_points, tri_list)
     new_landmark_group = LandmarkGroup(
         TriMesh(landmark_group.lms.points, tri_list, copy=False),
         OrderedDict([('tri', np.ones(n_points, dtype=np.bool))]))
@@ -1230,7 +1234,7 @@ def ibug_open_eye_trimesh(landmark_group):
     error : :map:`LabellingError`
         If the given landmark group contains less than 38 points
     """
-    from menpo.shape import TriMesh
+    from menpo.shape import TriMesh, register_template_trilist
 
     group = 'ibug_open_eye_trimesh'
     n_expected_points = 38
@@ -1259,6 +1263,7 @@ def ibug_open_eye_trimesh(landmark_group):
                          [27, 34, 26], [ 3, 15, 14], [15, 26, 25],
                          [ 4, 15,  3], [16, 26, 15], [16,  4,  5],
                          [16, 15,  4], [16,  5,  6], [8, 18, 19]])
+    register_template_trilist(group, n_expected_points, tri_list)
 
     new_landmark_group = LandmarkGroup(
         TriMesh(landmark_group.lms.points, tri_list, copy=False),
@@ -1295,7 +1300,7 @@ def ibug_close_eye_trimesh(landmark_group):
     error : :map:`LabellingError`
         If the given landmark group contains less than 38 points
     """
-    from menpo.shape import TriMesh
+    from menpo.shape import TriMesh, register_template_trilist
 
     group = 'ibug_close_eye_trimesh'
     n_expected_points = 17
@@ -1310,6 +1315,7 @@ def ibug_close_eye_trimesh(landmark_group):
                          [15,  9, 14], [ 7,  8, 15], [ 5,  6, 16],
                          [15, 14,  4], [ 7, 15, 16], [ 8,  9, 15],
                          [15,  4,  5], [16,  6,  7]])
+    register_template_trilist(group, n_expected_points, tri_list)
 
     new_landmark_group = LandmarkGroup(
         TriMesh(landmark_group.lms.points, tri_list, copy=False),
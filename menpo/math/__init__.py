@@ -1,3 +1,6 @@
 from .convolution import log_gabor
-from .decomposition import eigenvalue_decomposition, pca, ipca
-from .linalg import dot_inplace_left, dot_inplace_right, as_matrix, from_matrix
+from .decomposition import (eigenvalue_decomposition, covariance_matrix, pca,
+                            pca_from_blocks, ipca)
+from .linalg import (dot_inplace_left, dot_inplace_right, as_matrix,
+                     as_matrix_blocks, from_matrix, memmap_block_size,
+                     dot_block_size)
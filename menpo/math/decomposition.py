@@ -1,6 +1,7 @@
 from __future__ import division
+from multiprocessing.pool import ThreadPool
 import numpy as np
-from .linalg import dot_inplace_right
+from .linalg import dot_inplace_right, memmap_block_size
 
 
 def eigenvalue_decomposition(C, eps=1e-10):
@@ -48,13 +49,120 @@ def eigenvalue_decomposition(C, eps=1e-10):
     return pos_eigenvectors, pos_eigenvalues
 
 
-def pca(X, centre=True, inplace=False, eps=1e-10):
+def covariance_matrix(X, mean=None, gram=False, block_size=1000,
+                      n_threads=1):
+    r"""
+    Block-wise computation of the covariance matrix of the data matrix `X`,
+    ``(X - m)^T (X - m) / (n_samples - 1)``, or (with ``gram=True``) of the
+    small covariance (Gram) matrix ``(X - m) (X - m)^T / (n_samples - 1)``.
+
+    The output is computed in ``(block_size, block_size)`` tiles, and only
+    the tiles of the upper triangle are computed - the lower triangle is
+    filled in by symmetry, so the result is exactly symmetric. Centring is
+    fused into the computation of each tile, so `X` is neither modified nor
+    copied, and the only temporaries are small blocks of the (centred) data.
+    The tiles are distributed across a pool of ``n_threads`` threads.
+
+    Parameters
+    ----------
+    X : ``(n_samples, n_dims)`` `ndarray`
+        Data matrix.
+    mean : ``(n_dims,)`` `ndarray` or ``None``, optional
+        The mean to subtract from the samples. If ``None``, `X` is assumed to
+        be centred already.
+    gram : `bool`, optional
+        If ``True``, the ``(n_samples, n_samples)`` Gram matrix is computed
+        rather than the ``(n_dims, n_dims)`` covariance matrix.
+    block_size : `int`, optional
+        The size of the tiles of the output. Smaller tiles give a finer
+        granularity of work across threads at the cost of less efficient
+        matrix products.
+    n_threads : `int`, optional
+        The number of threads used to compute the tiles.
+
+    Returns
+    -------
+    C : ``(n_dims, n_dims)`` or ``(n_samples, n_samples)`` `ndarray`
+        The symmetric covariance (or Gram) matrix.
+    """
+    n, d = X.shape
+    p = n if gram else d
+    # the inner (summed over) dimension is chunked so that the temporaries
+    # of each tile are bounded at roughly the size of the tile itself
+    inner = d if gram else n
+    chunk = max(block_size, 1)
+    chunks = [slice(k, k + chunk) for k in range(0, inner, chunk)]
+
+    def operand(I, K):
+        # the (inner, block) slice of the centred data for output block I
+        if gram:
+            a = X[I, K].T
+            return a if mean is None else a - mean[K, None]
+        else:
+            a = X[K, I]
+            return a if mean is None else a - mean[I]
+
+    C = np.empty((p, p))
+
+    blocks = [slice(i, i + block_size) for i in range(0, p, block_size)]
+
+    def compute_tile(tile):
+        i, j = tile
+        I, J = blocks[i], blocks[j]
+        C_IJ = C[I, J]
+        C_IJ.fill(0)
+        for K in chunks:
+            a = operand(I, K)
+            C_IJ += np.dot(a.T, a if i == j else operand(J, K))
+        C_IJ /= n - 1
+        if i == j:
+            # C should be perfectly symmetrical, but numerical error can
+            # creep in. Enforce symmetry to avoid complex eigenvectors
+            C[I, I] = (C_IJ + C_IJ.T) / 2.0
+        else:
+            # fill in the lower triangle by symmetry
+            C[J, I] = C_IJ.T
+
+    # only the tiles of the upper triangle are computed
+    tiles = [(i, j) for i in range(len(blocks))
+             for j in range(i, len(blocks))]
+    if n_threads > 1 and len(tiles) > 1:
+        pool = ThreadPool(n_threads)
+        try:
+            pool.map(compute_tile, tiles)
+        finally:
+            pool.close()
+    else:
+        for tile in tiles:
+            compute_tile(tile)
+    return C
+
+
+def pca(X, centre=True, inplace=False, eps=1e-10, method='eigen',
+        n_components=None, oversampling=10, n_power_iterations=2,
+        n_threads=1, random_state=None):
     r"""
     Apply Principal Component Analysis (PCA) on the data matrix `X`. In the case
     where the data matrix is very large, it is advisable to set
     ``inplace = True``. However, note this destructively edits the data matrix
     by subtracting the mean inplace.
 
+    Two methods are supported. ``'eigen'`` performs an eigenvalue
+    decomposition of the full covariance (or Gram) matrix. ``'randomized'``
+    only computes the leading ``n_components`` subspace using randomized
+    range finding [1], which is much faster and uses far less memory when
+    ``n_components`` is small compared to the dimensions of `X`. The
+    randomized method never damages `X` beyond subtracting the mean, so with
+    ``inplace = True`` `X` is left centred.
+
+    If `X` is a `numpy.memmap` (e.g. built by :map:`as_matrix` with an
+    ``out`` path) and ``inplace = True``, all operations on `X` are performed
+    block-wise, so that it is never loaded into memory in full. The mean,
+    the centring and the covariance (or Gram) matrix are computed from panels
+    of rows, which are read sequentially. When ``n_samples < n_dims`` the
+    eigenvectors are then computed inplace in blocks of columns (see
+    :map:`dot_inplace_right`), which are read in strided runs.
+
     Parameters
     ----------
     X : ``(n_samples, n_dims)`` `ndarray`
@@ -68,6 +176,27 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
         Tolerance value for positive eigenvalue. Those eigenvalues smaller
         than the specified eps value, together with their corresponding
         eigenvectors, will be automatically discarded.
+    method : ``{'eigen', 'randomized'}``, optional
+        The method used to compute the decomposition.
+    n_components : `int` or ``None``, optional
+        The maximum number of (leading) components to return. Required for
+        ``method='randomized'``. If ``None``, all components are returned.
+    oversampling : `int`, optional
+        Only used for ``method='randomized'``. The number of extra random
+        directions sampled beyond ``n_components``, improving the accuracy
+        of the recovered subspace.
+    n_power_iterations : `int`, optional
+        Only used for ``method='randomized'``. The number of power iterations
+        performed, improving the accuracy when the eigenvalues decay slowly.
+    n_threads : `int`, optional
+        Only used for ``method='eigen'``. The number of threads used to
+        compute the covariance matrix - see :map:`covariance_matrix` - and,
+        if ``inplace = True``, the eigenvectors from the Gram matrix - see
+        :map:`dot_inplace_right`.
+    random_state : `int`, `numpy.random.RandomState` or ``None``, optional
+        Only used for ``method='randomized'``. The seed (or the random number
+        generator) of the random projection, to make the decomposition
+        reproducible. If ``None``, the global `numpy.random` state is used.
 
     Returns
     -------
@@ -77,29 +206,68 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
         Positive eigenvalues of the data matrix.
     m (mean vector) : ``(n_dimensions,)`` `ndarray`
         Mean that was subtracted from the data matrix.
+
+    Raises
+    ------
+    ValueError
+        If ``method`` is not one of ``{'eigen', 'randomized'}``, or
+        ``n_components`` is not given for ``method='randomized'``.
+
+    References
+    ----------
+    .. [1] N. Halko, P. G. Martinsson, J. A. Tropp. "Finding structure with
+       randomness: Probabilistic algorithms for constructing approximate
+       matrix decompositions". SIAM Review, 2011.
     """
+    if method not in ('eigen', 'randomized'):
+        raise ValueError("method must be one of {{'eigen', 'randomized'}}, "
+                         "not '{}'".format(method))
+    if method == 'randomized' and n_components is None:
+        raise ValueError("n_components must be provided for "
+                         "method='randomized'")
     n, d = X.shape
 
+    # the statistics of a memory mapped data matrix are computed from large
+    # panels of rows, so that the disk is read (and written) sequentially
+    memmap = inplace and isinstance(X, np.memmap)
+    if memmap:
+        row_block = memmap_block_size(d, itemsize=X.itemsize)
+        row_blocks = [slice(i, i + row_block) for i in range(0, n, row_block)]
+
     if centre:
         # centre data
         # m (mean vector): d
-        m = np.mean(X, axis=0)
+        if memmap:
+            m = sum(X[b].sum(axis=0) for b in row_blocks) / n
+        else:
+            m = np.mean(X, axis=0)
     else:
         m = np.zeros(d)
 
     # This is required if the data matrix is very large!
-    if inplace:
+    if memmap:
+        for b in row_blocks:
+            X[b] -= m
+    elif inplace:
         X -= m
-    else:
-        X = X - m
-
-    if d < n:
+    # otherwise the centring is fused into the computation of the covariance
+    # matrix (or the random projections), avoiding a copy of X
+    fused_mean = m if centre and not inplace else None
+
+    if method == 'randomized':
+        U, l = _randomized_eigenvectors(X, n_components, oversampling,
+                                        n_power_iterations, random_state,
+                                        mean=fused_mean, eps=eps)
+    elif d < n:
         # compute covariance matrix
         # C (covariance): d x d
-        C = np.dot(X.T, X) / (n - 1)
-        # C should be perfectly symmetrical, but numerical error can creep
-        # in. Enforce symmetry here to avoid creating complex eigenvectors
-        C = (C + C.T) / 2.0
+        if memmap:
+            C = sum(np.dot(X[b].T, X[b]) for b in row_blocks) / (n - 1)
+            # C should be perfectly symmetrical, but numerical error can
+            # creep in. Enforce symmetry here to avoid complex eigenvectors
+            C = (C + C.T) / 2.0
+        else:
+            C = covariance_matrix(X, mean=fused_mean, n_threads=n_threads)
 
         # perform eigenvalue decomposition
         # U (eigenvectors): d x n
@@ -114,10 +282,22 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
         # d > n
         # compute small covariance matrix
         # C (covariance): n x n
-        C = np.dot(X, X.T) / (n - 1)
-        # C should be perfectly symmetrical, but numerical error can creep
-        # in. Enforce symmetry here to avoid creating complex eigenvectors
-        C = (C + C.T) / 2.0
+        if memmap:
+            # build C from pairs of row panels (the upper triangle of blocks
+            # only), so the disk is only ever read in long sequential runs
+            C = np.empty((n, n))
+            for i, bi in enumerate(row_blocks):
+                X_bi = np.array(X[bi])
+                for bj in row_blocks[i:]:
+                    C[bi, bj] = np.dot(X_bi, X[bj].T)
+                    C[bj, bi] = C[bi, bj].T
+            C /= n - 1
+            # C should be perfectly symmetrical, but numerical error can
+            # creep in. Enforce symmetry here to avoid complex eigenvectors
+            C = (C + C.T) / 2.0
+        else:
+            C = covariance_matrix(X, mean=fused_mean, gram=True,
+                                  n_threads=n_threads)
 
         # perform eigenvalue decomposition
         # V (eigenvectors): n x n
@@ -127,13 +307,274 @@ def pca(X, centre=True, inplace=False, eps=1e-10):
         # compute final eigenvectors
         # U: n x d
         w = np.sqrt(1.0 / ((n - 1) * l))
-        dot = dot_inplace_right if inplace else np.dot
-        U = dot(V.T, X)
+        if inplace:
+            U = dot_inplace_right(V.T, X, n_threads=n_threads)
+        else:
+            U = np.dot(V.T, X)
+        if fused_mean is not None:
+            # V^T (X - 1 m^T) = V^T X - (V^T 1) m^T
+            U -= np.outer(V.sum(axis=0), fused_mean)
         U *= w[:, None]
 
+    if n_components is not None:
+        U, l = U[:n_components], l[:n_components]
     return U, l, m
 
 
+def _randomized_eigenvectors(X, n_components, oversampling,
+                             n_power_iterations, random_state, mean=None,
+                             eps=1e-10):
+    r"""
+    The leading eigenvectors and eigenvalues of the covariance of the data
+    matrix `X`, found by randomized range finding. If a `mean` is given, `X`
+    is implicitly centred, i.e. ``(X - m) Z`` is computed as ``X Z - m Z``,
+    otherwise `X` must already be centred. Only ``(n_samples, k)`` and
+    ``(k, n_dims)`` temporaries are allocated, where
+    ``k = n_components + oversampling``.
+    """
+    n, d = X.shape
+    k = min(n_components + oversampling, n, d)
+
+    def dot(Z):
+        # (X - m) Z
+        XZ = np.dot(X, Z)
+        if mean is not None:
+            XZ -= np.dot(mean, Z)
+        return XZ
+
+    def rdot(Q):
+        # (X - m)^T Q
+        XQ = np.dot(X.T, Q)
+        if mean is not None:
+            XQ -= mean[:, None] * Q.sum(axis=0)
+        return XQ
+
+    # sample the range of X with a random projection
+    Q = dot(_random_state(random_state).randn(d, k))
+    for _ in range(n_power_iterations):
+        # re-orthonormalise at every step to preserve the small eigenvalues
+        Q = np.linalg.qr(Q)[0]
+        Q = np.linalg.qr(rdot(Q))[0]
+        Q = dot(Q)
+    Q = np.linalg.qr(Q)[0]
+    # the SVD of the small projection of X onto the range basis
+    _, s, Vt = np.linalg.svd(rdot(Q).T, full_matrices=False)
+    l = s ** 2 / (n - 1)
+    # keep only the positive eigenvalues within tolerance
+    keep = l > np.max(l) * eps
+    keep[n_components:] = False
+    return Vt[keep], l[keep]
+
+
+def pca_from_blocks(blocks, centre=True, eps=1e-10, method='covariance',
+                    n_components=None, oversampling=10, n_power_iterations=2,
+                    random_state=None):
+    r"""
+    Apply Principal Component Analysis (PCA) on a data matrix that is only
+    available as a stream of blocks of rows, so that the full data matrix is
+    never held in memory. Use :map:`as_matrix_blocks` to stream a
+    list/generator of :map:`Vectorizable` objects.
+
+    Two methods are supported. ``'covariance'`` accumulates the
+    ``(n_dims, n_dims)`` covariance matrix in a single pass over the blocks
+    and then performs its eigenvalue decomposition - the results are the same
+    as :map:`pca`. ``'randomized'`` computes the leading ``n_components``
+    subspace by randomized range finding (see :map:`pca`), and only ever
+    allocates ``(n_samples, k)`` and ``(k, n_dims)`` arrays, where
+    ``k = n_components + oversampling``. This is suitable for data of any
+    dimensionality, but requires ``2 + 2 * n_power_iterations`` passes over
+    the blocks.
+
+    Parameters
+    ----------
+    blocks : `callable` or `iterable` of ``(n_block, n_dims)`` `ndarray`
+        The blocks of rows of the data matrix. If a `callable`, it is called
+        (with no arguments) to obtain a fresh iterable for each pass over the
+        data. ``method='randomized'`` needs multiple passes, and therefore
+        requires a `callable`.
+    centre : `bool`, optional
+        Whether to centre the data matrix. If `False`, zero will be subtracted.
+    eps : `float`, optional
+        Tolerance value for positive eigenvalue. Those eigenvalues smaller
+        than the specified eps value, together with their corresponding
+        eigenvectors, will be automatically discarded.
+    method : ``{'covariance', 'randomized'}``, optional
+        The method used to compute the decomposition.
+    n_components : `int` or ``None``, optional
+        The maximum number of (leading) components to return. Required for
+        ``method='randomized'``. If ``None``, all components are returned.
+    oversampling : `int`, optional
+        Only used for ``method='randomized'`` - see :map:`pca`.
+    n_power_iterations : `int`, optional
+        Only used for ``method='randomized'`` - see :map:`pca`.
+    random_state : `int`, `numpy.random.RandomState` or ``None``, optional
+        Only used for ``method='randomized'`` - see :map:`pca`.
+
+    Returns
+    -------
+    U (eigenvectors) : ``(``(n_components, n_dims)``)`` `ndarray`
+        Eigenvectors of the data matrix.
+    l (eigenvalues) : ``(n_components,)`` `ndarray`
+        Positive eigenvalues of the data matrix.
+    m (mean vector) : ``(n_dimensions,)`` `ndarray`
+        Mean that was subtracted from the data matrix.
+    n_samples : `int`
+        The total number of rows in the blocks.
+    total_variance : `float`
+        The total variance of the data (the trace of the covariance matrix),
+        including the variance of any components that were not returned.
+
+    Raises
+    ------
+    ValueError
+        If ``method`` is not one of ``{'covariance', 'randomized'}``,
+        ``n_components`` is not given for ``method='randomized'``, `blocks`
+        is not `callable` for ``method='randomized'`` or `blocks` is empty.
+    """
+    if method not in ('covariance', 'randomized'):
+        raise ValueError("method must be one of {{'covariance', "
+                         "'randomized'}}, not '{}'".format(method))
+    if method == 'randomized':
+        if n_components is None:
+            raise ValueError("n_components must be provided for "
+                             "method='randomized'")
+        if not callable(blocks):
+            raise ValueError("blocks must be callable for "
+                             "method='randomized' as multiple passes over "
+                             "the data are required")
+    if callable(blocks):
+        passes = blocks
+    else:
+        passes = lambda: blocks
+
+    if method == 'randomized':
+        U, l, m, n, total_variance = _randomized_eigenvectors_from_blocks(
+            passes, centre, n_components, oversampling, n_power_iterations,
+            random_state, eps=eps)
+    else:
+        C, m, n = _covariance_from_blocks(passes(), centre)
+        total_variance = np.trace(C)
+        U, l = eigenvalue_decomposition(C, eps=eps)
+        U = U.T
+        if n_components is not None:
+            U, l = U[:n_components], l[:n_components]
+    return U, l, m, n, total_variance
+
+
+def _covariance_from_blocks(blocks, centre):
+    r"""
+    The covariance matrix and mean of the data matrix whose rows are streamed
+    in `blocks`, accumulated in a single pass. The rows are shifted by the
+    mean of the first block before accumulation, which avoids the
+    catastrophic cancellation of the naive ``X^T X - n m m^T`` formulation.
+    """
+    n, shift, C, s = 0, None, None, None
+    for X in blocks:
+        if shift is None:
+            d = X.shape[1]
+            shift = np.mean(X, axis=0) if centre else np.zeros(d)
+            C, s = np.zeros((d, d)), np.zeros(d)
+        X = X - shift
+        C += np.dot(X.T, X)
+        s += X.sum(axis=0)
+        n += X.shape[0]
+    if n == 0:
+        raise ValueError('Cannot perform PCA on an empty set of blocks')
+    if centre:
+        # correct the scatter for the difference between the shift and the
+        # true mean
+        s /= n
+        C -= n * np.outer(s, s)
+        m = shift + s
+    else:
+        m = shift
+    C /= n - 1
+    # C should be perfectly symmetrical, but numerical error can creep
+    # in. Enforce symmetry here to avoid creating complex eigenvectors
+    C += C.T
+    C /= 2.0
+    return C, m, n
+
+
+def _randomized_eigenvectors_from_blocks(passes, centre, n_components,
+                                         oversampling, n_power_iterations,
+                                         random_state, eps=1e-10):
+    r"""
+    The blockwise equivalent of :func:`_randomized_eigenvectors`, where
+    `passes` is called to stream the blocks of the data matrix for every
+    pass. The data is implicitly centred, i.e. ``(X - m) Z`` is computed as
+    ``X Z - m Z``.
+    """
+    # first pass - sample the range of X and compute the data statistics
+    Y, n, shift, s, ss, Omega = [], 0, None, None, 0.0, None
+    for X in passes():
+        if shift is None:
+            d = X.shape[1]
+            shift = np.mean(X, axis=0) if centre else np.zeros(d)
+            s = np.zeros(d)
+            k = n_components + oversampling
+            Omega = _random_state(random_state).randn(d, min(k, d))
+        Y.append(np.dot(X, Omega))
+        X = X - shift
+        s += X.sum(axis=0)
+        ss += np.einsum('ij,ij->', X, X)
+        n += X.shape[0]
+    if n == 0:
+        raise ValueError('Cannot perform PCA on an empty set of blocks')
+    if centre:
+        s /= n
+        total_variance = (ss - n * s.dot(s)) / (n - 1)
+        m = shift + s
+    else:
+        total_variance = ss / (n - 1)
+        m = shift
+    Q = np.vstack(Y)
+    del Y
+    Q -= m.dot(Omega)
+    Q = Q[:, :min(n_components + oversampling, n)]
+    for _ in range(n_power_iterations):
+        # re-orthonormalise at every step to preserve the small eigenvalues
+        Q = np.linalg.qr(Q)[0]
+        Z = np.linalg.qr(_centred_rdot_blocks(passes(), Q, m))[0]
+        Q = np.vstack([np.dot(X, Z) for X in passes()])
+        Q -= m.dot(Z)
+    Q = np.linalg.qr(Q)[0]
+    # the SVD of the small projection of X onto the range basis
+    _, s, Vt = np.linalg.svd(_centred_rdot_blocks(passes(), Q, m).T,
+                             full_matrices=False)
+    l = s ** 2 / (n - 1)
+    # keep only the positive eigenvalues within tolerance
+    keep = l > np.max(l) * eps
+    keep[n_components:] = False
+    return Vt[keep], l[keep], m, n, total_variance
+
+
+def _random_state(random_state):
+    r"""
+    The random number generator for a `random_state` - see :map:`pca`.
+    """
+    if random_state is None:
+        return np.random  # the global random state
+    elif isinstance(random_state, np.random.RandomState):
+        return random_state
+    else:
+        return np.random.RandomState(random_state)
+
+
+def _centred_rdot_blocks(blocks, Q, m):
+    r"""
+    ``(X - m)^T Q`` where the rows of ``X`` are streamed in `blocks` and ``Q``
+    has the same number of rows as ``X``.
+    """
+    Z, i = np.zeros((m.shape[0], Q.shape[1])), 0
+    for X in blocks:
+        j = i + X.shape[0]
+        Z += np.dot(X.T, Q[i:j])
+        i = j
+    Z -= np.outer(m, Q.sum(axis=0))
+    return Z
+
+
 def ipca(B, U_a, l_a, n_a, m_a=None, f=1.0, eps=1e-10):
     r"""
     Perform Incremental PCA on the eigenvectors ``U_a``, eigenvalues ``l_a`` and
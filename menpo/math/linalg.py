@@ -1,9 +1,50 @@
 from itertools import islice
+from multiprocessing.pool import ThreadPool
+from time import time
 import numpy as np
 from menpo.visualize import print_progress, bytes_str
 
+# The (approximate) number of bytes read per block when operating on a
+# memory mapped array - large blocks keep the disk access sequential
+DEFAULT_MEMMAP_BLOCK_MEMORY = 2 ** 27
+# The (approximate) number of bytes read per block by the inplace dot
+# products on in-memory arrays - small enough to keep the temporaries cheap,
+# large enough for efficient matrix products
+DEFAULT_DOT_BLOCK_MEMORY = 2 ** 24
+# Blocks are rounded to a whole number of cache lines of items
+CACHE_LINE_SIZE = 64
 
-def dot_inplace_left(a, b, block_size=1000):
+
+def memmap_block_size(length, itemsize=8, max_memory=None):
+    r"""
+    The number of slices, each of ``length`` items, that should be processed
+    at a time when operating block-wise on a memory mapped array. Blocks of
+    roughly ``max_memory`` bytes are read, so that the disk is accessed in
+    long sequential runs rather than many small seeks.
+
+    Parameters
+    ----------
+    length : `int`
+        The number of items in each slice of the array (e.g. the number of
+        columns when blocking over rows).
+    itemsize : `int`, optional
+        The size of each item in bytes.
+    max_memory : `int` or ``None``, optional
+        The number of bytes a block should occupy. If ``None``,
+        ``DEFAULT_MEMMAP_BLOCK_MEMORY`` is used.
+
+    Returns
+    -------
+    block_size : `int`
+        The number of slices in each block (always at least ``1``).
+    """
+    if max_memory is None:
+        max_memory = DEFAULT_MEMMAP_BLOCK_MEMORY
+    return max(1, int(max_memory // (max(length, 1) * itemsize)))
+
+
+def dot_inplace_left(a, b, block_size=None, n_threads=1, max_memory=None,
+                     profile=None):
     r"""
     Inplace dot product for memory efficiency. It computes ``a * b = c``, where
     ``a`` will be replaced inplace with ``c``.
@@ -17,10 +58,23 @@ def dot_inplace_left(a, b, block_size=1000):
         The second array to dot - assumed to be small. ``n_small`` must be
         smaller than ``k`` so the result can be stored within the memory space
         of ``a``.
-    block_size : `int`, optional
+    block_size : `int` or ``None``, optional
         The size of the block of ``a`` that will be dotted against ``b`` in
         each iteration. larger block sizes increase the time performance of the
         dot product at the cost of a higher memory overhead for the operation.
+        If ``None``, it is chosen so each block of ``a`` occupies roughly
+        ``max_memory`` bytes (see :map:`dot_block_size`).
+    n_threads : `int`, optional
+        The number of threads that the (independent) blocks are dotted on
+        concurrently.
+    max_memory : `int` or ``None``, optional
+        The memory budget of each block in bytes, only used if
+        ``block_size`` is ``None``. If ``None``, ``DEFAULT_DOT_BLOCK_MEMORY``
+        is used, or ``DEFAULT_MEMMAP_BLOCK_MEMORY`` if ``a`` is a
+        `numpy.memmap` (so the disk is read sequentially).
+    profile : `callable` or ``None``, optional
+        If provided, called on completion as ``profile(gflops, seconds)``
+        with the achieved GFLOP/s and the time taken.
 
     Returns
     -------
@@ -36,13 +90,21 @@ def dot_inplace_left(a, b, block_size=1000):
         raise ValueError('Cannot dot inplace left - '
                          'b.shape[1] ({}) > a.shape[1] '
                          '({})'.format(n_small, k_a))
-    for i in range(0, n_big, block_size):
+    if block_size is None:
+        block_size = dot_block_size(a, k_a, n_big, n_threads=n_threads,
+                                    max_memory=max_memory)
+
+    def dot_block(i):
         j = i + block_size
         a[i:j, :n_small] = a[i:j].dot(b)
+
+    _run_blocks(dot_block, n_big, block_size, n_threads,
+                2.0 * n_big * k_a * n_small, profile)
     return a[:, :n_small]
 
 
-def dot_inplace_right(a, b, block_size=1000):
+def dot_inplace_right(a, b, block_size=None, n_threads=1, max_memory=None,
+                      profile=None):
     r"""
     Inplace dot product for memory efficiency. It computes ``a * b = c`` where
     ``b`` will be replaced inplace with ``c``.
@@ -56,11 +118,26 @@ def dot_inplace_right(a, b, block_size=1000):
     b : ``(k, n_big)`` `ndarray`
         Second array to dot - assumed to be large. Will be damaged by this
         function call as it is used to store the output inplace.
-    block_size : `int`, optional
+    block_size : `int` or ``None``, optional
         The size of the block of ``b`` that ``a`` will be dotted against
         in each iteration. larger block sizes increase the time performance of
         the dot product at the cost of a higher memory overhead for the
-        operation.
+        operation. If ``None``, it is chosen so each block of ``b`` occupies
+        roughly ``max_memory`` bytes (see :map:`dot_block_size`).
+    n_threads : `int`, optional
+        The number of threads that the (independent) blocks are dotted on
+        concurrently.
+    max_memory : `int` or ``None``, optional
+        The memory budget of each block in bytes, only used if
+        ``block_size`` is ``None``. If ``None``, ``DEFAULT_DOT_BLOCK_MEMORY``
+        is used, or ``DEFAULT_MEMMAP_BLOCK_MEMORY`` if ``b`` is a
+        `numpy.memmap`. Note that the blocks are blocks of columns, so for a
+        (C ordered) memory map each block is read as ``k`` strided runs of
+        ``block_size`` items - larger blocks make these runs longer, but the
+        access is never fully sequential.
+    profile : `callable` or ``None``, optional
+        If provided, called on completion as ``profile(gflops, seconds)``
+        with the achieved GFLOP/s and the time taken.
 
     Returns
     -------
@@ -76,13 +153,88 @@ def dot_inplace_right(a, b, block_size=1000):
         raise ValueError('Cannot dot inplace right - '
                          'a.shape[1] ({}) > b.shape[0] '
                          '({})'.format(n_small, k_b))
-    for i in range(0, n_big, block_size):
+    if block_size is None:
+        block_size = dot_block_size(b, k_b, n_big, n_threads=n_threads,
+                                    max_memory=max_memory)
+
+    def dot_block(i):
         j = i + block_size
         b[:n_small, i:j] = a.dot(b[:, i:j])
+
+    _run_blocks(dot_block, n_big, block_size, n_threads,
+                2.0 * n_big * k_b * n_small, profile)
     return b[:n_small]
 
 
-def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
+def dot_block_size(x, length, n_big, n_threads=1, max_memory=None):
+    r"""
+    The block size used to block-wise process the ``n_big`` slices (each of
+    ``length`` items) of the array ``x``, as is done by
+    :map:`dot_inplace_left` and :map:`dot_inplace_right`. Each block occupies
+    roughly ``max_memory`` bytes and is a whole number of cache lines of
+    items. When ``n_threads > 1``, the blocks are made small enough that
+    every thread receives at least one.
+
+    Parameters
+    ----------
+    x : `ndarray`
+        The array that is processed block-wise.
+    length : `int`
+        The number of items in each slice of ``x``.
+    n_big : `int`
+        The number of slices of ``x``.
+    n_threads : `int`, optional
+        The number of threads the blocks are shared between.
+    max_memory : `int` or ``None``, optional
+        The number of bytes a block should occupy. If ``None``,
+        ``DEFAULT_DOT_BLOCK_MEMORY`` is used, or
+        ``DEFAULT_MEMMAP_BLOCK_MEMORY`` if ``x`` is a `numpy.memmap`.
+
+    Returns
+    -------
+    block_size : `int`
+        The number of slices in each block (always at least ``1``).
+    """
+    if max_memory is None:
+        max_memory = (DEFAULT_MEMMAP_BLOCK_MEMORY if isinstance(x, np.memmap)
+                      else DEFAULT_DOT_BLOCK_MEMORY)
+    block_size = memmap_block_size(length, itemsize=x.itemsize,
+                                   max_memory=max_memory)
+    if n_threads > 1:
+        block_size = min(block_size, -(-n_big // n_threads))
+    # round down to a whole number of cache lines
+    line = max(CACHE_LINE_SIZE // x.itemsize, 1)
+    if block_size > line:
+        block_size -= block_size % line
+    return max(block_size, 1)
+
+
+def _run_blocks(compute_block, n_big, block_size, n_threads, n_flops,
+                profile):
+    r"""
+    Calls ``compute_block(i)`` for the start ``i`` of every block of
+    ``block_size`` of ``n_big``, on a pool of ``n_threads`` threads. If
+    ``profile`` is provided, it is called with the achieved GFLOP/s (given
+    the operation performs ``n_flops``) and the time taken.
+    """
+    t = time()
+    starts = range(0, n_big, block_size)
+    if n_threads > 1 and len(starts) > 1:
+        pool = ThreadPool(n_threads)
+        try:
+            pool.map(compute_block, starts)
+        finally:
+            pool.close()
+    else:
+        for i in starts:
+            compute_block(i)
+    if profile is not None:
+        seconds = time() - t
+        profile(n_flops / max(seconds, 1e-12) / 1e9, seconds)
+
+
+def as_matrix(vectorizables, length=None, return_template=False, verbose=False,
+              out=None, n_threads=1):
     r"""
     Create a matrix from a list/generator of :map:`Vectorizable` objects.
     All the objects in the list **must** be the same size when vectorized.
@@ -103,11 +255,27 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
         If ``True``, will return the first element of the list/generator, which
         was used as the template. Useful if you need to map back from the
         matrix to a list of vectorizable objects.
+    out : `str` or ``(length, n_features)`` `ndarray`, optional
+        Where to store the data matrix. If a `str`, the data matrix is
+        memory mapped to a (new) file at this path, so it can be larger than
+        the available memory. If an `ndarray` (e.g. a preallocated
+        `numpy.memmap`), it is filled with the data. If ``None``, the data
+        matrix is allocated in memory.
+    n_threads : `int`, optional
+        The number of threads used to fill the rows of the data matrix.
+
+    Notes
+    -----
+    Objects that implement ``_vector_gatherer`` (e.g. :map:`MaskedImage`)
+    are written directly into the rows of the data matrix, without the
+    intermediate vector of ``as_vector``, when they are compatible with the
+    template (e.g. share its mask).
 
     Returns
     -------
     M : (length, n_features) `ndarray`
-        Every row is an element of the list.
+        Every row is an element of the list. A `numpy.memmap` if ``out`` was
+        a path.
     template : :map:`Vectorizable`, optional
         If ``return_template == True``, will return the template used to
         build the matrix `M`.
@@ -116,6 +284,9 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
     ------
     ValueError
         ``vectorizables`` terminates in fewer than ``length`` iterations
+    ValueError
+        ``out`` is an `ndarray` that is not of shape
+        ``(length, n_features)``
     """
     # get the first element as the template and use it to configure the
     # data matrix
@@ -130,7 +301,17 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
     n_features = template.n_parameters
     template_vector = template.as_vector()
 
-    data = np.zeros((length, n_features), dtype=template_vector.dtype)
+    shape = (length, n_features)
+    if out is None:
+        data = np.zeros(shape, dtype=template_vector.dtype)
+    elif isinstance(out, np.ndarray):
+        if out.shape != shape:
+            raise ValueError('out must be of shape {}, not {}'.format(
+                shape, out.shape))
+        data = out
+    else:
+        data = np.memmap(out, dtype=template_vector.dtype, mode='w+',
+                         shape=shape)
     if verbose:
         print('Allocated data matrix of size {} '
               '({} samples)'.format(bytes_str(data.nbytes), length))
@@ -146,10 +327,30 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
         vectorizables = print_progress(vectorizables, n_items=length, offset=1,
                                        prefix='Building data matrix')
 
+    # objects that can write themselves directly into the rows of the data
+    # matrix provide a gatherer, configured from the template
+    gatherer = getattr(template, '_vector_gatherer', None)
+    gather = gatherer() if gatherer is not None else None
+
+    def fill(i_sample):
+        i, sample = i_sample
+        if gather is None or not gather(sample, data[i]):
+            data[i] = sample.as_vector()
+        return i
+
     # 1-based as we have the template vector set already
     i = 0
-    for i, sample in enumerate(vectorizables, 1):
-        data[i] = sample.as_vector()
+    if n_threads > 1:
+        pool = ThreadPool(n_threads)
+        try:
+            # the rows are filled out of order - count them
+            i = sum(1 for _ in pool.imap_unordered(
+                fill, enumerate(vectorizables, 1), chunksize=16))
+        finally:
+            pool.close()
+    else:
+        for i, sample in enumerate(vectorizables, 1):
+            fill((i, sample))
 
     # we have exhausted the iterable, but did we get enough items?
     if i != length - 1:  # -1
@@ -157,12 +358,52 @@ def as_matrix(vectorizables, length=None, return_template=False, verbose=False):
                          'termination (expected {} items, got {})'.format(
             length, i + 1))
 
+    if isinstance(data, np.memmap):
+        data.flush()
+
     if return_template:
         return data, template
     else:
         return data
 
 
+def as_matrix_blocks(vectorizables, block_size=1000):
+    r"""
+    Create a generator of data matrix blocks from a list/generator of
+    :map:`Vectorizable` objects. All the objects **must** be the same size
+    when vectorized.
+
+    Only ``block_size`` objects are vectorized at any one time, so the full
+    data matrix is never materialised in memory. This makes it possible to
+    stream very large datasets (e.g. loaded lazily from disk) through
+    algorithms that process the data block-wise, such as
+    :map:`pca_from_blocks`.
+
+    Parameters
+    ----------
+    vectorizables : `list` or generator of :map:`Vectorizable` objects
+        A list or generator of objects that supports the vectorizable interface
+    block_size : `int`, optional
+        The (maximum) number of rows in each block.
+
+    Returns
+    -------
+    blocks : generator of ``(n_block, n_features)`` `ndarray`
+        Every row of each block is an element of the list. Every block has
+        ``block_size`` rows apart from (possibly) the last one.
+    """
+    vectorizables = iter(vectorizables)
+    for template in vectorizables:
+        template_vector = template.as_vector()
+        block = np.empty((block_size, template_vector.shape[0]),
+                         dtype=template_vector.dtype)
+        block[0] = template_vector
+        i = 0
+        for i, sample in enumerate(islice(vectorizables, block_size - 1), 1):
+            block[i] = sample.as_vector()
+        yield block[:i + 1]
+
+
 def from_matrix(matrix, template):
     r"""
     Create a generator from a matrix given a template :map:`Vectorizable`
@@ -1,6 +1,9 @@
+import tempfile
 import numpy as np
-from numpy.testing import assert_almost_equal
-from menpo.math import eigenvalue_decomposition, pca, ipca
+from numpy.testing import assert_almost_equal, assert_equal
+from nose.tools import raises
+from menpo.math import (eigenvalue_decomposition, covariance_matrix, pca,
+                        pca_from_blocks, ipca)
 
 # Positive semi-definite matrix
 cov_matrix = np.array([[3, 1], [1, 3]])
@@ -169,3 +172,166 @@ def ipca_features_nocentre_test():
     assert_almost_equal(np.abs(i_U), np.abs(b_U))
     assert_almost_equal(i_l, b_l)
     assert_almost_equal(i_m, b_m)
+
+
+def pca_randomized_matches_eigen_test():
+    np.random.seed(0)
+    # low rank data plus a little noise
+    X = (np.random.randn(200, 5).dot(np.random.randn(5, 300)) +
+         np.random.randn(200, 300) * 0.01)
+    U, l, m = pca(X)
+    U_r, l_r, m_r = pca(X, method='randomized', n_components=5)
+    assert_almost_equal(l_r, l[:5])
+    assert_almost_equal(m_r, m)
+    # the eigenvectors are equal up to sign
+    assert_almost_equal(np.abs(np.sum(U_r * U[:5], axis=1)), np.ones(5))
+
+
+def pca_randomized_inplace_leaves_centred_data_test():
+    np.random.seed(0)
+    X = np.random.randn(20, 30) + 5
+    X_copy = X.copy()
+    _, _, m = pca(X, method='randomized', n_components=3, inplace=True)
+    assert_almost_equal(X, X_copy - m)
+
+
+def pca_randomized_random_state_test():
+    X = np.random.randn(40, 60)
+    U_1, l_1, _ = pca(X, method='randomized', n_components=5,
+                      n_power_iterations=0, random_state=1)
+    U_2, l_2, _ = pca(X, method='randomized', n_components=5,
+                      n_power_iterations=0,
+                      random_state=np.random.RandomState(1))
+    assert_equal(U_1, U_2)
+    assert_equal(l_1, l_2)
+    U_b, l_b, _, _, _ = pca_from_blocks(
+        _blocks(X, 7), method='randomized', n_components=5,
+        n_power_iterations=0, random_state=1)
+    U_b2, l_b2, _, _, _ = pca_from_blocks(
+        _blocks(X, 7), method='randomized', n_components=5,
+        n_power_iterations=0, random_state=1)
+    assert_equal(U_b, U_b2)
+    assert_equal(l_b, l_b2)
+
+
+def pca_randomized_fused_centring_test():
+    X = np.random.randn(40, 60) + 100
+    X_copy = X.copy()
+    U, l, m = pca(X, method='randomized', n_components=5, random_state=0)
+    assert_equal(X, X_copy)
+    U_i, l_i, m_i = pca(X_copy, method='randomized', n_components=5,
+                        inplace=True, random_state=0)
+    assert_almost_equal(l, l_i)
+    assert_almost_equal(m, m_i)
+    assert_almost_equal(np.abs(np.sum(U * U_i, axis=1)), np.ones(5))
+
+
+def pca_n_components_eigen_test():
+    U, l, m = pca(large_samples_data_matrix, n_components=1)
+    assert_almost_equal(l, eigenvalues_centered_s[:1])
+    assert_almost_equal(U, centered_eigenvectors_s[:1])
+
+
+@raises(ValueError)
+def pca_randomized_no_n_components_test():
+    pca(large_samples_data_matrix, method='randomized')
+
+
+@raises(ValueError)
+def pca_unknown_method_test():
+    pca(large_samples_data_matrix, method='svd')
+
+
+def _blocks(X, block_size):
+    return lambda: (X[i:i + block_size] for i in range(0, X.shape[0],
+                                                       block_size))
+
+
+def pca_from_blocks_covariance_test():
+    np.random.seed(0)
+    X = np.random.randn(50, 8) + 100
+    U, l, m = pca(X)
+    U_b, l_b, m_b, n, total_variance = pca_from_blocks(_blocks(X, 7)())
+    assert n == 50
+    assert_almost_equal(l_b, l)
+    assert_almost_equal(m_b, m)
+    assert_almost_equal(np.abs(U_b), np.abs(U))
+    assert_almost_equal(total_variance, np.var(X, axis=0, ddof=1).sum())
+
+
+def pca_from_blocks_covariance_nocentre_test():
+    U_b, l_b, m_b, _, _ = pca_from_blocks(
+        _blocks(large_samples_data_matrix, 3), centre=False)
+    assert_almost_equal(l_b, eigenvalues_no_centre_s)
+    assert_almost_equal(np.abs(U_b), np.abs(non_centered_eigenvectors_s))
+    assert_almost_equal(m_b, np.zeros(2))
+
+
+def pca_from_blocks_randomized_test():
+    np.random.seed(0)
+    X = (np.random.randn(200, 5).dot(np.random.randn(5, 300)) +
+         np.random.randn(200, 300) * 0.01 + 3)
+    U, l, m = pca(X)
+    U_r, l_r, m_r, n, total_variance = pca_from_blocks(
+        _blocks(X, 33), method='randomized', n_components=5)
+    assert n == 200
+    assert_almost_equal(l_r, l[:5])
+    assert_almost_equal(m_r, m)
+    assert_almost_equal(np.abs(np.sum(U_r * U[:5], axis=1)), np.ones(5))
+    assert_almost_equal(total_variance, l.sum())
+
+
+@raises(ValueError)
+def pca_from_blocks_randomized_not_callable_test():
+    pca_from_blocks(iter([large_samples_data_matrix]), method='randomized',
+                    n_components=1)
+
+
+@raises(ValueError)
+def pca_from_blocks_empty_test():
+    pca_from_blocks([])
+
+
+def pca_inplace_memmap_test():
+    np.random.seed(0)
+    for shape in [(40, 10), (10, 40)]:
+        X = np.random.randn(*shape) + 3
+        U, l, m = pca(X)
+        X_m = np.memmap(tempfile.TemporaryFile(), dtype=np.float64,
+                        mode='w+', shape=shape)
+        X_m[:] = X
+        U_m, l_m, m_m = pca(X_m, inplace=True)
+        assert_almost_equal(l_m, l)
+        assert_almost_equal(m_m, m)
+        assert_almost_equal(np.abs(U_m), np.abs(U))
+
+
+def covariance_matrix_test():
+    np.random.seed(0)
+    X = np.random.randn(23, 17) + 2
+    m = X.mean(axis=0)
+    Xc = X - m
+    X_copy = X.copy()
+    for n_threads in [1, 3]:
+        C = covariance_matrix(X, mean=m, block_size=5, n_threads=n_threads)
+        assert_almost_equal(C, np.dot(Xc.T, Xc) / 22)
+        assert np.all(C == C.T)
+        G = covariance_matrix(X, mean=m, gram=True, block_size=5,
+                              n_threads=n_threads)
+        assert_almost_equal(G, np.dot(Xc, Xc.T) / 22)
+        assert np.all(G == G.T)
+    # X is never modified
+    assert np.all(X == X_copy)
+    assert_almost_equal(covariance_matrix(Xc), np.dot(Xc.T, Xc) / 22)
+
+
+def pca_n_threads_test():
+    np.random.seed(0)
+    for shape in [(40, 10), (10, 40)]:
+        X = np.random.randn(*shape) + 3
+        X_copy = X.copy()
+        U, l, m = pca(X, inplace=True)
+        U_t, l_t, m_t = pca(X_copy, n_threads=2)
+        assert_almost_equal(l_t, l)
+        assert_almost_equal(m_t, m)
+        assert_almost_equal(np.abs(U_t), np.abs(U))
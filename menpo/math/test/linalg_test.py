@@ -1,8 +1,11 @@
+import os
+import tempfile
 from nose.tools import raises
 import numpy as np
 from numpy.testing import assert_equal, assert_allclose
 from menpo.math import (dot_inplace_left, dot_inplace_right, as_matrix,
-                        from_matrix)
+                        as_matrix_blocks, from_matrix, memmap_block_size,
+                        dot_block_size)
 from menpo.image import MaskedImage
 
 
@@ -46,6 +49,33 @@ def test_dot_inplace_right():
     assert_equal(a_r_tmp, a_r)
 
 
+def test_dot_inplace_left_n_threads():
+    a_l_tmp = a_l.copy()
+    profiled = []
+    left_result = dot_inplace_left(a_l_tmp, b_l, block_size=1000,
+                                   n_threads=3,
+                                   profile=lambda *a: profiled.append(a))
+    assert_allclose(left_result, gt_l)
+    assert_equal(len(profiled), 1)
+    gflops, seconds = profiled[0]
+    assert gflops > 0 and seconds >= 0
+
+
+def test_dot_inplace_right_n_threads():
+    b_r_tmp = b_r.copy()
+    right_result = dot_inplace_right(a_r, b_r_tmp, n_threads=4)
+    assert_allclose(right_result, gt_r)
+
+
+def test_dot_block_size():
+    x = np.empty((1000, 10))
+    # 800 byte budget of 10 float64 item slices -> 10, rounded to 8 (64 bytes)
+    assert_equal(dot_block_size(x, 10, 1000, max_memory=800), 8)
+    # at least one block for every thread
+    assert_equal(dot_block_size(x, 10, 1000, n_threads=4), 248)
+    assert_equal(dot_block_size(x, 10, 1000, max_memory=1), 1)
+
+
 @raises(ValueError)
 def test_dot_inplace_left_n_small_too_big_raises_value_error():
     a = np.zeros((10000, 100))
@@ -95,3 +125,76 @@ def test_as_matrix_return_template():
 def test_from_matrix():
     images = from_matrix(matrix, template)
     assert isinstance(next(images), MaskedImage)
+
+
+def test_as_matrix_blocks():
+    samples = list(from_matrix(matrix, template))
+    blocks = list(as_matrix_blocks(samples, block_size=2))
+    assert_equal([b.shape[0] for b in blocks], [2, 2, 1])
+    assert_allclose(np.vstack(blocks), matrix)
+
+
+def test_as_matrix_memmap_path():
+    samples = list(from_matrix(matrix, template))
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        data = as_matrix(samples, out=path)
+        assert isinstance(data, np.memmap)
+        assert_allclose(data, matrix)
+        del data
+        assert_allclose(np.fromfile(path).reshape(matrix.shape), matrix)
+    finally:
+        os.remove(path)
+
+
+def test_as_matrix_preallocated_out():
+    samples = list(from_matrix(matrix, template))
+    out = np.empty(matrix.shape)
+    data = as_matrix(samples, out=out)
+    assert data is out
+    assert_allclose(out, matrix)
+
+
+@raises(ValueError)
+def test_as_matrix_out_wrong_shape_raises_value_error():
+    as_matrix(list(from_matrix(matrix, template)),
+              out=np.empty((n_images, 3)))
+
+
+def test_dot_inplace_right_memmap():
+    b = np.memmap(tempfile.TemporaryFile(), dtype=np.float64, mode='w+',
+                  shape=b_r.shape)
+    b[:] = b_r
+    result = dot_inplace_right(a_r, b)
+    assert_allclose(result, gt_r)
+
+
+def test_memmap_block_size():
+    assert_equal(memmap_block_size(10, itemsize=8, max_memory=800), 10)
+    assert_equal(memmap_block_size(1000, itemsize=8, max_memory=800), 1)
+
+
+def test_as_matrix_masked_images_gathered():
+    images = list(from_matrix(matrix, template))
+    for n_threads in [1, 3]:
+        data = as_matrix(images, n_threads=n_threads)
+        assert_allclose(data, matrix)
+
+
+def test_as_matrix_masked_images_different_masks():
+    images = list(from_matrix(matrix, template))
+    # same number of true pixels (20), but a different mask
+    other_mask = np.zeros(image_shape, dtype=np.bool)
+    other_mask[2:4] = True
+    other = MaskedImage(np.random.rand(1, *image_shape), mask=other_mask)
+    images[2] = other
+    data = as_matrix(images)
+    assert_allclose(data[2], other.as_vector())
+    assert_allclose(data[[0, 1, 3, 4]], matrix[[0, 1, 3, 4]])
+
+
+def test_as_matrix_generator_n_threads():
+    images = from_matrix(matrix, template)
+    data = as_matrix(images, length=n_images, n_threads=2)
+    assert_allclose(data, matrix)
@@ -1,3 +1,6 @@
+import numpy as np
+from menpo.math import as_matrix, from_matrix
+
 
 class InstanceBackedModel(object):
     r"""
@@ -126,3 +129,81 @@ class InstanceBackedModel(object):
         """
         vector_instance = self.project_out_vector(instance.as_vector())
         return instance.from_vector(vector_instance)
+
+    def project_instances(self, instances):
+        """
+        Projects each of the `instances` onto the model, retrieving the
+        optimal linear weightings for all of them in a single matrix
+        product.
+
+        Parameters
+        ----------
+        instances : `list` of :map:`Vectorizable` or `ndarray`
+            The novel instances, or an already stacked
+            ``(n_instances, n_features)`` matrix of their vectorized forms.
+
+        Returns
+        -------
+        projected : ``(n_instances, n_components)`` `ndarray`
+            The matrix of optimal linear weightings.
+        """
+        return self.project_vectors(_instances_as_matrix(instances))
+
+    def reconstruct_instances(self, instances):
+        """
+        Projects each of the `instances` onto the linear space and rebuilds
+        them from the weights found, processing all of them at once.
+
+        Parameters
+        ----------
+        instances : `list` of :map:`Vectorizable` or `ndarray`
+            The novel instances, or an already stacked
+            ``(n_instances, n_features)`` matrix of their vectorized forms.
+
+        Returns
+        -------
+        reconstructed : `list` of :map:`Vectorizable`
+            The reconstructed instances. If `instances` was an `ndarray`, they
+            are built from the `template_instance`.
+        """
+        X = _instances_as_matrix(instances)
+        return self._matrix_as_instances(self.reconstruct_vectors(X),
+                                         instances)
+
+    def project_out_instances(self, instances):
+        """
+        Returns a version of each of the `instances` where all the basis of
+        the model have been projected out, processing all of them at once.
+
+        Parameters
+        ----------
+        instances : `list` of :map:`Vectorizable` or `ndarray`
+            The novel instances, or an already stacked
+            ``(n_instances, n_features)`` matrix of their vectorized forms.
+
+        Returns
+        -------
+        projected_out : `list` of :map:`Vectorizable`
+            Copies of the `instances`, with all basis of the model projected
+            out. If `instances` was an `ndarray`, they are built from the
+            `template_instance`.
+        """
+        X = _instances_as_matrix(instances)
+        return self._matrix_as_instances(self.project_out_vectors(X),
+                                         instances)
+
+    def _matrix_as_instances(self, matrix, instances):
+        if isinstance(instances, np.ndarray):
+            return list(from_matrix(matrix, self.template_instance))
+        return [i.from_vector(v) for i, v in zip(instances, matrix)]
+
+
+def _instances_as_matrix(instances):
+    r"""
+    The ``(n_instances, n_features)`` data matrix of a `list` of
+    :map:`Vectorizable` objects, or `instances` itself if it is already an
+    `ndarray`.
+    """
+    if isinstance(instances, np.ndarray):
+        return instances
+    return as_matrix(instances)
@@ -1,6 +1,12 @@
 from __future__ import division
+from itertools import chain
+import struct
+try:
+    import cPickle as pickle
+except ImportError:
+    import pickle
 import numpy as np
-from menpo.math import pca, ipca, as_matrix
+from menpo.math import pca, pca_from_blocks, ipca, as_matrix, as_matrix_blocks
 from menpo.model.base import MeanInstanceLinearModel
 
 
@@ -25,16 +31,46 @@ class PCAModel(MeanInstanceLinearModel):
         If provided then ``samples``  must be an iterator that yields
         ``n_samples``. If not provided then samples has to be a `list` (so we
         know how large the data matrix needs to be).
+    method : ``{'eigen', 'randomized'}``, optional
+        The method used to compute the principal components - see :map:`pca`.
+        ``'randomized'`` only computes the leading ``n_components``, which is
+        much faster and uses far less memory for large models. The variance
+        of the components that are not computed is recovered from the data
+        and accounted for as trimmed (equally shared amongst them).
+    n_components : `int` or ``None``, optional
+        The number of components to keep. Required for
+        ``method='randomized'``. If ``None``, all the components are kept.
+    oversampling : `int`, optional
+        Only used for ``method='randomized'`` - see :map:`pca`.
+    n_power_iterations : `int`, optional
+        Only used for ``method='randomized'`` - see :map:`pca`.
+    data_path : `str` or ``None``, optional
+        If provided, the data matrix is memory mapped to a (new) file at this
+        path rather than allocated in memory, and PCA is performed on it
+        block-wise. This allows models to be built from data matrices larger
+        than the available memory. The file is left centred on disk.
+    random_state : `int`, `numpy.random.RandomState` or ``None``, optional
+        Only used for ``method='randomized'`` - see :map:`pca`.
      """
-    def __init__(self, samples, centre=True, n_samples=None, verbose=False):
+    _cache_attrs = ('_cache', '_cache_state', '_cache_version')
+
+    def __init__(self, samples, centre=True, n_samples=None, verbose=False,
+                 method='eigen', n_components=None, oversampling=10,
+                 n_power_iterations=2, data_path=None, random_state=None):
         # build a data matrix from all the samples
         data, template = as_matrix(samples, length=n_samples,
-                                   return_template=True, verbose=verbose)
+                                   return_template=True, verbose=verbose,
+                                   out=data_path)
         # (n_samples, n_features)
         self.n_samples = data.shape[0]
 
         # compute pca
-        e_vectors, e_values, mean = pca(data, centre=centre, inplace=True)
+        randomized = method == 'randomized'
+        e_vectors, e_values, mean = pca(
+            data, centre=centre, inplace=True, method=method,
+            n_components=n_components if randomized else None,
+            oversampling=oversampling, n_power_iterations=n_power_iterations,
+            random_state=random_state)
 
         super(PCAModel, self).__init__(e_vectors, mean, template)
         self.centred = centre
@@ -42,6 +78,188 @@ class PCAModel(MeanInstanceLinearModel):
         # start the active components as all the components
         self._n_active_components = int(self.n_components)
         self._trimmed_eigenvalues = np.array([])
+        if randomized:
+            # the randomized pca leaves the data centred, so we can recover
+            # the variance of the components that were never computed
+            # the total variance is the trace of the covariance matrix
+            total_variance = (np.einsum('ij,ij->', data, data) /
+                              (self.n_samples - 1))
+            self._trimmed_eigenvalues = _uncomputed_eigenvalues(
+                total_variance, e_values, self.n_samples, data.shape[1],
+                centre)
+        elif n_components is not None:
+            self.trim_components(n_components)
+
+    @classmethod
+    def init_from_blocks(cls, samples, centre=True, block_size=1000,
+                         method='covariance', n_components=None,
+                         oversampling=10, n_power_iterations=2,
+                         random_state=None):
+        r"""
+        Build a PCA model without ever materialising the data matrix, by
+        streaming the samples in blocks of ``block_size``. This allows models
+        to be trained on more data than fits in memory. For details of the
+        implementation, see :map:`pca_from_blocks`.
+
+        Parameters
+        ----------
+        samples : `callable` or `iterable` of :map:`Vectorizable`
+            The samples to build the model from. If a `callable`, it is
+            called (with no arguments) to obtain a fresh iterable of the
+            samples for each pass over the data, which is required for
+            ``method='randomized'``.
+        centre : `bool`, optional
+            When ``True`` (default) PCA is performed after mean centering the
+            data. If ``False`` the data is assumed to be centred, and the mean
+            will be ``0``.
+        block_size : `int`, optional
+            The number of samples that are held in memory at any one time.
+        method : ``{'covariance', 'randomized'}``, optional
+            ``'covariance'`` accumulates the ``(n_features, n_features)``
+            covariance matrix in a single pass, and is exact.
+            ``'randomized'`` only computes the leading ``n_components`` in
+            ``2 + 2 * n_power_iterations`` passes, which scales to any
+            number of features. The variance of the components that are not
+            computed is accounted for as trimmed (equally shared amongst
+            them).
+        n_components : `int` or ``None``, optional
+            The number of components to keep. Required for
+            ``method='randomized'``. If ``None``, all the components are
+            kept.
+        oversampling : `int`, optional
+            Only used for ``method='randomized'`` - see :map:`pca`.
+        n_power_iterations : `int`, optional
+            Only used for ``method='randomized'`` - see :map:`pca`.
+        random_state : `int`, `numpy.random.RandomState` or ``None``, optional
+            Only used for ``method='randomized'`` - see :map:`pca`.
+
+        Returns
+        -------
+        model : :map:`PCAModel`
+            The PCA model built from the samples.
+        """
+        # the first sample seen is kept as the template
+        templates = []
+
+        def blocks():
+            vectorizables = iter(samples() if callable(samples) else samples)
+            if not templates:
+                template = next(vectorizables)
+                templates.append(template)
+                vectorizables = chain([template], vectorizables)
+            return as_matrix_blocks(vectorizables, block_size=block_size)
+
+        randomized = method == 'randomized'
+        e_vectors, e_values, mean, n_samples, total_variance = \
+            pca_from_blocks(blocks if callable(samples) else blocks(),
+                            centre=centre, method=method,
+                            n_components=n_components if randomized else None,
+                            oversampling=oversampling,
+                            n_power_iterations=n_power_iterations,
+                            random_state=random_state)
+
+        model = cls._init_from_decomposition(e_vectors, e_values, mean,
+                                             templates[0], n_samples, centre)
+        if randomized:
+            model._trimmed_eigenvalues = _uncomputed_eigenvalues(
+                total_variance, e_values, n_samples, mean.shape[0], centre)
+        elif n_components is not None:
+            model.trim_components(n_components)
+        return model
+
+    @classmethod
+    def init_from_stream(cls, samples, batch_size=100, n_components=None,
+                         forgetting_factor=1.0, centre=True):
+        r"""
+        Build a PCA model by incremental PCA over mini-batches of a stream of
+        samples, keeping at most ``n_components`` components between
+        batches. Only one batch of samples is held in memory at any one time,
+        so memory is bounded by
+        ``O((batch_size + n_components) * n_features)`` regardless of the
+        number of samples. For details of the implementation, see
+        :map:`ipca`.
+
+        Parameters
+        ----------
+        samples : `iterable` of :map:`Vectorizable`
+            The samples to build the model from, e.g. a generator that loads
+            them lazily.
+        batch_size : `int`, optional
+            The number of samples in each mini-batch.
+        n_components : `int` or ``None``, optional
+            The maximum number of components kept between batches. If
+            ``None``, all the components are kept, and memory grows with the
+            number of samples.
+        forgetting_factor : ``[0.0, 1.0]`` `float`, optional
+            Forgetting factor that weights the relative contribution of new
+            samples vs old samples - see :meth:`increment`.
+        centre : `bool`, optional
+            When ``True`` (default) PCA is performed after mean centering the
+            data. If ``False`` the data is assumed to be centred, and the mean
+            will be ``0``.
+
+        Returns
+        -------
+        model : :map:`PCAModel`
+            The PCA model built from the samples. The components that were
+            discarded on the final batch are kept as trimmed components, and
+            the variance of those discarded on earlier batches is shared
+            equally by trimmed components standing in for them, so that the
+            total variance of the samples is preserved.
+        """
+        samples = iter(samples)
+        template = next(samples)
+        batches = as_matrix_blocks(chain([template], samples),
+                                   block_size=batch_size)
+        # initialise the model from the first batch
+        data = next(batches)
+        e_vectors, e_values, mean = pca(data, centre=centre, inplace=True)
+        n_samples = data.shape[0]
+        # the variance of the components discarded between batches, in the
+        # units of the current eigenvalues
+        discarded = 0.
+        for data in batches:
+            discarded += e_values[n_components:].sum()
+            e_vectors, e_values = (e_vectors[:n_components],
+                                   e_values[:n_components])
+            # ipca rescales the eigenvalues from n_samples - 1 to n - 1
+            # samples (and weights the old samples by the forgetting factor)
+            n = forgetting_factor * n_samples + data.shape[0]
+            discarded *= forgetting_factor ** 2 * (n_samples - 1) / (n - 1)
+            e_vectors, e_values, mean = ipca(
+                data, e_vectors, e_values, n_samples,
+                m_a=mean if centre else None, f=forgetting_factor)
+            n_samples += data.shape[0]
+
+        model = cls._init_from_decomposition(e_vectors, e_values, mean,
+                                             template, n_samples, centre)
+        if n_components is not None:
+            model.trim_components(n_components)
+        if discarded > 0:
+            uncomputed = _uncomputed_eigenvalues(
+                e_values.sum() + discarded, e_values, n_samples,
+                mean.shape[0], centre)
+            if uncomputed.size == 0:
+                uncomputed = np.array([discarded])
+            model._trimmed_eigenvalues = np.hstack(
+                (model._trimmed_eigenvalues, uncomputed))
+        return model
+
+    @classmethod
+    def _init_from_decomposition(cls, e_vectors, e_values, mean, template,
+                                 n_samples, centre):
+        r"""
+        Build a model directly from the results of a PCA, with all the
+        components active and none trimmed.
+        """
+        model = cls.__new__(cls)
+        MeanInstanceLinearModel.__init__(model, e_vectors, mean, template)
+        model.n_samples = n_samples
+        model.centred = centre
+        model._eigenvalues = e_values
+        model._n_active_components = int(model.n_components)
+        model._trimmed_eigenvalues = np.array([])
+        return model
 
     @property
     def n_active_components(self):
@@ -101,17 +319,88 @@ class PCAModel(MeanInstanceLinearModel):
                     return
         if 0 < value <= self.n_components:
             self._n_active_components = int(value)
+            self._invalidate_cache()
         else:
             raise ValueError(err_str)
 
     @MeanInstanceLinearModel.components.getter
     def components(self):
         r"""
-        Returns the active components of the model.
+        Returns the active components of the model. The returned array is a
+        C-contiguous view onto the components, which is reused until the
+        number of active components (or the components array) changes.
 
         :type: ``(n_active_components, n_features)`` `ndarray`
         """
-        return self._components[:self.n_active_components, :]
+        if not self._components.flags.c_contiguous:
+            # ensure the active components are a contiguous block of
+            # memory (and remain a view, so inplace updates are seen)
+            self._components = np.ascontiguousarray(self._components)
+        if self._components.dtype == np.float16:
+            # half precision is only a storage format - compute in single
+            return self._cached(
+                'components', lambda: self._components[
+                    :self.n_active_components, :].astype(np.float32))
+        return self._cached(
+            'components',
+            lambda: self._components[:self.n_active_components, :])
+
+    @components.setter
+    def components(self, value):
+        r"""
+        Updates the components of this model, ensuring that the shape
+        of the components is not changed.
+
+        Parameters
+        ----------
+        value : ``(n_components, n_features)`` `ndarray`
+            The new components array.
+
+        Raises
+        ------
+        ValueError
+            Trying to replace components of shape {} with some of shape {}
+        """
+        if value.shape != self._components.shape:
+            raise ValueError(
+                "Trying to replace components of shape {} with some of "
+                "shape {}".format(self._components.shape, value.shape))
+        # write to the stored components (rounding to their dtype), never to
+        # the cached active components
+        self._components[...] = value
+        self._invalidate_cache()
+
+    def _cached(self, name, compute):
+        r"""
+        Returns the derived quantity ``name``, calling ``compute()`` to
+        compute it only if it is not cached for the current state of the
+        model. The cache is keyed on the components array, the number of
+        active components and a version that is incremented by every method
+        that mutates the model (see :meth:`_invalidate_cache`).
+
+        Cached arrays are shared between calls and must not be modified.
+        """
+        version = getattr(self, '_cache_version', 0)
+        state = getattr(self, '_cache_state', None)
+        if (state is None or state[0] is not self._components or
+                state[1] != self._n_active_components or
+                state[2] != version):
+            self._cache_state = (self._components, self._n_active_components,
+                                 version)
+            self._cache = {}
+        try:
+            return self._cache[name]
+        except KeyError:
+            value = compute()
+            self._cache[name] = value
+            return value
+
+    def _invalidate_cache(self):
+        r"""
+        Invalidates all the cached derived quantities of the model. Must be
+        called whenever the model is mutated inplace.
+        """
+        self._cache_version = getattr(self, '_cache_version', 0) + 1
 
     @property
     def eigenvalues(self):
@@ -130,11 +419,13 @@ class PCAModel(MeanInstanceLinearModel):
         Returns
         -------
         whitened_components : ``(n_active_components, n_features)`` `ndarray`
-            The whitened components.
+            The whitened components. This array is cached, and must not be
+            modified.
         """
-        return self.components / (
-            np.sqrt(self.eigenvalues * self.n_samples +
-                    self.noise_variance())[:, None])
+        return self._cached('whitened_components', lambda: (
+            self.components / np.sqrt(self.eigenvalues * self.n_samples +
+                                      self.noise_variance())[:, None]
+        ).astype(self.components.dtype, copy=False))
 
     def original_variance(self):
         r"""
@@ -263,6 +554,9 @@ class PCAModel(MeanInstanceLinearModel):
         noise_variance : `float`
             The mean variance of the inactive components.
         """
+        return self._cached('noise_variance', self._noise_variance)
+
+    def _noise_variance(self):
         if self.n_active_components == self.n_components:
             noise_variance = 0.0
             if self._trimmed_eigenvalues.size is not 0:
@@ -305,6 +599,174 @@ class PCAModel(MeanInstanceLinearModel):
             raise ValueError("noise variance is 0 - cannot take the inverse")
         return 1.0 / noise_variance
 
+    def _components_t(self):
+        r"""
+        The transpose of the active components as a (cached) C-contiguous
+        ``(n_features, n_active_components)`` array.
+        """
+        return self._cached(
+            'components_t', lambda: np.ascontiguousarray(self.components.T))
+
+    def project_vectors(self, vectors):
+        """
+        Projects each of the `vectors` onto the model, retrieving
+        the optimal linear reconstruction weights for each instance.
+
+        Parameters
+        ----------
+        vectors : ``(n_samples, n_features)`` `ndarray`
+            Array of vectorized novel instances.
+
+        Returns
+        -------
+        projected : ``(n_samples, n_active_components)`` `ndarray`
+            The matrix of optimal linear weights.
+        """
+        X = (vectors - self.mean_vector).astype(self.components.dtype,
+                                                copy=False)
+        return np.dot(X, self._components_t())
+
+    def project_out_vectors(self, vectors):
+        """
+        Returns a version of `vectors` where all the basis of the model have
+        been projected out, i.e. ``vectors (I - U^T U)`` where ``U`` are the
+        active components. The projection is applied in factored form, so the
+        ``(n_features, n_features)`` projection matrix is never built.
+
+        Parameters
+        ----------
+        vectors : ``(n_vectors, n_features)`` `ndarray`
+            A matrix of novel vectors.
+
+        Returns
+        -------
+        projected_out : ``(n_vectors, n_features)`` `ndarray`
+            A copy of `vectors` with all basis of the model projected out.
+        """
+        U = self.components
+        weights = np.dot(vectors.astype(U.dtype, copy=False),
+                         self._components_t())
+        return vectors - np.dot(weights, U)
+
+    def _instance_vectors_for_full_weights(self, full_weights):
+        # compute at the precision of the components, avoiding an upcast
+        # copy of the components by np.dot
+        U = self.components
+        x = np.dot(full_weights.astype(U.dtype, copy=False), U)
+        return x + self.mean_vector
+
+    def astype(self, dtype):
+        r"""
+        Returns a copy of this model with the components and mean vector
+        stored with the given `dtype`. Single precision (``np.float32``)
+        halves the memory footprint of the model, and all the projection
+        operations are then computed in single precision too. Half precision
+        (``np.float16``) is supported as a storage format only - the active
+        components are converted to single precision (once, see
+        :attr:`components`) for computation. Methods that update the model
+        inplace store their results rounded to the model's `dtype`.
+
+        Parameters
+        ----------
+        dtype : `numpy.dtype`
+            One of ``np.float64``, ``np.float32`` or ``np.float16``.
+
+        Returns
+        -------
+        model : :map:`PCAModel`
+            A copy of this model with components of the given `dtype`.
+
+        Raises
+        ------
+        ValueError
+            If `dtype` is not a supported floating point type.
+        """
+        dtype = np.dtype(dtype)
+        if dtype not in (np.float64, np.float32, np.float16):
+            raise ValueError('dtype must be one of float64, float32 or '
+                             'float16, not {}'.format(dtype))
+        model = self.copy()
+        model._components = self._components.astype(dtype)
+        model.mean_vector = self.mean_vector.astype(dtype)
+        model._invalidate_cache()
+        return model
+
+    def export_compact(self, fp):
+        r"""
+        Exports this model in a compact binary format, in which the
+        components and mean vector are stored as raw arrays (at their
+        current `dtype` - see :meth:`astype`). Models in this format can be
+        loaded with :meth:`init_from_compact` with the arrays memory mapped,
+        so that many processes can share a single copy of each model.
+
+        Parameters
+        ----------
+        fp : `str`
+            The path of the file to write the model to.
+        """
+        state = self.__getstate__()
+        arrays = [(k, np.ascontiguousarray(state.pop(k)))
+                  for k in _COMPACT_ARRAYS]
+        header_arrays, offset = [], 0
+        for name, a in arrays:
+            header_arrays.append((name, a.dtype.str, a.shape, offset))
+            offset = _aligned(offset + a.nbytes)
+        header = pickle.dumps((type(self), state, header_arrays), protocol=2)
+        # the arrays start after the (aligned) header
+        start = _aligned(len(_COMPACT_MAGIC) + 8 + len(header))
+        with open(fp, 'wb') as f:
+            f.write(_COMPACT_MAGIC)
+            f.write(struct.pack('<Q', len(header)))
+            f.write(header)
+            for (_, _, _, a_offset), (_, a) in zip(header_arrays, arrays):
+                f.seek(start + a_offset)
+                a.tofile(f)
+
+    @classmethod
+    def init_from_compact(cls, fp, mmap=True):
+        r"""
+        Loads a model written by :meth:`export_compact`.
+
+        Parameters
+        ----------
+        fp : `str`
+            The path of the file to load the model from.
+        mmap : `bool`, optional
+            If ``True``, the components and mean vector are (read-only)
+            memory maps onto the file, so that they are only paged into
+            memory as they are used, and are shared between all the processes
+            that load the same file. Such models are read-only. If ``False``,
+            they are read into memory.
+
+        Returns
+        -------
+        model : :map:`PCAModel`
+            The loaded model.
+
+        Raises
+        ------
+        ValueError
+            If the file is not a compact PCA model.
+        """
+        with open(fp, 'rb') as f:
+            if f.read(len(_COMPACT_MAGIC)) != _COMPACT_MAGIC:
+                raise ValueError('{} is not a compact PCA model'.format(fp))
+            n_header, = struct.unpack('<Q', f.read(8))
+            model_cls, state, header_arrays = pickle.loads(f.read(n_header))
+            start = _aligned(len(_COMPACT_MAGIC) + 8 + n_header)
+            model = model_cls.__new__(model_cls)
+            model.__dict__.update(state)
+            for name, dtype, shape, offset in header_arrays:
+                if mmap:
+                    a = np.memmap(fp, dtype=dtype, mode='r', shape=shape,
+                                  offset=start + offset)
+                else:
+                    f.seek(start + offset)
+                    a = np.fromfile(f, dtype=dtype,
+                                    count=int(np.prod(shape))).reshape(shape)
+                setattr(model, name, a)
+        return model
+
     def component_vector(self, index, with_mean=True, scale=1.0):
         r"""
         A particular component of the model, in vectorized form.
@@ -417,6 +879,7 @@ class PCAModel(MeanInstanceLinearModel):
                 self._eigenvalues[self.n_active_components:]))
             # make sure that the eigenvalues are trimmed too
             self._eigenvalues = self._eigenvalues[:nac].copy()
+            self._invalidate_cache()
 
     def project_whitened(self, instance):
         """
@@ -498,8 +961,20 @@ class PCAModel(MeanInstanceLinearModel):
                 self.n_active_components = n_active_components
 
         # now we can set our own components with the updated orthogonal ones
+        # (the components setter invalidates the cache)
         self.components = Q[linear_model.n_components:, :]
 
+    def orthonormalize_inplace(self):
+        r"""
+        Enforces that this model's components are orthonormalized,
+        s.t. ``component_vector(i).dot(component_vector(j) = dirac_delta``.
+        """
+        nac = self.n_active_components
+        Q = np.linalg.qr(self._components[:nac].T.astype(np.float64))[0].T
+        # write to the stored components (rounding to their dtype)
+        self._components[:nac] = Q
+        self._invalidate_cache()
+
     def increment(self, samples, n_samples=None, forgetting_factor=1.0,
                   verbose=False):
         r"""
@@ -541,10 +1016,13 @@ class PCAModel(MeanInstanceLinearModel):
         reset = (self.n_active_components == self.n_components)
 
         # update mean, components, eigenvalues and number of samples
-        self.mean_vector = m_vector
-        self._components = e_vectors
+        # (keeping the dtype the model is stored with - see astype)
+        self.mean_vector = m_vector.astype(self.mean_vector.dtype, copy=False)
+        self._components = e_vectors.astype(self._components.dtype,
+                                            copy=False)
         self._eigenvalues = e_values
         self.n_samples += n_new_samples
+        self._invalidate_cache()
 
         # reset the number of active components to the total number of
         # components
@@ -1015,3 +1493,32 @@ class PCAModel(MeanInstanceLinearModel):
             self.noise_variance_ratio(), self.n_components,
             self.components.shape)
         return str_out
+
+
+# the identifying prefix of files written by PCAModel.export_compact
+_COMPACT_MAGIC = b'MENPOPCA\x01'
+# the (large) arrays that are stored raw in the compact format
+_COMPACT_ARRAYS = ('_components', 'mean_vector')
+
+
+def _aligned(offset, alignment=64):
+    r"""
+    `offset` rounded up to the next multiple of `alignment` bytes.
+    """
+    return -(-offset // alignment) * alignment
+
+
+def _uncomputed_eigenvalues(total_variance, eigenvalues, n_samples,
+                            n_features, centre):
+    r"""
+    Eigenvalues standing in for the components of a data matrix that were
+    not computed, sharing the variance of the data (``total_variance``) not
+    captured by ``eigenvalues`` equally. This preserves both the total and
+    the mean of the discarded variance.
+    """
+    rank = min(n_samples - 1 if centre else n_samples, n_features)
+    n_uncomputed = rank - eigenvalues.shape[0]
+    residual = total_variance - eigenvalues.sum()
+    if n_uncomputed <= 0 or residual <= 0:
+        return np.array([])
+    return np.ones(n_uncomputed) * (residual / n_uncomputed)
@@ -1,3 +1,5 @@
+import os
+import tempfile
 import numpy as np
 from nose.tools import raises
 from numpy.testing import assert_allclose, assert_equal, assert_almost_equal
@@ -224,3 +226,293 @@ def test_pca_increment_noncentred():
                         np.abs(bpca_model.components))
     assert_almost_equal(ipca_model.eigenvalues, bpca_model.eigenvalues)
     assert_almost_equal(ipca_model.mean_vector, bpca_model.mean_vector)
+
+
+def test_pca_randomized():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(50, 2)) for _ in range(40)]
+    model = PCAModel(samples)
+    r_model = PCAModel(samples, method='randomized', n_components=35,
+                       n_power_iterations=4)
+    assert(r_model.n_components == 35)
+    assert_allclose(r_model.eigenvalues[:10], model.eigenvalues[:10],
+                    rtol=1e-3)
+    # the variance of the components that were not computed is preserved
+    assert_almost_equal(r_model.original_variance(),
+                        model.original_variance())
+    assert(r_model.noise_variance() > 0)
+
+
+def test_pca_randomized_random_state():
+    samples = [PointCloud(np.random.randn(30, 2)) for _ in range(40)]
+    models = [PCAModel(samples, method='randomized', n_components=5,
+                       n_power_iterations=0, random_state=3)
+              for _ in range(2)]
+    assert_equal(models[0].components, models[1].components)
+    models = [PCAModel.init_from_blocks(
+        lambda: iter(samples), block_size=7, method='randomized',
+        n_components=5, n_power_iterations=0, random_state=3)
+        for _ in range(2)]
+    assert_equal(models[0].components, models[1].components)
+
+
+def test_pca_n_components_eigen():
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples)
+    t_model = PCAModel(samples, n_components=3)
+    assert(t_model.n_components == 3)
+    assert_almost_equal(t_model.original_variance(),
+                        model.original_variance())
+
+
+def test_pca_init_from_blocks():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(30)]
+    model = PCAModel(samples, n_components=5)
+    b_model = PCAModel.init_from_blocks(iter(samples), block_size=7,
+                                        n_components=5)
+    assert(b_model.n_samples == 30)
+    assert(b_model.n_components == 5)
+    assert_almost_equal(b_model.eigenvalues, model.eigenvalues)
+    assert_almost_equal(b_model.mean_vector, model.mean_vector)
+    assert_almost_equal(np.abs(b_model.components), np.abs(model.components))
+    assert_almost_equal(b_model.original_variance(),
+                        model.original_variance())
+
+
+def test_pca_init_from_blocks_randomized():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(50, 2)) for _ in range(40)]
+    model = PCAModel(samples)
+    r_model = PCAModel.init_from_blocks(
+        lambda: iter(samples), block_size=9, method='randomized',
+        n_components=35, n_power_iterations=4)
+    assert(r_model.n_components == 35)
+    assert_allclose(r_model.eigenvalues[:10], model.eigenvalues[:10],
+                    rtol=1e-3)
+    assert_almost_equal(r_model.original_variance(),
+                        model.original_variance())
+
+
+def test_pca_data_path():
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples)
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        m_model = PCAModel(samples, data_path=path)
+        assert_almost_equal(m_model.eigenvalues, model.eigenvalues)
+        assert_almost_equal(m_model.mean_vector, model.mean_vector)
+        del m_model
+    finally:
+        os.remove(path)
+
+
+def test_pca_init_from_stream():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(30)]
+    model = PCAModel(samples)
+    s_model = PCAModel.init_from_stream(iter(samples), batch_size=7)
+    assert(s_model.n_samples == 30)
+    assert_almost_equal(s_model.eigenvalues, model.eigenvalues)
+    assert_almost_equal(s_model.mean_vector, model.mean_vector)
+    assert_almost_equal(np.abs(s_model.components), np.abs(model.components))
+
+
+def test_pca_init_from_stream_n_components():
+    np.random.seed(0)
+    # rank 4 data, so capping at 6 components loses nothing
+    basis = np.random.randn(4, 40)
+    samples = [PointCloud(np.random.randn(4).dot(basis).reshape(20, 2))
+               for _ in range(50)]
+    model = PCAModel(samples)
+    s_model = PCAModel.init_from_stream(samples, batch_size=8,
+                                        n_components=6)
+    assert(s_model.n_components <= 6)
+    assert_almost_equal(s_model.eigenvalues[:4], model.eigenvalues[:4])
+    assert_almost_equal(s_model.mean_vector, model.mean_vector)
+
+
+def test_pca_init_from_stream_n_components_keeps_variance():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(50)]
+    model = PCAModel(samples)
+    s_model = PCAModel.init_from_stream(samples, batch_size=8,
+                                        n_components=5)
+    assert(s_model.n_components == 5)
+    assert_almost_equal(s_model.original_variance(),
+                        model.original_variance())
+    assert(s_model.n_components + s_model._trimmed_eigenvalues.size <=
+           model.n_components)
+
+
+def test_pca_batched_instance_api():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples)
+    model.n_active_components = 4
+    novel = [PointCloud(np.random.randn(10, 2)) for _ in range(3)]
+    weights = model.project_instances(novel)
+    assert_almost_equal(weights, np.array([model.project(i) for i in novel]))
+    X = np.array([i.as_vector() for i in novel])
+    assert_almost_equal(model.project_instances(X), weights)
+    for r, i in zip(model.reconstruct_instances(novel), novel):
+        assert_almost_equal(r.points, model.reconstruct(i).points)
+    for r, i in zip(model.project_out_instances(X), novel):
+        assert_almost_equal(r.points, model.project_out(i).points)
+
+
+def test_pca_components_cached_until_n_active_changes():
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples)
+    components = model.components
+    assert(components.flags.c_contiguous)
+    assert(model.components is components)
+    model.n_active_components = 3
+    assert(model.components.shape[0] == 3)
+    assert(model.components is not components)
+
+
+def test_pca_cached_operators_invalidated():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples)
+    model.n_active_components = 5
+    whitened = model.whitened_components()
+    assert(model.whitened_components() is whitened)
+    noise = model.noise_variance()
+    model.n_active_components = 3
+    assert(model.whitened_components().shape[0] == 3)
+    assert(model.noise_variance() > noise)
+    model.trim_components(2)
+    assert_almost_equal(model.whitened_components(),
+                        model.components / np.sqrt(
+                            model.eigenvalues * model.n_samples +
+                            model.noise_variance())[:, None])
+    components = model.components.copy()
+    model.components = components[::-1]
+    assert_almost_equal(model.project_vector(model.mean_vector + components[0]),
+                        [0, 1])
+
+
+def test_pca_cached_operators_invalidated_on_increment():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples[:5])
+    model.whitened_components()
+    model.increment(samples[5:])
+    assert(model.whitened_components().shape[0] == model.n_components)
+    vectors = np.array([s.as_vector() for s in samples])
+    assert_almost_equal(model.project_out_vectors(vectors),
+                        vectors - vectors.dot(model.components.T).dot(
+                            model.components))
+
+
+def test_pca_pickle_and_copy_drop_caches():
+    import pickle
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples)
+    model.n_active_components = 5
+    model.whitened_components()
+    for c_model in [pickle.loads(pickle.dumps(model)), model.copy()]:
+        for k in ['_cache', '_cache_state', '_cache_version']:
+            assert(k not in c_model.__dict__)
+        assert(c_model.n_active_components == 5)
+        assert(np.may_share_memory(c_model.components, c_model._components))
+        assert_equal(c_model.components, model.components)
+        assert_equal(c_model.whitened_components(),
+                     model.whitened_components())
+
+
+def test_pca_orthonormalize_inplace_updates_components():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples)
+    model.n_active_components = 4
+    model.components
+    model._components[:4] *= 2
+    model.orthonormalize_inplace()
+    assert_almost_equal(model._components[:4].dot(model._components[:4].T),
+                        np.eye(4))
+    assert_equal(model.components, model._components[:4])
+
+
+def test_pca_astype():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples)
+    vector = samples[0].as_vector()
+    for dtype, decimal in [(np.float32, 5), (np.float16, 2)]:
+        c_model = model.astype(dtype)
+        assert(c_model._components.dtype == dtype)
+        assert(c_model.mean_vector.dtype == dtype)
+        assert(model._components.dtype == np.float64)
+        assert(c_model.components.dtype != np.float64)
+        assert_almost_equal(c_model.project_vector(vector),
+                            model.project_vector(vector), decimal=decimal)
+
+
+def test_pca_astype_float16_pickle_stores_half_precision():
+    import pickle
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples).astype(np.float16)
+    model.components
+    p_model = pickle.loads(pickle.dumps(model))
+    assert('_cache' not in p_model.__dict__)
+    assert(p_model._components.dtype == np.float16)
+    assert_equal(p_model.components, model.components)
+
+
+def test_pca_astype_inplace_updates_keep_dtype():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    for dtype in [np.float32, np.float16]:
+        model = PCAModel(samples[:5]).astype(dtype)
+        model.components
+        model._components[...] *= 2
+        model.orthonormalize_inplace()
+        assert(model._components.dtype == dtype)
+        assert_almost_equal(model.components.dot(model.components.T),
+                            np.eye(model.n_components), decimal=2)
+        model.increment(samples[5:])
+        assert(model._components.dtype == dtype)
+        assert(model.mean_vector.dtype == dtype)
+
+
+@raises(ValueError)
+def test_pca_astype_int_raises_value_error():
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    PCAModel(samples).astype(np.int32)
+
+
+def test_pca_export_compact():
+    np.random.seed(0)
+    samples = [PointCloud(np.random.randn(10, 2)) for _ in range(10)]
+    model = PCAModel(samples).astype(np.float32)
+    model.n_active_components = 4
+    fd, path = tempfile.mkstemp()
+    os.close(fd)
+    try:
+        model.export_compact(path)
+        for mmap in [True, False]:
+            l_model = PCAModel.init_from_compact(path, mmap=mmap)
+            assert(isinstance(l_model._components, np.memmap) == mmap)
+            assert(l_model.n_active_components == 4)
+            assert_equal(l_model.components, model.components)
+            assert_equal(l_model.mean_vector, model.mean_vector)
+            assert_equal(l_model.eigenvalues, model.eigenvalues)
+            assert_equal(l_model.project(samples[0]), model.project(samples[0]))
+            del l_model
+    finally:
+        os.remove(path)
+
+
+@raises(ValueError)
+def test_pca_init_from_compact_bad_file_raises_value_error():
+    fd, path = tempfile.mkstemp()
+    os.write(fd, b'not a model')
+    os.close(fd)
+    try:
+        PCAModel.init_from_compact(path)
+    finally:
+        os.remove(path)
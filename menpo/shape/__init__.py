@@ -1,5 +1,8 @@
-from .pointcloud import PointCloud, bounding_box
-from .mesh import TriMesh, ColouredTriMesh, TexturedTriMesh
+from .pointcloud import PointCloud, LightPointCloud, bounding_box
+from .pointcloudset import PointCloudSet
+from .mesh import (TriMesh, ColouredTriMesh, TexturedTriMesh, TriMeshBatch,
+                   register_template_trilist, template_trilist,
+                   has_template_trilist)
 from .groupops import mean_pointcloud
 from .graph import (UndirectedGraph, DirectedGraph, Tree, PointUndirectedGraph,
                     PointDirectedGraph, PointTree)
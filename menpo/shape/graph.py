@@ -325,18 +325,22 @@ class Graph(object):
         adjacency_list : `list` of `list` of length ``n_vertices``
             The adjacency list of the graph.
         """
-        # initialize list with empty lists
-        adjacency_list = [[] for _ in range(self.n_vertices)]
+        return [list(a) for a in self._adjacency_index().adjacency_list]
 
-        # get rows/columns of edges
-        rows, cols = self.adjacency_matrix.nonzero()
-
-        # store them accordingly
-        for i in range(rows.shape[0]):
-            from_v = rows[i]
-            to_v = cols[i]
-            adjacency_list[from_v].append(to_v)
-        return adjacency_list
+    def _adjacency_index(self):
+        r"""
+        The (cached) :map:`_AdjacencyIndex` of the adjacency matrix, from
+        which all the neighbourhood and edge queries are served. The index
+        is built once and cached until the ``adjacency_matrix`` is replaced
+        (note that modifying the ``adjacency_matrix`` inplace is not
+        detected).
+        """
+        cache = getattr(self, '_adjacency_index_cache', None)
+        if cache is None or cache[0] is not self.adjacency_matrix:
+            cache = (self.adjacency_matrix,
+                     _AdjacencyIndex(self.adjacency_matrix))
+            self._adjacency_index_cache = cache
+        return cache[1]
 
     def is_edge(self, vertex_1, vertex_2, skip_checks=False):
         r"""
@@ -344,18 +348,19 @@ class Graph(object):
 
         Parameters
         ----------
-        vertex_1 : `int`
+        vertex_1 : `int` or ``(n,)`` `ndarray`
             The first selected vertex. Parent if the graph is directed.
-        vertex_2 : `int`
+        vertex_2 : `int` or ``(n,)`` `ndarray`
             The second selected vertex. Child if the graph is directed.
         skip_checks : `bool`, optional
             If ``False``, the given vertices will be checked.
 
         Returns
         -------
-        is_edge : `bool`
+        is_edge : `bool` or `bool ndarray`
             ``True`` if there is an edge connecting ``vertex_1`` and
-            ``vertex_2``.
+            ``vertex_2``. If arrays of vertices are given, whether there is
+            an edge connecting each pair of vertices.
 
         Raises
         ------
@@ -365,7 +370,7 @@ class Graph(object):
         if not skip_checks:
             self._check_vertex(vertex_1)
             self._check_vertex(vertex_2)
-        return self.adjacency_matrix[vertex_1, vertex_2] != 0
+        return self._adjacency_index().is_edge(vertex_1, vertex_2)
 
     def find_path(self, start, end, method='bfs', skip_checks=False):
         r"""
@@ -424,10 +429,75 @@ class Graph(object):
             path.reverse()
         return path
 
-    def find_all_paths(self, start, end, path=[]):
+    def iter_paths(self, start, end, path=None, max_paths=None,
+                   max_length=None):
+        r"""
+        Generator of all the paths (without cycles) from start vertex to end
+        vertex. The paths are found with an iterative depth-first search over
+        the adjacency list of the graph and are yielded in the same order as
+        :meth:`find_all_paths` returns them.
+
+        Parameters
+        ----------
+        start : `int`
+            The vertex from which the paths start.
+        end : `int`
+            The vertex from which the paths end.
+        path : `list`, optional
+            An existing path to append to.
+        max_paths : `int` or ``None``, optional
+            If not ``None``, the search stops after this many paths.
+        max_length : `int` or ``None``, optional
+            If not ``None``, only the paths of at most this many edges are
+            found, and the search does not extend paths beyond this length.
+
+        Yields
+        ------
+        path : `list`
+            A path from start to end.
+        """
+        path = [] if path is None else list(path)
+        path.append(start)
+        if max_paths is not None and max_paths <= 0:
+            return
+        if start == end:
+            if max_length is None or len(path) - 1 <= max_length:
+                yield path
+            return
+        if start > self.n_vertices - 1 or start < 0:
+            return
+        adjacency_list = self._adjacency_index().adjacency_list
+        on_path = set(path)
+        n_found = 0
+        # one iterator over the unvisited neighbours of each vertex on path
+        stack = [iter(adjacency_list[start])]
+        while stack:
+            for v in stack[-1]:
+                if v in on_path:
+                    continue
+                if v == end:
+                    if max_length is None or len(path) <= max_length:
+                        yield path + [v]
+                        n_found += 1
+                        if max_paths is not None and n_found >= max_paths:
+                            return
+                elif max_length is None or len(path) < max_length:
+                    # descend into v
+                    path.append(v)
+                    on_path.add(v)
+                    stack.append(iter(adjacency_list[v]))
+                    break
+            else:
+                # all the neighbours of the last vertex have been explored
+                stack.pop()
+                if stack:
+                    on_path.discard(path.pop())
+
+    def find_all_paths(self, start, end, path=None, max_paths=None,
+                       max_length=None):
         r"""
         Returns a list of lists with all the paths (without cycles) found from
-        start vertex to end vertex.
+        start vertex to end vertex - see :meth:`iter_paths`.
 
         Parameters
         ----------
@@ -437,45 +507,53 @@ class Graph(object):
             The vertex from which the paths end.
         path : `list`, optional
             An existing path to append to.
+        max_paths : `int` or ``None``, optional
+            If not ``None``, at most this many paths are returned.
+        max_length : `int` or ``None``, optional
+            If not ``None``, only the paths of at most this many edges are
+            returned.
 
         Returns
         -------
         paths : `list` of `list`
             The list containing all the paths from start to end.
         """
-        if path is None:
-            path = []
-        path = path + [start]
-        if start == end:
-            return [path]
-        if start > self.n_vertices - 1 or start < 0:
-            return []
-        paths = []
-        for v in list(self.adjacency_matrix[start, :].nonzero()[1]):
-            if v not in path:
-                newpaths = self.find_all_paths(v, end, path)
-                for newpath in newpaths:
-                    paths.append(newpath)
-        return paths
-
-    def n_paths(self, start, end):
+        return list(self.iter_paths(start, end, path=path,
+                                    max_paths=max_paths,
+                                    max_length=max_length))
+
+    def n_paths(self, start, end, max_length=None):
         r"""
         Returns the number of all the paths (without cycles) existing from
         start vertex to end vertex.
 
+        For directed acyclic graphs the paths are counted with dynamic
+        programming over the vertices reachable from start, without
+        enumerating them. Otherwise, the paths are enumerated (but not
+        stored) with :meth:`iter_paths`.
+
         Parameters
         ----------
         start : `int`
             The vertex from which the paths start.
         end : `int`
             The vertex from which the paths end.
+        max_length : `int` or ``None``, optional
+            If not ``None``, only the paths of at most this many edges are
+            counted.
 
         Returns
         -------
         paths : `int`
             The paths' numbers.
         """
-        return len(self.find_all_paths(start, end))
+        if (start == end or start > self.n_vertices - 1 or start < 0 or
+                not self._directed or self.has_cycles()):
+            return sum(1 for _ in self.iter_paths(start, end,
+                                                  max_length=max_length))
+        return _count_dag_paths(self._adjacency_index().adjacency_list,
+                                start, end,
+                                max_length)
 
     def find_all_shortest_paths(self, algorithm='auto', unweighted=False):
         r"""
@@ -592,7 +670,8 @@ class Graph(object):
         has_cycles : `bool`
             ``True`` if the graph has cycles.
         """
-        return _has_cycles(self.get_adjacency_list(), self._directed)
+        return _has_cycles(self._adjacency_index().adjacency_list,
+                           self._directed)
 
     def is_tree(self):
         r"""
@@ -619,7 +698,8 @@ class Graph(object):
         ValueError
             The vertex must be between 0 and {n_vertices-1}.
         """
-        if vertex > self.n_vertices - 1 or vertex < 0:
+        vertex = np.asarray(vertex)
+        if np.any(vertex > self.n_vertices - 1) or np.any(vertex < 0):
             raise ValueError('The vertex must be between '
                              '0 and {}.'.format(self.n_vertices - 1))
 
@@ -821,7 +901,7 @@ class UndirectedGraph(Graph):
         # check given vertex
         if not skip_checks:
             self._check_vertex(vertex)
-        return list(self.adjacency_matrix[vertex, :].nonzero()[1])
+        return list(self._adjacency_index().out_neighbours(vertex))
 
     def n_neighbours(self, vertex, skip_checks=False):
         r"""
@@ -829,22 +909,24 @@ class UndirectedGraph(Graph):
 
         Parameters
         ----------
-        vertex : `int`
-            The selected vertex.
+        vertex : `int` or ``(n,)`` `ndarray`
+            The selected vertex (or vertices).
         skip_checks : `bool`, optional
             If ``False``, the given vertex will be checked.
 
         Returns
         -------
-        n_neighbours : `int`
-            The number of neighbours.
+        n_neighbours : `int` or ``(n,)`` `ndarray`
+            The number of neighbours (of each vertex).
 
         Raises
         ------
         ValueError
             The vertex must be between 0 and {n_vertices-1}.
         """
-        return len(self.neighbours(vertex, skip_checks=skip_checks))
+        if not skip_checks:
+            self._check_vertex(vertex)
+        return self._adjacency_index().out_degree(vertex)
 
     def minimum_spanning_tree(self, root_vertex):
         r"""
@@ -1010,7 +1092,7 @@ class DirectedGraph(Graph):
         """
         if not skip_checks:
             self._check_vertex(vertex)
-        return list(self.adjacency_matrix[vertex, :].nonzero()[1])
+        return list(self._adjacency_index().out_neighbours(vertex))
 
     def n_children(self, vertex, skip_checks=False):
         r"""
@@ -1018,22 +1100,24 @@ class DirectedGraph(Graph):
 
         Parameters
         ----------
-        vertex : `int`
-            The selected vertex.
+        vertex : `int` or ``(n,)`` `ndarray`
+            The selected vertex (or vertices).
+        skip_checks : `bool`, optional
+            If ``False``, the given vertex will be checked.
 
         Returns
         -------
-        n_children : `int`
-            The number of children.
-        skip_checks : `bool`, optional
-            If ``False``, the given vertex will be checked.
+        n_children : `int` or ``(n,)`` `ndarray`
+            The number of children (of each vertex).
 
         Raises
         ------
         ValueError
             The vertex must be in the range ``[0, n_vertices - 1]``.
         """
-        return len(self.children(vertex, skip_checks=skip_checks))
+        if not skip_checks:
+            self._check_vertex(vertex)
+        return self._adjacency_index().out_degree(vertex)
 
     def parents(self, vertex, skip_checks=False):
         r"""
@@ -1058,7 +1142,7 @@ class DirectedGraph(Graph):
         """
         if not skip_checks:
             self._check_vertex(vertex)
-        return list(self.adjacency_matrix[:, vertex].nonzero()[0])
+        return list(self._adjacency_index().in_neighbours(vertex))
 
     def n_parents(self, vertex, skip_checks=False):
         r"""
@@ -1066,22 +1150,24 @@ class DirectedGraph(Graph):
 
         Parameters
         ----------
-        vertex : `int`
-            The selected vertex.
+        vertex : `int` or ``(n,)`` `ndarray`
+            The selected vertex (or vertices).
         skip_checks : `bool`, optional
             If ``False``, the given vertex will be checked.
 
         Returns
         -------
-        n_parents : `int`
-            The number of parents.
+        n_parents : `int` or ``(n,)`` `ndarray`
+            The number of parents (of each vertex).
 
         Raises
         ------
         ValueError
             The vertex must be in the range ``[0, n_vertices - 1]``.
         """
-        return len(self.parents(vertex, skip_checks=skip_checks))
+        if not skip_checks:
+            self._check_vertex(vertex)
+        return self._adjacency_index().in_degree(vertex)
 
     def __str__(self):
         isolated = ''
@@ -1190,10 +1276,43 @@ class Tree(DirectedGraph):
                                  'vertex is not valid. BFS returns a different '
                                  'tree.')
 
-        # store root and predecessors list
+        # store root and the structure of the tree
         self.root_vertex = root_vertex
+        self._build_structure()
         self.predecessors_list = self._get_predecessors_list()
 
+    def _build_structure(self):
+        r"""
+        Computes, once, the arrays that all the structural queries of the
+        tree are answered from: the parent, depth and number of children of
+        every vertex, the breadth first ordering of the vertices and the
+        vertices grouped by depth. The children themselves are served by the
+        adjacency index of the graph.
+        """
+        n_vertices = self.n_vertices
+        index = self._adjacency_index()
+        # the parent of every vertex, -1 for the root
+        self._parents = -np.ones(n_vertices, dtype=np.int)
+        self._parents[index.out_indices] = index.edge_rows
+        self._n_children = index.out_degree(np.arange(n_vertices))
+        # the depth of every vertex is its (unweighted) distance from the root
+        self._bfs_order = csgraph.breadth_first_order(
+            self.adjacency_matrix, self.root_vertex, directed=True,
+            return_predecessors=False)
+        depths = csgraph.shortest_path(self.adjacency_matrix, directed=True,
+                                       unweighted=True,
+                                       indices=self.root_vertex)
+        depths[~np.isfinite(depths)] = -1  # unreachable from the root
+        self._depths = depths.astype(np.int)
+        # the vertices grouped by depth, in ascending order within each depth
+        self._depth_order = np.argsort(self._depths, kind='mergesort')
+        depth_counts = np.bincount(self._depths[self._depths >= 0])
+        self._depth_offsets = np.zeros(depth_counts.shape[0] + 1,
+                                       dtype=np.int)
+        np.cumsum(depth_counts, out=self._depth_offsets[1:])
+        # skip the unreachable vertices that sort first
+        self._depth_offsets += np.count_nonzero(self._depths < 0)
+
     def _get_predecessors_list(self):
         r"""
         Returns the predecessors list of the tree, i.e. a `list` of length
@@ -1202,18 +1321,17 @@ class Tree(DirectedGraph):
 
         :type: `list` of length ``n_vertices``
         """
-        # initialize list with None
-        predecessors_list = [None] * self.n_vertices
+        return [None if p < 0 else p for p in self._parents]
 
-        # get rows/columns of edges
-        parents, children = self.adjacency_matrix.nonzero()
+    @property
+    def bfs_order(self):
+        r"""
+        The vertices of the tree in breadth first order, starting from the
+        root.
 
-        # store them accordingly
-        for i in range(children.shape[0]):
-            parent = parents[i]
-            child = children[i]
-            predecessors_list[child] = parent
-        return predecessors_list
+        :type: ``(n_vertices,)`` `ndarray`
+        """
+        return self._bfs_order
 
     def depth_of_vertex(self, vertex, skip_checks=False):
         r"""
@@ -1238,13 +1356,7 @@ class Tree(DirectedGraph):
         """
         if not skip_checks:
             self._check_vertex(vertex)
-        parent = vertex
-        depth = 0
-        while not parent == self.root_vertex:
-            current = parent
-            parent = self.predecessors_list[current]
-            depth += 1
-        return depth
+        return int(self._depths[vertex])
 
     @property
     def maximum_depth(self):
@@ -1253,8 +1365,7 @@ class Tree(DirectedGraph):
 
         :type: `int`
         """
-        all_depths = [self.depth_of_vertex(v) for v in range(self.n_vertices)]
-        return np.max(all_depths)
+        return self._depth_offsets.shape[0] - 2
 
     def vertices_at_depth(self, depth):
         r"""
@@ -1270,11 +1381,10 @@ class Tree(DirectedGraph):
         vertices : `list`
             The vertices that lie in the specified depth.
         """
-        ver = []
-        for v in range(self.n_vertices):
-            if self.depth_of_vertex(v) == depth:
-                ver.append(v)
-        return ver
+        if depth < 0 or depth > self.maximum_depth:
+            return []
+        o = self._depth_offsets
+        return self._depth_order[o[depth]:o[depth + 1]].tolist()
 
     def n_vertices_at_depth(self, depth):
         r"""
@@ -1290,11 +1400,9 @@ class Tree(DirectedGraph):
         n_vertices : `int`
             The number of vertices that lie in the specified depth.
         """
-        n_ver = 0
-        for v in range(self.n_vertices):
-            if self.depth_of_vertex(v) == depth:
-                n_ver += 1
-        return n_ver
+        if depth < 0 or depth > self.maximum_depth:
+            return 0
+        return int(self._depth_offsets[depth + 1] - self._depth_offsets[depth])
 
     def is_leaf(self, vertex, skip_checks=False):
         r"""
@@ -1319,7 +1427,7 @@ class Tree(DirectedGraph):
         """
         if not skip_checks:
             self._check_vertex(vertex)
-        return len(self.children(vertex)) == 0
+        return bool(self._n_children[vertex] == 0)
 
     @property
     def leaves(self):
@@ -1328,11 +1436,7 @@ class Tree(DirectedGraph):
 
         :type: `list`
         """
-        leaves = []
-        for v in range(self.n_vertices):
-            if self.is_leaf(v):
-                leaves.append(v)
-        return leaves
+        return np.nonzero(self._n_children == 0)[0].tolist()
 
     @property
     def n_leaves(self):
@@ -1341,7 +1445,7 @@ class Tree(DirectedGraph):
 
         :type: `int`
         """
-        return len(self.leaves)
+        return int(np.count_nonzero(self._n_children == 0))
 
     def parent(self, vertex, skip_checks=False):
         r"""
@@ -1508,6 +1612,8 @@ class PointGraph(Graph, PointCloud):
                                                  [2, 0, 4, 2, 4, 3])),
                                       shape=(6, 6))
     """
+    _cache_attrs = PointCloud._cache_attrs + ('_adjacency_index_cache',)
+
     def __init__(self, points, adjacency_matrix, copy=True, skip_checks=False):
         if not skip_checks:
             # check the number of points
@@ -2525,6 +2631,107 @@ def _has_cycles(adjacency_list, directed):
         return False
 
 
+class _AdjacencyIndex(object):
+    r"""
+    Immutable index arrays of the nonzero entries of an adjacency matrix:
+    the outgoing (row) and incoming (column) neighbours of every vertex as
+    compressed sparse rows and the sorted linear indices of the edges, so
+    that neighbourhood queries are ``O(degree)`` slices and edge membership
+    queries are vectorised binary searches, rather than queries on the
+    sparse matrix.
+
+    Parameters
+    ----------
+    adjacency_matrix : `csr_matrix`
+        The adjacency matrix, rows representing the ``from`` vertices.
+    """
+    def __init__(self, adjacency_matrix):
+        n_vertices = adjacency_matrix.shape[0]
+        self.n_vertices = n_vertices
+        # the nonzeros of a csr_matrix are ordered by row
+        rows, cols = adjacency_matrix.nonzero()
+        self.edge_rows = rows
+        self.out_indices = cols
+        self.out_offsets = _csr_offsets(rows, n_vertices)
+        # a stable sort keeps the incoming neighbours in ascending order
+        by_col = np.argsort(cols, kind='mergesort')
+        self.in_indices = rows[by_col]
+        self.in_offsets = _csr_offsets(cols, n_vertices)
+        self.edge_keys = np.sort(rows.astype(np.int64) * n_vertices + cols)
+        self.adjacency_list = [list(self.out_neighbours(v))
+                               for v in range(n_vertices)]
+
+    def out_neighbours(self, vertex):
+        o = self.out_offsets
+        return self.out_indices[o[vertex]:o[vertex + 1]]
+
+    def in_neighbours(self, vertex):
+        o = self.in_offsets
+        return self.in_indices[o[vertex]:o[vertex + 1]]
+
+    def out_degree(self, vertex):
+        return self.out_offsets[np.add(vertex, 1)] - self.out_offsets[vertex]
+
+    def in_degree(self, vertex):
+        return self.in_offsets[np.add(vertex, 1)] - self.in_offsets[vertex]
+
+    def is_edge(self, vertex_1, vertex_2):
+        keys = (np.asarray(vertex_1, dtype=np.int64) * self.n_vertices +
+                np.asarray(vertex_2, dtype=np.int64))
+        scalar = keys.ndim == 0
+        keys = np.atleast_1d(keys)
+        i = np.searchsorted(self.edge_keys, keys)
+        found = np.zeros(keys.shape, dtype=np.bool)
+        in_range = i < self.edge_keys.shape[0]
+        found[in_range] = self.edge_keys[i[in_range]] == keys[in_range]
+        return bool(found[0]) if scalar else found
+
+
+def _csr_offsets(rows, n_rows):
+    r"""
+    The offsets of the rows of a compressed sparse row structure with an
+    entry for every item of ``rows``.
+    """
+    offsets = np.zeros(n_rows + 1, dtype=np.int)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=offsets[1:])
+    return offsets
+
+
+def _count_dag_paths(adjacency_list, start, end, max_length=None):
+    r"""
+    Counts the paths from start to end of a directed acyclic graph. Without
+    a maximum length, the number of paths from each vertex is the sum of the
+    number of paths from its children, computed in reverse topological
+    order of the vertices reachable from start. With a maximum length, the
+    number of paths of at most ``l`` edges from each vertex is computed for
+    ``l = 0, ..., max_length``. Python integers are used, so the counts
+    never overflow.
+    """
+    if max_length is not None:
+        counts = {end: 1}
+        for _ in range(max_length):
+            counts = dict((v, 1 if v == end else
+                           sum(counts.get(c, 0) for c in children))
+                          for v, children in enumerate(adjacency_list))
+        return counts.get(start, 0)
+    # post-order (children first) of the vertices reachable from start
+    counts = {}
+    stack = [(start, iter(adjacency_list[start]))]
+    visited = {start}
+    while stack:
+        v, children = stack[-1]
+        for c in children:
+            if c not in visited and c != end:
+                visited.add(c)
+                stack.append((c, iter(adjacency_list[c])))
+                break
+        else:
+            stack.pop()
+            counts[v] = sum(1 if c == end else counts[c]
+                            for c in adjacency_list[v])
+    return counts[start]
+
+
 def _mask_adjacency_matrix_and_points(mask, adjacency_matrix, points):
     r"""
     Function that masks a provided adjacency matrix and points array.
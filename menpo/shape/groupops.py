@@ -1,5 +1,5 @@
 from __future__ import division
-from menpo.shape import PointCloud
+from menpo.shape import PointCloud, PointCloudSet
 
 
 def mean_pointcloud(pointclouds):
@@ -12,7 +12,7 @@ def mean_pointcloud(pointclouds):
 
     Parameters
     ----------
-    pointclouds: `list` of :map:`PointCloud` or subclass
+    pointclouds: `list` of :map:`PointCloud` or :map:`PointCloudSet`
         List of point cloud or subclass objects from which we want to compute
         the mean.
 
@@ -21,6 +21,8 @@ def mean_pointcloud(pointclouds):
     mean_pointcloud : :map:`PointCloud` or subclass
         The mean point cloud or subclass.
     """
+    if isinstance(pointclouds, PointCloudSet):
+        return pointclouds.mean()
     # make a temporary PointCloud (with copy=False for low overhead)
     tmp_pc = PointCloud(sum(pc.points for pc in pointclouds) /
                         len(pointclouds), copy=False)
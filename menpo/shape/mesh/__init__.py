@@ -1,3 +1,5 @@
-from .base import TriMesh
+from .base import (TriMesh, register_template_trilist, template_trilist,
+                   has_template_trilist)
 from .coloured import ColouredTriMesh
 from .textured import TexturedTriMesh
+from .batch import TriMeshBatch
@@ -1,14 +1,118 @@
 # coding=utf-8
-from collections import Counter
 import numpy as np
 from warnings import warn
 
 Delaunay = None  # expensive, from scipy.spatial
 
 from .. import PointCloud
-from ..adjacency import mask_adjacency_array, reindex_adjacency_array
 
-from .normals import compute_normals
+from .normals import compute_normals, compute_normals_batch
+from .topology import TriMeshTopology
+
+# The template triangle lists of landmark configurations, stored as
+# {configuration: (n_points, trilist)}
+_template_trilists = {}
+
+
+def register_template_trilist(configuration, n_points, trilist):
+    r"""
+    Register the template triangle list of a landmark configuration, e.g.
+    the triangle list that a labeller such as :func:`ibug_face_68_trimesh`
+    defines for its group label ``'ibug_face_68_trimesh'`` (the trimesh
+    labellers register their triangle lists themselves). Call sites that
+    are given the configuration (such as :map:`PiecewiseAffine` and
+    :meth:`BooleanImage.constrain_to_pointcloud`, or
+    :meth:`BooleanImage.constrain_to_landmarks` for the group it is given)
+    then use the template instead of a Delaunay triangulation, so that
+    building masks and transforms per image does not triangulate every
+    image's landmarks.
+
+    Parameters
+    ----------
+    configuration : `hashable`
+        The key of the landmark configuration, e.g. a labeller's group label.
+    n_points : `int`
+        The number of points of the landmark configuration.
+    trilist : ``(n_tris, 3)`` `ndarray` or ``None``
+        The template triangle list. If ``None``, any template registered for
+        the `configuration` is removed.
+
+    Raises
+    ------
+    ValueError
+        If the trilist is not of shape ``(n_tris, 3)`` or indexes more than
+        `n_points` points
+    """
+    if trilist is None:
+        _template_trilists.pop(configuration, None)
+    else:
+        trilist = np.array(trilist, copy=True, order='C')
+        if trilist.ndim != 2 or trilist.shape[1] != 3:
+            raise ValueError('trilist must be of shape (n_tris, 3), '
+                             'not {}'.format(trilist.shape))
+        if trilist.size > 0 and trilist.max() >= n_points:
+            raise ValueError('trilist indexes points outside the range of '
+                             '{} points'.format(n_points))
+        _template_trilists[configuration] = (n_points, trilist)
+
+
+def template_trilist(configuration, n_points):
+    r"""
+    The template triangle list registered for a landmark configuration with
+    :func:`register_template_trilist`.
+
+    Parameters
+    ----------
+    configuration : `hashable`
+        The key of the landmark configuration.
+    n_points : `int`
+        The number of points the triangle list is used for, which must be
+        the number of points of the configuration.
+
+    Returns
+    -------
+    trilist : ``(n_tris, 3)`` `ndarray`
+        The template triangle list (a new array that may be freely
+        modified).
+
+    Raises
+    ------
+    ValueError
+        If no template is registered for the `configuration`, or it is
+        registered for a different number of points
+    """
+    try:
+        template_n_points, trilist = _template_trilists[configuration]
+    except KeyError:
+        raise ValueError('No template trilist is registered for the landmark '
+                         'configuration {!r}'.format(configuration))
+    if template_n_points != n_points:
+        raise ValueError('The template trilist of {!r} is for {} points, not '
+                         '{}'.format(configuration, template_n_points,
+                                     n_points))
+    return trilist.copy()
+
+
+def has_template_trilist(configuration, n_points):
+    r"""
+    Whether a template triangle list is registered for a landmark
+    configuration with :func:`register_template_trilist`.
+
+    Parameters
+    ----------
+    configuration : `hashable`
+        The key of the landmark configuration.
+    n_points : `int`
+        The number of points the triangle list would be used for.
+
+    Returns
+    -------
+    has_template : `bool`
+        ``True`` if a template is registered for the `configuration` and
+        `n_points` points.
+    """
+    template = _template_trilists.get(configuration)
+    return template is not None and template[0] == n_points
 
 
 def trilist_to_adjacency_array(trilist):
@@ -37,6 +141,8 @@ class TriMesh(PointCloud):
         Any trilist will also not be copied.
         In general this should only be used if you know what you are doing.
     """
+    _cache_attrs = PointCloud._cache_attrs + ('_topology_cache',)
+
     def __init__(self, points, trilist=None, copy=True):
         super(TriMesh, self).__init__(points, copy=copy)
         if trilist is None:
@@ -82,6 +188,26 @@ class TriMesh(PointCloud):
         """
         return self.as_pointgraph().tojson()
 
+    def topology(self):
+        r"""
+        The topology of the triangle list of this mesh - see
+        :map:`TriMeshTopology`. The topology is computed once and cached
+        until the ``trilist`` is replaced (note that modifying the
+        ``trilist`` inplace is not detected).
+
+        Returns
+        -------
+        topology : :map:`TriMeshTopology`
+            The (cached) topology of this mesh.
+        """
+        cache = getattr(self, '_topology_cache', None)
+        if (cache is None or cache[0] is not self.trilist or
+                cache[1] != self.n_points):
+            cache = (self.trilist, self.n_points,
+                     TriMeshTopology(self.trilist, self.n_points))
+            self._topology_cache = cache
+        return cache[2]
+
     def from_mask(self, mask):
         """
         A 1D boolean array with the same number of elements as the number of
@@ -107,26 +233,32 @@ class TriMesh(PointCloud):
         if np.all(mask):  # Fast path for all true
             return tm
         else:
-            # Recalculate the mask to remove isolated vertices
-            isolated_mask = self._isolated_mask(mask)
-            # Recreate the adjacency array with the updated mask
-            masked_adj = mask_adjacency_array(isolated_mask, self.trilist)
-            tm.trilist = reindex_adjacency_array(masked_adj)
+            # Recalculate the mask to remove isolated vertices, and rebuild
+            # the trilist from the triangles that survive
+            isolated_mask, tm.trilist = self._masked_trilist(mask)
             tm.points = tm.points[isolated_mask, :]
             return tm
 
     def _isolated_mask(self, mask):
-        # Find the triangles we need to keep
-        masked_adj = mask_adjacency_array(mask, self.trilist)
-        # Find isolated vertices (vertices that don't exist in valid
-        # triangles)
-        isolated_indices = np.setdiff1d(np.nonzero(mask)[0], masked_adj)
+        return self._masked_trilist(mask)[0]
 
-        # Create a 'new mask' that contains the points the use asked
+    def _masked_trilist(self, mask):
+        r"""
+        The triangles that only have vertices within `mask`, reindexed into
+        the points that remain once the masked out points and any points
+        left isolated (that are not part of a remaining triangle) are
+        removed. Returns the mask of the remaining points and the new
+        trilist.
+        """
+        # Find the triangles we need to keep
+        kept_trilist = self.trilist[mask[self.trilist].all(axis=1)]
+        # Create a 'new mask' that contains the points the user asked
         # for MINUS the points that we can't create triangles for
-        new_mask = mask.copy()
-        new_mask[isolated_indices] = False
-        return new_mask
+        new_mask = np.zeros(self.n_points, dtype=np.bool)
+        new_mask[kept_trilist] = True
+        # the new index of every point that remains
+        reindex = np.cumsum(new_mask) - 1
+        return new_mask, reindex[kept_trilist]
 
     def as_pointgraph(self, copy=True, skip_checks=False):
         """
@@ -144,12 +276,16 @@ class TriMesh(PointCloud):
         pointgraph : :map:`PointUndirectedGraph`
             The point graph.
         """
+        from scipy.sparse import csr_matrix
         from .. import PointUndirectedGraph
-        from ..graph import _convert_edges_to_symmetric_adjacency_matrix
-        # Since we have triangles we need the last connection
-        # that 'completes' the triangle
-        adjacency_matrix = _convert_edges_to_symmetric_adjacency_matrix(
-            trilist_to_adjacency_array(self.trilist), self.points.shape[0])
+        # the unique edges of the triangles give the connectivity directly,
+        # with no duplicates to be merged
+        edges = self.topology().edges
+        rows = np.hstack((edges[:, 0], edges[:, 1]))
+        cols = np.hstack((edges[:, 1], edges[:, 0]))
+        adjacency_matrix = csr_matrix(
+            (np.ones(rows.shape[0], dtype=np.int), (rows, cols)),
+            shape=(self.n_points, self.n_points))
         pg = PointUndirectedGraph(self.points, adjacency_matrix, copy=copy,
                                   skip_checks=skip_checks)
         # This is always a copy
@@ -171,9 +307,7 @@ class TriMesh(PointCloud):
         ValueError
             If mesh is not 3D
         """
-        if self.n_dims != 3:
-            raise ValueError("Normals are only valid for 3D meshes")
-        return compute_normals(self.points, self.trilist)[0]
+        return self._normals()[0]
 
     def tri_normals(self):
         r"""
@@ -190,9 +324,52 @@ class TriMesh(PointCloud):
         ValueError
             If mesh is not 3D
         """
+        return self._normals()[1]
+
+    def _normals(self):
+        r"""
+        The per-vertex and per-triangle normals of the current points. Only
+        the vertex-triangle incidence (of the cached :meth:`topology`) is
+        reused between calls.
+        """
         if self.n_dims != 3:
             raise ValueError("Normals are only valid for 3D meshes")
-        return compute_normals(self.points, self.trilist)[1]
+        topology = self.topology()
+        return compute_normals(self.points, self.trilist,
+                               topology.vertex_tri_offsets,
+                               topology.vertex_tri_indices)
+
+    def batch_normals(self, points):
+        r"""
+        Compute the per-vertex and per-triangle normals of many sets of
+        points that share the triangle list of this mesh, e.g. the instances
+        of a shape model. The vertex-triangle incidence is computed once and
+        shared by every set of points. Only valid for 3D dimensional meshes.
+
+        Parameters
+        ----------
+        points : ``(n_sets, n_points, 3)`` `ndarray`
+            The sets of points.
+
+        Returns
+        -------
+        vertex_normals : ``(n_sets, n_points, 3)`` `ndarray`
+            Normal at each point of each set.
+        tri_normals : ``(n_sets, n_tris, 3)`` `ndarray`
+            Normal at each triangle face of each set.
+
+        Raises
+        ------
+        ValueError
+            If the sets of points are not of shape ``(n_sets, n_points, 3)``
+        """
+        if points.ndim != 3 or points.shape[1:] != (self.n_points, 3):
+            raise ValueError('points must be of shape (n_sets, {}, 3), not '
+                             '{}'.format(self.n_points, points.shape))
+        topology = self.topology()
+        return compute_normals_batch(points, self.trilist,
+                                     topology.vertex_tri_offsets,
+                                     topology.vertex_tri_indices)
 
     def tri_areas(self):
         r"""The area of each triangle face.
@@ -242,20 +419,9 @@ class TriMesh(PointCloud):
             also an edge of another triangle (and so this triangle exists on
             the boundary of the TriMesh)
         """
-        trilist = self.trilist
-        # Get a sorted list of edge pairs
-        edge_pairs = np.sort(np.vstack((trilist[:, [0, 1]],
-                                        trilist[:, [0, 2]],
-                                        trilist[:, [1, 2]])))
-
-        # convert to a tuple per edge pair
-        edges = [tuple(x) for x in edge_pairs]
-        # count the occurrences of the ordered edge pairs - edge pairs that
-        # occur once are at the edge of the whole mesh
-        mesh_edges = (e for e, i in Counter(edges).items() if i == 1)
-        # index back into the edges to find which triangles contain these edges
-        return np.array(list(set(edges.index(e) % trilist.shape[0]
-                                 for e in mesh_edges)))
+        # edges that are only part of one triangle are at the edge of the
+        # whole mesh
+        return np.nonzero(self.topology().boundary_tri_mask())[0]
 
     def edge_vectors(self):
         r"""A vector of edges of each triangle face.
@@ -312,19 +478,7 @@ class TriMesh(PointCloud):
             Return a point index that rebuilds all edges present in this
             :map:`TriMesh` only once.
         """
-        # Get a sorted list of edge pairs. sort ensures that each edge is
-        # ordered from lowest index to highest.
-        edge_pairs = np.sort(self.edge_indices())
-
-        # We want to remove duplicates - this is a little hairy: basically we
-        # get a view on the array where each pair is considered by numpy to be
-        # one item
-        edge_pair_view = np.ascontiguousarray(edge_pairs).view(
-            np.dtype((np.void, edge_pairs.dtype.itemsize * edge_pairs.shape[1])))
-        # Now we can use this view to ask for only unique edges...
-        unique_edge_index = np.unique(edge_pair_view, return_index=True)[1]
-        # And use that to filter our original list down
-        return edge_pairs[unique_edge_index]
+        return self.topology().edges.copy()
 
     def unique_edge_vectors(self):
         r"""An unordered vector of unique edges for the whole :map:`TriMesh`.
@@ -0,0 +1,233 @@
+import numpy as np
+
+from ..pointcloudset import PointCloudSet, _stack_points
+from .base import TriMesh
+from .normals import compute_normals_batch
+from .topology import TriMeshTopology
+
+
+class TriMeshBatch(PointCloudSet):
+    r"""
+    A batch of meshes that all share the same triangle list, e.g. the
+    registered scans of a 3D dataset. The points of every mesh are held in
+    a single ``(n_meshes, n_points, n_dims)`` `ndarray` and the triangle list
+    (and its :meth:`topology`) is stored once, so that per-mesh quantities
+    are computed for the whole batch in a single vectorized operation. All
+    the group operations of :map:`PointCloudSet` are also available.
+
+    Indexing a batch returns a :map:`TriMesh` whose points are a view into
+    the points of the batch and whose trilist is the shared trilist - no
+    data is copied.
+
+    Parameters
+    ----------
+    points : ``(n_meshes, n_points, n_dims)`` `ndarray`
+        The points of every mesh.
+    trilist : ``(n_tris, 3)`` `ndarray`
+        The triangle list shared by every mesh.
+    copy: `bool`, optional
+        If ``False``, the points and trilist will not be copied on
+        assignment. In general this should only be used if you know what
+        you are doing.
+
+    Raises
+    ------
+    ValueError
+        If the points are not of shape ``(n_meshes, n_points, n_dims)``
+    """
+    _cache_attrs = ('_topology_cache',)
+
+    def __init__(self, points, trilist, copy=True):
+        super(TriMeshBatch, self).__init__(points, copy=copy)
+        if copy:
+            trilist = np.array(trilist, copy=True, order='C')
+        else:
+            trilist = np.require(trilist, requirements=['C'])
+        self.trilist = trilist
+
+    @classmethod
+    def init_from_trimeshes(cls, meshes):
+        r"""
+        Build a batch from a list of :map:`TriMesh` that share the same
+        triangle list. The points of the meshes are copied into the batch.
+
+        Parameters
+        ----------
+        meshes : `list` of :map:`TriMesh`
+            The meshes. The trilist of the first mesh is used for the batch.
+
+        Returns
+        -------
+        batch : :map:`TriMeshBatch`
+            The batch of meshes.
+
+        Raises
+        ------
+        ValueError
+            If the meshes do not all share the same triangle list
+        """
+        meshes = list(meshes)
+        if len(meshes) == 0:
+            raise ValueError('At least one mesh is required to build a '
+                             'TriMeshBatch')
+        trilist = meshes[0].trilist
+        for m in meshes[1:]:
+            if m.trilist is not trilist and not np.array_equal(m.trilist,
+                                                               trilist):
+                raise ValueError('All the meshes of a TriMeshBatch must '
+                                 'share the same trilist')
+        return cls(_stack_points(meshes), trilist, copy=False)
+
+    def _pointcloud(self, points):
+        mesh = TriMesh(points, trilist=self.trilist, copy=False)
+        # the view shares the (cached) topology of the batch
+        mesh._topology_cache = (self.trilist, self.n_points, self.topology())
+        return mesh
+
+    def __str__(self):
+        return '{}: n_meshes: {}, n_points: {}, n_dims: {}, n_tris: {}'.format(
+            type(self).__name__, self.n_meshes, self.n_points, self.n_dims,
+            self.n_tris)
+
+    @property
+    def n_meshes(self):
+        r"""
+        The number of meshes in the batch.
+
+        :type: `int`
+        """
+        return self.points.shape[0]
+
+    @property
+    def n_tris(self):
+        r"""
+        The number of triangles in the shared triangle list.
+
+        :type: `int`
+        """
+        return len(self.trilist)
+
+    def topology(self):
+        r"""
+        The topology of the shared triangle list - see
+        :meth:`TriMesh.topology`.
+
+        Returns
+        -------
+        topology : :map:`TriMeshTopology`
+            The (cached) topology of the meshes.
+        """
+        cache = getattr(self, '_topology_cache', None)
+        if (cache is None or cache[0] is not self.trilist or
+                cache[1] != self.n_points):
+            cache = (self.trilist, self.n_points,
+                     TriMeshTopology(self.trilist, self.n_points))
+            self._topology_cache = cache
+        return cache[2]
+
+    def edge_vectors(self):
+        r"""
+        The edge vectors of every mesh - see :meth:`TriMesh.edge_vectors`.
+
+        Returns
+        -------
+        edge_vectors : ``(n_meshes, n_tris * 3, n_dims)`` `ndarray`
+            The vectors AB, BC and CA of each triangle (ABC) of every mesh,
+            ordered as :meth:`TriMesh.edge_vectors`.
+        """
+        t = self.points[:, self.trilist]
+        return np.concatenate((t[:, :, 1] - t[:, :, 0],
+                               t[:, :, 2] - t[:, :, 1],
+                               t[:, :, 2] - t[:, :, 0]), axis=1)
+
+    def edge_lengths(self):
+        r"""
+        The length of each edge of every mesh - see
+        :meth:`TriMesh.edge_lengths`.
+
+        Returns
+        -------
+        edge_lengths : ``(n_meshes, n_tris * 3)`` `ndarray`
+            The length of each edge of every mesh.
+        """
+        return np.sqrt((self.edge_vectors() ** 2).sum(axis=2))
+
+    def unique_edge_lengths(self):
+        r"""
+        The length of each unique edge of every mesh - see
+        :meth:`TriMesh.unique_edge_lengths`.
+
+        Returns
+        -------
+        edge_lengths : ``(n_meshes, n_unique_edges)`` `ndarray`
+            The length of each unique edge of every mesh.
+        """
+        x = self.points[:, self.topology().edges]
+        return np.sqrt(((x[:, :, 1] - x[:, :, 0]) ** 2).sum(axis=2))
+
+    def tri_areas(self):
+        r"""
+        The area of each triangle of every mesh - see
+        :meth:`TriMesh.tri_areas`.
+
+        Returns
+        -------
+        areas : ``(n_meshes, n_tris)`` `ndarray`
+            The area of each triangle of every mesh.
+
+        Raises
+        ------
+        ValueError
+            If the meshes are not 2D or 3D
+        """
+        t = self.points[:, self.trilist]
+        ij, ik = t[:, :, 1] - t[:, :, 0], t[:, :, 2] - t[:, :, 0]
+        if self.n_dims == 2:
+            return np.cross(ij, ik) * 0.5
+        elif self.n_dims == 3:
+            return np.sqrt((np.cross(ij, ik) ** 2).sum(axis=2)) * 0.5
+        else:
+            raise ValueError('tri_areas can only be calculated on a 2D or '
+                             '3D mesh')
+
+    def _normals(self):
+        if self.n_dims != 3:
+            raise ValueError("Normals are only valid for 3D meshes")
+        topology = self.topology()
+        return compute_normals_batch(self.points, self.trilist,
+                                     topology.vertex_tri_offsets,
+                                     topology.vertex_tri_indices)
+
+    def vertex_normals(self):
+        r"""
+        The per-vertex normals of every mesh - see
+        :meth:`TriMesh.vertex_normals`. Only valid for 3D meshes.
+
+        Returns
+        -------
+        normals : ``(n_meshes, n_points, 3)`` `ndarray`
+            Normal at each point of every mesh.
+
+        Raises
+        ------
+        ValueError
+            If the meshes are not 3D
+        """
+        return self._normals()[0]
+
+    def tri_normals(self):
+        r"""
+        The triangle face normals of every mesh - see
+        :meth:`TriMesh.tri_normals`. Only valid for 3D meshes.
+
+        Returns
+        -------
+        normals : ``(n_meshes, n_tris, 3)`` `ndarray`
+            Normal at each triangle face of every mesh.
+
+        Raises
+        ------
+        ValueError
+            If the meshes are not 3D
+        """
+        return self._normals()[1]
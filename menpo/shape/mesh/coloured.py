@@ -1,6 +1,5 @@
 import numpy as np
 
-from ..adjacency import mask_adjacency_array, reindex_adjacency_array
 from .base import TriMesh
 
 
@@ -72,10 +71,7 @@ class ColouredTriMesh(TriMesh):
             return ctm
         else:
             # Recalculate the mask to remove isolated vertices
-            isolated_mask = self._isolated_mask(mask)
-            # Recreate the adjacency array with the updated mask
-            masked_adj = mask_adjacency_array(isolated_mask, self.trilist)
-            ctm.trilist = reindex_adjacency_array(masked_adj)
+            isolated_mask, ctm.trilist = self._masked_trilist(mask)
             ctm.points = ctm.points[isolated_mask, :]
             ctm.colours = ctm.colours[isolated_mask, :]
             return ctm
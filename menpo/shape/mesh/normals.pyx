@@ -2,79 +2,149 @@ import numpy as np
 import cython
 cimport numpy as np
 cimport cython
+from libc.math cimport sqrt
+from libc.float cimport DBL_EPSILON
 
 ctypedef np.float64_t FLOAT64_T
+ctypedef np.int64_t INT64_T
 ctypedef fused integrals:
     np.uint32_t
     np.uint64_t
     np.int32_t
     np.int64_t
 
-cdef np.ndarray[FLOAT64_T, ndim=2] normalise(np.ndarray[FLOAT64_T, ndim=2] vec):
-    """
-    Normalise the given array of vectors.
 
-    Parameters
-    ----------
-    vec : (N, 3) c-contiguous double ndarray
-        The array of vectors to normalise
-
-    Returns
-    -------
-    normalised : (N, 3) c-contiguous double ndarray
-        Normalised array of vectors.
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void tri_normals_nogil(double[:, ::1] vertex, integrals[:, ::1] face,
+                            double[:, ::1] face_normal) nogil:
     """
-    # Avoid divisions by almost 0 numbers
-    # np.spacing(1) is equivalent to Matlab's eps
-    cdef np.ndarray[FLOAT64_T, ndim=1] d = np.sqrt(np.sum(vec ** 2, axis=1))
-    d[d < np.spacing(1)] = 1.0
-    return vec / d[..., None]
-
-
-cdef inline np.ndarray[FLOAT64_T, ndim=2] cross(double[:, :] x,
-                                                double[:, :] y):
+    Compute the normalised cross product of the edges of every face, writing
+    the results into ``face_normal``. Normals of (almost) 0 length are left
+    unnormalised.
+    """
+    cdef:
+        Py_ssize_t i
+        integrals f0, f1, f2
+        double ux, uy, uz, vx, vy, vz, nx, ny, nz, d
+    for i in range(face.shape[0]):
+        f0 = face[i, 0]
+        f1 = face[i, 1]
+        f2 = face[i, 2]
+        ux = vertex[f1, 0] - vertex[f0, 0]
+        uy = vertex[f1, 1] - vertex[f0, 1]
+        uz = vertex[f1, 2] - vertex[f0, 2]
+        vx = vertex[f2, 0] - vertex[f0, 0]
+        vy = vertex[f2, 1] - vertex[f0, 1]
+        vz = vertex[f2, 2] - vertex[f0, 2]
+        nx = uy * vz - uz * vy
+        ny = uz * vx - ux * vz
+        nz = ux * vy - uy * vx
+        # Avoid divisions by almost 0 numbers
+        d = sqrt(nx * nx + ny * ny + nz * nz)
+        if d < DBL_EPSILON:
+            d = 1.0
+        face_normal[i, 0] = nx / d
+        face_normal[i, 1] = ny / d
+        face_normal[i, 2] = nz / d
+
+
+@cython.boundscheck(False)
+@cython.wraparound(False)
+cdef void vertex_normals_nogil(double[:, ::1] face_normal,
+                               INT64_T[::1] vertex_face_offsets,
+                               INT64_T[::1] vertex_face_indices,
+                               double[:, ::1] vertex_normal) nogil:
+    """
+    Sum the normals of the faces that each vertex belongs to (given as
+    compressed sparse rows), writing the normalised result into
+    ``vertex_normal``.
     """
-    The N x 3 cross product (returns the vectors orthogonal
-    to ``x`` and ``y``). This performs the cross product on each (3, 1) vector
-    in the two arrays. Assumes ``x`` and ``y`` have the same shape.
+    cdef:
+        Py_ssize_t i, k
+        INT64_T f
+        double nx, ny, nz, d
+    for i in range(vertex_normal.shape[0]):
+        nx = 0
+        ny = 0
+        nz = 0
+        for k in range(vertex_face_offsets[i], vertex_face_offsets[i + 1]):
+            f = vertex_face_indices[k]
+            nx += face_normal[f, 0]
+            ny += face_normal[f, 1]
+            nz += face_normal[f, 2]
+        d = sqrt(nx * nx + ny * ny + nz * nz)
+        if d < DBL_EPSILON:
+            d = 1.0
+        vertex_normal[i, 0] = nx / d
+        vertex_normal[i, 1] = ny / d
+        vertex_normal[i, 2] = nz / d
+
+
+def vertex_face_incidence(face, n_vertices):
+    """
+    The faces that each vertex belongs to, as compressed sparse rows - the
+    faces of vertex ``i`` are ``indices[offsets[i]:offsets[i + 1]]``, in
+    ascending order.
 
     Parameters
     ----------
-    x : (N, 3) double memory view
-        First array to perform cross product with.
-    y : (N, 3) double memory view
-        Second array to perform cross product with.
+    face : (M, 3) integer ndarray
+        The list of faces (triangle list).
+    n_vertices : int
+        The number of vertices.
 
     Returns
     -------
-    cross : (N, 3) c-contiguous double ndarray
-        The array of vectors representing the cross product between each
-        corresponding vector.
+    offsets : (n_vertices + 1,) int64 ndarray
+        The offsets of the faces of each vertex.
+    indices : (M * 3,) int64 ndarray
+        The face indices.
     """
-    cdef:
-        np.ndarray[FLOAT64_T, ndim=2] z = np.empty_like(x)
-        Py_ssize_t n = x.shape[0], i = 0
-    for i in range(n):
-        z[i, 0] = x[i, 1] * y[i, 2] - x[i, 2] * y[i, 1]
-        z[i, 1] = x[i, 2] * y[i, 0] - x[i, 0] * y[i, 2]
-        z[i, 2] = x[i, 0] * y[i, 1] - x[i, 1] * y[i, 0]
-
-    return z
-
-
-cpdef compute_normals(np.ndarray[FLOAT64_T, ndim=2] vertex,
-                      np.ndarray[integrals, ndim=2] face):
+    flat = np.asarray(face).ravel()
+    offsets = np.zeros(n_vertices + 1, dtype=np.int64)
+    np.cumsum(np.bincount(flat, minlength=n_vertices), out=offsets[1:])
+    indices = (np.argsort(flat, kind='mergesort') // 3).astype(np.int64)
+    return offsets, indices
+
+
+def _prepare(vertex, face, vertex_face_offsets, vertex_face_indices):
+    face = np.ascontiguousarray(face)
+    if face.ndim != 2 or face.shape[1] != 3:
+        raise ValueError('face must be of shape (M, 3), not '
+                         '{}'.format(face.shape))
+    if face.dtype not in (np.uint32, np.uint64, np.int32, np.int64):
+        face = face.astype(np.int64)
+    if vertex_face_offsets is None or vertex_face_indices is None:
+        vertex_face_offsets, vertex_face_indices = vertex_face_incidence(
+            face, vertex.shape[-2])
+    return (face,
+            np.ascontiguousarray(vertex_face_offsets, dtype=np.int64),
+            np.ascontiguousarray(vertex_face_indices, dtype=np.int64))
+
+
+def compute_normals(vertex, face, vertex_face_offsets=None,
+                    vertex_face_indices=None):
     """
     Compute the per-vertex and per-face normal of the vertices given a list of
     faces. Ensures that all the normals are pointing in a consistent direction
     (to avoid 'inverted' normals).
 
+    The normals are computed in a single pass that releases the GIL and
+    allocates nothing but the outputs. If the same faces are used repeatedly,
+    pass their (precomputed) vertex-face incidence - see
+    ``vertex_face_incidence``.
+
     Parameters
     ----------
-    vertex : (N, 3) c-contiguous double ndarray
+    vertex : (N, 3) double ndarray
         The list of points to compute normals for.
-    face : (M, 3) c-contiguous double ndarray
+    face : (M, 3) integer ndarray
         The list of faces (triangle list).
+    vertex_face_offsets : (N + 1,) int64 ndarray, optional
+        The offsets of the vertex-face incidence. Computed if not provided.
+    vertex_face_indices : (M * 3,) int64 ndarray, optional
+        The indices of the vertex-face incidence. Computed if not provided.
 
     Returns
     -------
@@ -82,30 +152,67 @@ cpdef compute_normals(np.ndarray[FLOAT64_T, ndim=2] vertex,
         The normal per vertex.
     face_normal : (M, 3) c-contiguous double ndarray
         The normal per face.
-    :return:
+
+    Raises
+    ------
+    ValueError
+        If the faces are not of shape (M, 3)
     """
-    cdef int nface = face.shape[0]
-    cdef int nvert = vertex.shape[0]
-
-    # Calculate the cross product (per-face normal)
-    cdef np.ndarray[FLOAT64_T, ndim=2] face_normal = cross(
-        vertex[face[:, 1], :] - vertex[face[:, 0], :],
-        vertex[face[:, 2], :] - vertex[face[:, 0], :])
-    face_normal = normalise(face_normal)
-
-    # Calculate per-vertex normal
-    cdef np.ndarray[FLOAT64_T, ndim=2] vertex_normal = np.zeros([nvert, 3])
-    cdef integrals f0, f1, f2
-    for i in range(nface):
-        f0 = face[i, 0]
-        f1 = face[i, 1]
-        f2 = face[i, 2]
-        for j in range(3):
-            vertex_normal[f0, j] += face_normal[i, j]
-            vertex_normal[f1, j] += face_normal[i, j]
-            vertex_normal[f2, j] += face_normal[i, j]
+    vertex = np.ascontiguousarray(vertex, dtype=np.float64)
+    face, offsets, indices = _prepare(vertex, face, vertex_face_offsets,
+                                      vertex_face_indices)
+    vertex_normal = np.empty([vertex.shape[0], 3])
+    face_normal = np.empty([face.shape[0], 3])
+    _compute_normals(vertex, face, offsets, indices, vertex_normal,
+                     face_normal)
+    return vertex_normal, face_normal
 
-    # Normalize
-    vertex_normal = normalise(vertex_normal)
 
-    return vertex_normal, face_normal
+def compute_normals_batch(vertices, face, vertex_face_offsets=None,
+                          vertex_face_indices=None):
+    """
+    Compute the per-vertex and per-face normals of many sets of vertices
+    that share the same list of faces - see ``compute_normals``.
+
+    Parameters
+    ----------
+    vertices : (B, N, 3) double ndarray
+        The sets of points to compute normals for.
+    face : (M, 3) integer ndarray
+        The list of faces (triangle list) shared by every set of points.
+    vertex_face_offsets : (N + 1,) int64 ndarray, optional
+        The offsets of the vertex-face incidence. Computed if not provided.
+    vertex_face_indices : (M * 3,) int64 ndarray, optional
+        The indices of the vertex-face incidence. Computed if not provided.
+
+    Returns
+    -------
+    vertex_normals : (B, N, 3) c-contiguous double ndarray
+        The normal per vertex of each set of points.
+    face_normals : (B, M, 3) c-contiguous double ndarray
+        The normal per face of each set of points.
+
+    Raises
+    ------
+    ValueError
+        If the faces are not of shape (M, 3)
+    """
+    vertices = np.ascontiguousarray(vertices, dtype=np.float64)
+    face, offsets, indices = _prepare(vertices, face, vertex_face_offsets,
+                                      vertex_face_indices)
+    n_batch = vertices.shape[0]
+    vertex_normals = np.empty([n_batch, vertices.shape[1], 3])
+    face_normals = np.empty([n_batch, face.shape[0], 3])
+    for b in range(n_batch):
+        _compute_normals(vertices[b], face, offsets, indices,
+                         vertex_normals[b], face_normals[b])
+    return vertex_normals, face_normals
+
+
+def _compute_normals(double[:, ::1] vertex, integrals[:, ::1] face,
+                     INT64_T[::1] offsets, INT64_T[::1] indices,
+                     double[:, ::1] vertex_normal,
+                     double[:, ::1] face_normal):
+    with nogil:
+        tri_normals_nogil(vertex, face, face_normal)
+        vertex_normals_nogil(face_normal, offsets, indices, vertex_normal)
@@ -0,0 +1,74 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal
+from nose.tools import raises
+from menpo.shape import TriMesh, TriMeshBatch
+from menpo.transform import Scale
+
+
+def random_batch(n_meshes=4, n_dims=3, seed=0):
+    rng = np.random.RandomState(seed)
+    trilist = np.array([rng.permutation(30)[:3] for _ in range(40)])
+    return TriMeshBatch(rng.randn(n_meshes, 30, n_dims), trilist)
+
+
+def test_batch_getitem_is_a_view():
+    batch = random_batch()
+    mesh = batch[1]
+    assert isinstance(mesh, TriMesh)
+    assert mesh.trilist is batch.trilist
+    mesh.points[0, 0] = 100
+    assert_equal(batch.points[1, 0, 0], 100)
+
+
+def test_batch_views_share_topology():
+    import pickle
+    batch = random_batch()
+    topology = batch.topology()
+    assert batch[0].topology() is topology
+    assert batch[3].topology() is topology
+    for b in [pickle.loads(pickle.dumps(batch)), batch.copy()]:
+        assert '_topology_cache' not in b.__dict__
+
+
+def test_batch_init_from_trimeshes():
+    batch = random_batch()
+    rebuilt = TriMeshBatch.init_from_trimeshes(list(batch))
+    assert_equal(rebuilt.points, batch.points)
+    assert_equal(rebuilt.n_meshes, 4)
+
+
+@raises(ValueError)
+def test_batch_init_from_trimeshes_different_trilists():
+    batch = random_batch()
+    other = TriMesh(batch.points[0], trilist=batch.trilist[::-1])
+    TriMeshBatch.init_from_trimeshes([batch[0], other])
+
+
+def test_batch_quantities_match_trimesh():
+    for n_dims in (2, 3):
+        batch = random_batch(n_dims=n_dims)
+        areas = batch.tri_areas()
+        lengths = batch.edge_lengths()
+        unique_lengths = batch.unique_edge_lengths()
+        for i, mesh in enumerate(batch):
+            assert_allclose(areas[i], mesh.tri_areas())
+            assert_allclose(lengths[i], mesh.edge_lengths())
+            assert_allclose(unique_lengths[i], mesh.unique_edge_lengths())
+
+
+def test_batch_normals_match_trimesh():
+    batch = random_batch()
+    vertex_normals = batch.vertex_normals()
+    tri_normals = batch.tri_normals()
+    for i, mesh in enumerate(batch):
+        assert_allclose(vertex_normals[i], mesh.vertex_normals())
+        assert_allclose(tri_normals[i], mesh.tri_normals())
+
+
+def test_batch_transform_and_vector():
+    batch = random_batch()
+    scaled = Scale(2., n_dims=3).apply(batch)
+    assert_allclose(scaled.points, batch.points * 2)
+    assert_allclose(scaled.as_vector(), batch.points.ravel() * 2)
+    batch.from_vector_inplace(scaled.as_vector())
+    assert_allclose(batch.as_matrix()[2], scaled[2].as_vector())
@@ -0,0 +1,121 @@
+import numpy as np
+from numpy.testing import assert_equal
+from nose.tools import raises
+import menpo.shape.mesh.base as mesh_base
+from menpo.image import BooleanImage
+from menpo.shape import (PointCloud, register_template_trilist,
+                         template_trilist, has_template_trilist)
+from menpo.image import MaskedImage
+from menpo.landmark import ibug_face_68_trimesh, labeller
+from menpo.transform import PiecewiseAffine
+
+
+class CountingDelaunay(object):
+
+    def __init__(self, delaunay):
+        self.delaunay = delaunay
+        self.n_calls = 0
+
+    def __call__(self, points):
+        self.n_calls += 1
+        return self.delaunay(points)
+
+
+def count_delaunay_calls(f):
+    from scipy.spatial import Delaunay
+    counting = CountingDelaunay(Delaunay)
+    mesh_base.Delaunay = counting
+    try:
+        f()
+    finally:
+        mesh_base.Delaunay = Delaunay
+    return counting.n_calls
+
+
+square = PointCloud(np.array([[1., 1.], [1., 8.], [8., 8.], [8., 1.]]))
+square_trilist = np.array([[0, 1, 2], [0, 2, 3]])
+
+
+def test_template_trilist_skips_delaunay():
+    register_template_trilist('square', 4, square_trilist)
+
+    def build():
+        pwa = PiecewiseAffine(square, square, configuration='square')
+        assert_equal(pwa.trilist, square_trilist)
+        mask = BooleanImage.init_blank((10, 10), fill=False)
+        mask.constrain_to_pointcloud(square, configuration='square')
+        assert_equal(mask.n_true(), 64)
+
+    try:
+        assert_equal(count_delaunay_calls(build), 0)
+        # without the configuration, the points are triangulated
+        assert_equal(count_delaunay_calls(
+            lambda: PiecewiseAffine(square, square)), 1)
+    finally:
+        register_template_trilist('square', 4, None)
+    assert 'square' not in mesh_base._template_trilists
+
+
+def test_template_trilist_is_a_copy():
+    register_template_trilist('square', 4, square_trilist)
+    try:
+        trilist = template_trilist('square', 4)
+        trilist[0, 0] = 3
+        assert_equal(template_trilist('square', 4), square_trilist)
+    finally:
+        register_template_trilist('square', 4, None)
+
+
+def test_constrain_to_landmarks_defaults_to_group_template():
+    register_template_trilist('square', 4, square_trilist)
+
+    def build():
+        image = MaskedImage.init_blank((10, 10))
+        image.landmarks['square'] = square
+        image.constrain_mask_to_landmarks(group='square')
+        assert_equal(image.mask.n_true(), 64)
+        image.mask.landmarks['square'] = square
+        image.mask.constrain_to_landmarks(group='square')
+        assert_equal(image.mask.n_true(), 64)
+
+    try:
+        assert_equal(count_delaunay_calls(build), 0)
+    finally:
+        register_template_trilist('square', 4, None)
+
+
+def test_trimesh_labeller_registers_template():
+    image = MaskedImage.init_blank((10, 10))
+    image.landmarks['ibug_face_68'] = PointCloud(np.random.rand(68, 2))
+    labeller(image, 'ibug_face_68', ibug_face_68_trimesh)
+    assert has_template_trilist('ibug_face_68_trimesh', 68)
+    assert_equal(template_trilist('ibug_face_68_trimesh', 68),
+                 image.landmarks['ibug_face_68_trimesh'].lms.trilist)
+
+
+@raises(ValueError)
+def test_template_trilist_wrong_n_points():
+    register_template_trilist('square', 4, square_trilist)
+    try:
+        PiecewiseAffine(PointCloud(np.random.rand(5, 2)),
+                        PointCloud(np.random.rand(5, 2)),
+                        configuration='square')
+    finally:
+        register_template_trilist('square', 4, None)
+
+
+@raises(ValueError)
+def test_template_trilist_unregistered_configuration():
+    template_trilist('not registered', 4)
+
+
+@raises(ValueError)
+def test_template_trilist_out_of_range():
+    register_template_trilist('triangle', 3, np.array([[0, 1, 3]]))
+
+
+@raises(ValueError)
+def test_constrain_to_pointcloud_configuration_needs_pwa():
+    mask = BooleanImage.init_blank((10, 10), fill=False)
+    mask.constrain_to_pointcloud(square, point_in_pointcloud='convex_hull',
+                                 configuration='square')
@@ -0,0 +1,84 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal
+from nose.tools import raises
+from menpo.shape import TriMesh
+from menpo.shape.mesh.normals import compute_normals, compute_normals_batch
+
+
+def random_mesh(seed=0):
+    rng = np.random.RandomState(seed)
+    points = rng.randn(50, 3)
+    trilist = np.array([rng.permutation(50)[:3] for _ in range(80)])
+    return TriMesh(points, trilist=trilist)
+
+
+def reference_normals(points, trilist):
+    def normalise(v):
+        d = np.sqrt((v ** 2).sum(axis=1))
+        d[d < np.spacing(1)] = 1.0
+        return v / d[..., None]
+    t = points[trilist]
+    face_normal = normalise(np.cross(t[:, 1] - t[:, 0], t[:, 2] - t[:, 0]))
+    vertex_normal = np.zeros_like(points)
+    for i in range(3):
+        np.add.at(vertex_normal, trilist[:, i], face_normal)
+    return normalise(vertex_normal), face_normal
+
+
+def test_compute_normals_matches_reference():
+    mesh = random_mesh()
+    vn, fn = compute_normals(mesh.points, mesh.trilist)
+    ref_vn, ref_fn = reference_normals(mesh.points, mesh.trilist)
+    assert_allclose(vn, ref_vn)
+    assert_allclose(fn, ref_fn)
+
+
+def test_compute_normals_int32_trilist():
+    mesh = random_mesh()
+    vn, fn = compute_normals(mesh.points, mesh.trilist.astype(np.int32))
+    assert_allclose(fn, reference_normals(mesh.points, mesh.trilist)[1])
+
+
+def test_normals_follow_inplace_point_edits():
+    mesh = random_mesh()
+    vn = mesh.vertex_normals()
+    vn[:] = 0
+    assert np.all(mesh.vertex_normals() != 0)
+    mesh.points[:, 2] *= -1
+    ref_vn, ref_fn = reference_normals(mesh.points, mesh.trilist)
+    assert_allclose(mesh.vertex_normals(), ref_vn)
+    assert_allclose(mesh.tri_normals(), ref_fn)
+    mesh.from_vector_inplace(mesh.as_vector() * -1)
+    assert_allclose(mesh.tri_normals(),
+                    reference_normals(mesh.points, mesh.trilist)[1])
+
+
+@raises(ValueError)
+def test_compute_normals_tetrahedra_raises_value_error():
+    points = np.random.RandomState(0).randn(10, 3)
+    compute_normals(points, np.array([[0, 1, 2, 3], [4, 5, 6, 7]]))
+
+
+@raises(ValueError)
+def test_compute_normals_batch_flat_face_raises_value_error():
+    points = np.random.RandomState(0).randn(2, 10, 3)
+    compute_normals_batch(points, np.arange(6))
+
+
+def test_batch_normals():
+    mesh = random_mesh()
+    points = np.random.RandomState(1).randn(4, mesh.n_points, 3)
+    vns, fns = mesh.batch_normals(points)
+    assert_equal(vns.shape, (4, mesh.n_points, 3))
+    assert_equal(fns.shape, (4, mesh.n_tris, 3))
+    for p, vn, fn in zip(points, vns, fns):
+        ref_vn, ref_fn = compute_normals(p, mesh.trilist)
+        assert_allclose(vn, ref_vn)
+        assert_allclose(fn, ref_fn)
+    assert_allclose(compute_normals_batch(points, mesh.trilist)[0], vns)
+
+
+@raises(ValueError)
+def test_batch_normals_wrong_shape():
+    mesh = random_mesh()
+    mesh.batch_normals(np.zeros([2, mesh.n_points + 1, 3]))
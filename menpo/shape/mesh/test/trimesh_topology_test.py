@@ -0,0 +1,90 @@
+from collections import Counter
+import numpy as np
+from numpy.testing import assert_equal
+from menpo.shape import TriMesh
+
+
+def grid_mesh(n=5):
+    # a regular n x n grid of points triangulated as 2 triangles per cell
+    y, x = np.mgrid[:n, :n]
+    points = np.vstack([x.ravel(), y.ravel()]).T.astype(np.float)
+    i = np.arange(n * n).reshape([n, n])[:-1, :-1].ravel()
+    trilist = np.vstack([np.vstack([i, i + 1, i + n]).T,
+                         np.vstack([i + 1, i + n + 1, i + n]).T])
+    return TriMesh(points, trilist=trilist)
+
+
+def brute_force_boundary_tri_index(trilist):
+    edges = [tuple(sorted(e)) for t in trilist
+             for e in [(t[0], t[1]), (t[1], t[2]), (t[2], t[0])]]
+    counts = Counter(edges)
+    return np.array(sorted(i for i, t in enumerate(trilist)
+                           if any(counts[tuple(sorted(e))] == 1
+                                  for e in [(t[0], t[1]), (t[1], t[2]),
+                                            (t[2], t[0])])))
+
+
+def test_boundary_tri_index():
+    mesh = grid_mesh()
+    assert_equal(mesh.boundary_tri_index(),
+                 brute_force_boundary_tri_index(mesh.trilist))
+
+
+def test_topology_edges():
+    mesh = grid_mesh(3)
+    topology = mesh.topology()
+    # 12 horizontal/vertical edges and 4 diagonals
+    assert_equal(topology.n_edges, 16)
+    assert_equal(topology.edges[topology.tri_edges],
+                 np.sort(mesh.trilist[:, [0, 1, 1, 2, 2, 0]].reshape(
+                     [-1, 3, 2])))
+    # 8 boundary edges each with one triangle, 8 interior edges with two
+    assert_equal(np.bincount(topology.edge_n_tris), [0, 8, 8])
+    for e in range(topology.n_edges):
+        tris = topology.edge_tris(e)
+        assert_equal(len(tris), topology.edge_n_tris[e])
+        assert np.all(np.any(topology.tri_edges[tris] == e, axis=1))
+
+
+def test_topology_vertex_tris():
+    mesh = grid_mesh(3)
+    topology = mesh.topology()
+    for v in range(mesh.n_points):
+        assert_equal(topology.vertex_tris(v),
+                     np.nonzero(np.any(mesh.trilist == v, axis=1))[0])
+
+
+def test_topology_cached_until_trilist_replaced():
+    mesh = grid_mesh(3)
+    topology = mesh.topology()
+    assert mesh.topology() is topology
+    mesh.trilist = mesh.trilist[:4].copy()
+    assert mesh.topology() is not topology
+    assert_equal(mesh.topology().tri_edges.shape, (4, 3))
+
+
+def test_topology_cache_not_pickled_or_copied():
+    import pickle
+    mesh = grid_mesh(3)
+    mesh.topology()
+    for m in [pickle.loads(pickle.dumps(mesh)), mesh.copy()]:
+        assert '_topology_cache' not in m.__dict__
+        assert_equal(m.topology().edges, mesh.topology().edges)
+
+
+def test_from_mask_removes_isolated_points():
+    mesh = grid_mesh(3)
+    mask = np.ones(9, dtype=np.bool)
+    # removing the centre point leaves no triangles on the corners 2 and 6
+    mask[4] = False
+    masked = mesh.from_mask(mask)
+    assert_equal(masked.n_points, 6)
+    assert_equal(masked.n_tris, 2)
+    assert masked.trilist.max() == 5
+
+
+def test_as_pointgraph_edges():
+    mesh = grid_mesh(3)
+    pg = mesh.as_pointgraph()
+    assert_equal(pg.n_edges, 16)
+    assert_equal(pg.adjacency_matrix.data, np.ones(32))
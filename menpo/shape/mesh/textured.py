@@ -3,7 +3,6 @@ import numpy as np
 from menpo.shape import PointCloud
 from menpo.transform import Scale
 
-from ..adjacency import mask_adjacency_array, reindex_adjacency_array
 from .base import TriMesh
 
 
@@ -120,10 +119,7 @@ class TexturedTriMesh(TriMesh):
             return ttm
         else:
             # Recalculate the mask to remove isolated vertices
-            isolated_mask = self._isolated_mask(mask)
-            # Recreate the adjacency array with the updated mask
-            masked_adj = mask_adjacency_array(isolated_mask, self.trilist)
-            ttm.trilist = reindex_adjacency_array(masked_adj)
+            isolated_mask, ttm.trilist = self._masked_trilist(mask)
             ttm.points = ttm.points[isolated_mask, :]
             ttm.tcoords.points = ttm.tcoords.points[isolated_mask, :]
             return ttm
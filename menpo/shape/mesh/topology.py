@@ -0,0 +1,148 @@
+import numpy as np
+
+
+class TriMeshTopology(object):
+    r"""
+    The topology (connectivity) of a triangle list - the table of its unique
+    edges, which triangles share each edge, which triangles each vertex
+    belongs to and the boundary of the mesh. Everything is computed with a
+    small number of vectorized sorts, in ``O(n_tris log n_tris)`` time.
+
+    Rather than building this directly, use :meth:`TriMesh.topology`, which
+    caches the topology of the mesh until its ``trilist`` is replaced.
+
+    Parameters
+    ----------
+    trilist : ``(n_tris, 3)`` `ndarray`
+        The triangle list.
+    n_points : `int`
+        The number of vertices the triangle list indexes into.
+
+    Attributes
+    ----------
+    edges : ``(n_edges, 2)`` `ndarray`
+        The unique edges, each ordered from lowest to highest vertex index.
+    tri_edges : ``(n_tris, 3)`` `ndarray`
+        For each triangle (ABC), the index into ``edges`` of AB, BC and CA.
+    edge_n_tris : ``(n_edges,)`` `ndarray`
+        The number of triangles that share each edge.
+    edge_tri_offsets : ``(n_edges + 1,)`` `ndarray`
+        The triangles of edge ``i`` are
+        ``edge_tri_indices[edge_tri_offsets[i]:edge_tri_offsets[i + 1]]``.
+    edge_tri_indices : ``(n_tris * 3,)`` `ndarray`
+        See ``edge_tri_offsets``.
+    vertex_tri_offsets : ``(n_points + 1,)`` `ndarray`
+        The triangles of vertex ``i`` are
+        ``vertex_tri_indices[vertex_tri_offsets[i]:vertex_tri_offsets[i + 1]]``.
+    vertex_tri_indices : ``(n_tris * 3,)`` `ndarray`
+        See ``vertex_tri_offsets``.
+    """
+    def __init__(self, trilist, n_points):
+        n_tris = trilist.shape[0]
+        self.n_tris, self.n_points = n_tris, n_points
+        # all the edges AB, BC, CA, each sorted from lowest to highest index
+        edge_pairs = np.sort(np.vstack((trilist[:, [0, 1]],
+                                        trilist[:, [1, 2]],
+                                        trilist[:, [2, 0]])))
+        # view each pair as a single item, so that np.unique removes the
+        # duplicated edges
+        edge_pairs = np.ascontiguousarray(edge_pairs)
+        edge_pair_view = edge_pairs.view(
+            np.dtype((np.void, edge_pairs.dtype.itemsize * 2))).ravel()
+        _, first, inverse = np.unique(edge_pair_view, return_index=True,
+                                      return_inverse=True)
+        self.edges = edge_pairs[first]
+        n_edges = self.edges.shape[0]
+        self.tri_edges = inverse.reshape([3, n_tris]).T.copy()
+
+        # edge -> triangle map as compressed sparse rows. A stable sort keeps
+        # the triangles of each edge in ascending order
+        self.edge_n_tris = np.bincount(inverse, minlength=n_edges)
+        self.edge_tri_offsets = _offsets(self.edge_n_tris)
+        self.edge_tri_indices = (np.argsort(inverse, kind='mergesort') %
+                                 max(n_tris, 1))
+
+        # vertex -> triangle map as compressed sparse rows
+        flat = trilist.ravel()
+        self.vertex_tri_offsets = _offsets(np.bincount(flat,
+                                                       minlength=n_points))
+        self.vertex_tri_indices = np.argsort(flat, kind='mergesort') // 3
+
+    @property
+    def n_edges(self):
+        r"""
+        The number of unique edges.
+
+        :type: `int`
+        """
+        return self.edges.shape[0]
+
+    def boundary_edge_mask(self):
+        r"""
+        Boolean mask of the unique edges that belong to a single triangle,
+        i.e. that lie on the boundary of the mesh.
+
+        :type: ``(n_edges,)`` `bool ndarray`
+        """
+        return self.edge_n_tris == 1
+
+    def boundary_edges(self):
+        r"""
+        The unique edges that lie on the boundary of the mesh.
+
+        :type: ``(n_boundary_edges, 2)`` `ndarray`
+        """
+        return self.edges[self.boundary_edge_mask()]
+
+    def boundary_tri_mask(self):
+        r"""
+        Boolean mask of the triangles that have at least one edge on the
+        boundary of the mesh.
+
+        :type: ``(n_tris,)`` `bool ndarray`
+        """
+        return self.boundary_edge_mask()[self.tri_edges].any(axis=1)
+
+    def edge_tris(self, edge):
+        r"""
+        The triangles that share the given edge.
+
+        Parameters
+        ----------
+        edge : `int`
+            Index into ``edges``.
+
+        Returns
+        -------
+        tris : ``(n_edge_tris,)`` `ndarray`
+            The triangle indices, in ascending order.
+        """
+        o = self.edge_tri_offsets
+        return self.edge_tri_indices[o[edge]:o[edge + 1]]
+
+    def vertex_tris(self, vertex):
+        r"""
+        The triangles that the given vertex belongs to.
+
+        Parameters
+        ----------
+        vertex : `int`
+            The vertex index.
+
+        Returns
+        -------
+        tris : ``(n_vertex_tris,)`` `ndarray`
+            The triangle indices, in ascending order.
+        """
+        o = self.vertex_tri_offsets
+        return self.vertex_tri_indices[o[vertex]:o[vertex + 1]]
+
+
+def _offsets(counts):
+    r"""
+    The offsets of the rows of a compressed sparse row structure with the
+    given number of entries per row.
+    """
+    offsets = np.zeros(counts.shape[0] + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+    return offsets
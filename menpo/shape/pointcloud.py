@@ -1,8 +1,12 @@
 import numpy as np
 from warnings import warn
 from scipy.sparse import csr_matrix
+from scipy.spatial import cKDTree
 from scipy.spatial.distance import cdist
 
+from menpo.base import Vectorizable
+from menpo.landmark import Landmarkable
+from menpo.transform.base import Transformable
 from menpo.shape.base import Shape
 
 
@@ -62,37 +66,19 @@ def bounding_box(closest_to_origin, opposite_corner):
     return PointDirectedGraph(box, adjacency_matrix, copy=False)
 
 
-class PointCloud(Shape):
+class PointCloudMixin(object):
     r"""
-    An N-dimensional point cloud. This is internally represented as an `ndarray`
-    of shape ``(n_points, n_dims)``. This class is important for dealing
-    with complex functionality such as viewing and representing metadata such
-    as landmarks.
-
-    Currently only 2D and 3D pointclouds are viewable.
-
-    Parameters
-    ----------
-    points : ``(n_points, n_dims)`` `ndarray`
-        The array representing the points.
-    copy : `bool`, optional
-        If ``False``, the points will not be copied on assignment. Note that
-        this will miss out on additional checks. Further note that we still
-        demand that the array is C-contiguous - if it isn't, a copy will be
-        generated anyway.
-        In general this should only be used if you know what you are doing.
+    The methods of :map:`PointCloud` and :map:`LightPointCloud` that only
+    depend on the ``points`` attribute. This mixin holds no state (it defines
+    empty ``__slots__``), so that it can be shared by the slotted
+    :map:`LightPointCloud`.
     """
+    __slots__ = ()
 
-    def __init__(self, points, copy=True):
-        super(PointCloud, self).__init__()
-        if not copy:
-            if not points.flags.c_contiguous:
-                warn('The copy flag was NOT honoured. A copy HAS been made. '
-                     'Please ensure the data you pass is C-contiguous.')
-                points = np.array(points, copy=True, order='C')
-        else:
-            points = np.array(points, copy=True, order='C')
-        self.points = points
+    def __str__(self):
+        return '{}: n_points: {}, n_dims: {}'.format(type(self).__name__,
+                                                     self.n_points,
+                                                     self.n_dims)
 
     @property
     def n_points(self):
@@ -157,36 +143,6 @@ class PointCloud(Shape):
         """
         return self.points.ravel()
 
-    def tojson(self):
-        r"""
-        Convert this :map:`PointCloud` to a dictionary representation suitable
-        for inclusion in the LJSON landmark format.
-
-        Returns
-        -------
-        json : `dict`
-            Dictionary with ``points`` keys.
-        """
-        return {'points': self.points.tolist()}
-
-    def from_vector_inplace(self, vector):
-        r"""
-        Updates the points of this PointCloud in-place with the reshaped points
-        from the provided vector. Note that the vector should have the form
-        ``[x0, y0, x1, y1, ....., xn, yn]`` for 2D.
-
-        Parameters
-        ----------
-        vector : ``(n_points,)`` `ndarray`
-            The vector from which to create the points' array.
-        """
-        self.points = vector.reshape([-1, self.n_dims])
-
-    def __str__(self):
-        return '{}: n_points: {}, n_dims: {}'.format(type(self).__name__,
-                                                     self.n_points,
-                                                     self.n_dims)
-
     def bounds(self, boundary=0):
         r"""
         The minimum to maximum extent of the PointCloud. An optional boundary
@@ -231,6 +187,82 @@ class PointCloud(Shape):
         min_b, max_b = self.bounds(boundary)
         return max_b - min_b
 
+    def norm(self, **kwargs):
+        r"""
+        Returns the norm of this PointCloud. This is a translation and
+        rotation invariant measure of the point cloud's intrinsic size - in
+        other words, it is always taken around the point cloud's centre.
+
+        By default, the Frobenius norm is taken, but this can be changed by
+        setting kwargs - see ``numpy.linalg.norm`` for valid options.
+
+        Returns
+        -------
+        norm : `float`
+            The norm of this :map:`PointCloud`
+        """
+        return np.linalg.norm(self.points - self.centre(), **kwargs)
+
+
+class PointCloud(PointCloudMixin, Shape):
+    r"""
+    An N-dimensional point cloud. This is internally represented as an `ndarray`
+    of shape ``(n_points, n_dims)``. This class is important for dealing
+    with complex functionality such as viewing and representing metadata such
+    as landmarks.
+
+    Currently only 2D and 3D pointclouds are viewable.
+
+    Parameters
+    ----------
+    points : ``(n_points, n_dims)`` `ndarray`
+        The array representing the points.
+    copy : `bool`, optional
+        If ``False``, the points will not be copied on assignment. Note that
+        this will miss out on additional checks. Further note that we still
+        demand that the array is C-contiguous - if it isn't, a copy will be
+        generated anyway.
+        In general this should only be used if you know what you are doing.
+    """
+    _cache_attrs = ('_spatial_index_cache',)
+
+    def __init__(self, points, copy=True):
+        super(PointCloud, self).__init__()
+        if not copy:
+            if not points.flags.c_contiguous:
+                warn('The copy flag was NOT honoured. A copy HAS been made. '
+                     'Please ensure the data you pass is C-contiguous.')
+                points = np.array(points, copy=True, order='C')
+        else:
+            points = np.array(points, copy=True, order='C')
+        self.points = points
+
+    def tojson(self):
+        r"""
+        Convert this :map:`PointCloud` to a dictionary representation suitable
+        for inclusion in the LJSON landmark format.
+
+        Returns
+        -------
+        json : `dict`
+            Dictionary with ``points`` keys.
+        """
+        return {'points': self.points.tolist()}
+
+    def from_vector_inplace(self, vector):
+        r"""
+        Updates the points of this PointCloud in-place with the reshaped points
+        from the provided vector. Note that the vector should have the form
+        ``[x0, y0, x1, y1, ....., xn, yn]`` for 2D.
+
+        Parameters
+        ----------
+        vector : ``(n_points,)`` `ndarray`
+            The vector from which to create the points' array.
+        """
+        self.points = vector.reshape([-1, self.n_dims])
+        self._spatial_index_cache = None
+
     def bounding_box(self):
         r"""
         Return a bounding box from two corner points as a directed graph.
@@ -711,8 +743,101 @@ class PointCloud(Shape):
 
     def _transform_self_inplace(self, transform):
         self.points = transform(self.points)
+        self._spatial_index_cache = None
         return self
 
+    def spatial_index(self):
+        r"""
+        A k-d tree of the points of this PointCloud (a
+        `scipy.spatial.cKDTree`), for efficient nearest neighbour and radius
+        queries - see :meth:`nearest` and :meth:`within_radius`. The tree is
+        built on first use and cached until the points are replaced or
+        transformed (note that modifying the ``points`` inplace is not
+        detected).
+
+        Returns
+        -------
+        spatial_index : `scipy.spatial.cKDTree`
+            The (cached) k-d tree of the points.
+        """
+        cache = getattr(self, '_spatial_index_cache', None)
+        if cache is None or cache[0] is not self.points:
+            cache = (self.points, cKDTree(self.points))
+            self._spatial_index_cache = cache
+        return cache[1]
+
+    def nearest(self, pointcloud, k=1):
+        r"""
+        Finds the ``k`` points of this PointCloud nearest (in Euclidean
+        distance) to each point of another, using the :meth:`spatial_index`
+        of this PointCloud. Unlike :meth:`distance_to`, the dense distance
+        matrix is never computed, so this is suitable for large pointclouds,
+        e.g. finding correspondences between a template and a scan.
+
+        Parameters
+        ----------
+        pointcloud : :map:`PointCloud`
+            The pointcloud whose points to find the nearest points of. This
+            must be of the same dimension as this PointCloud.
+        k : `int`, optional
+            The number of nearest points to find.
+
+        Returns
+        -------
+        distances : ``(n_points,)`` or ``(n_points, k)`` `ndarray`
+            The distance from each point of ``pointcloud`` to its nearest
+            points of this PointCloud, in ascending order. If ``k == 1`` the
+            last dimension is dropped.
+        indices : ``(n_points,)`` or ``(n_points, k)`` `ndarray`
+            The index into this PointCloud of the nearest points.
+
+        Raises
+        ------
+        ValueError
+            The two PointClouds must be of the same dimensionality.
+        ValueError
+            k must be in the range ``[1, n_points]``.
+        """
+        if self.n_dims != pointcloud.n_dims:
+            raise ValueError("The two PointClouds must be of the same "
+                             "dimensionality.")
+        if k < 1 or k > self.n_points:
+            raise ValueError('k must be in the range [1, {}], not '
+                             '{}'.format(self.n_points, k))
+        return self.spatial_index().query(pointcloud.points, k=k)
+
+    def within_radius(self, pointcloud, radius):
+        r"""
+        Finds the points of this PointCloud that are within a (Euclidean)
+        distance of each point of another, using the :meth:`spatial_index`
+        of this PointCloud.
+
+        Parameters
+        ----------
+        pointcloud : :map:`PointCloud`
+            The pointcloud whose points to find the neighbourhoods of. This
+            must be of the same dimension as this PointCloud.
+        radius : `float`
+            The maximum distance from each point.
+
+        Returns
+        -------
+        indices : `list` of `list`
+            For each point of ``pointcloud``, the indices into this
+            PointCloud of the points within ``radius``, in ascending order.
+
+        Raises
+        ------
+        ValueError
+            The two PointClouds must be of the same dimensionality.
+        """
+        if self.n_dims != pointcloud.n_dims:
+            raise ValueError("The two PointClouds must be of the same "
+                             "dimensionality.")
+        neighbourhoods = self.spatial_index().query_ball_point(
+            pointcloud.points, radius)
+        return [sorted(n) for n in neighbourhoods]
+
     def distance_to(self, pointcloud, **kwargs):
         r"""
         Returns a distance matrix between this PointCloud and another.
@@ -724,7 +849,8 @@ class PointCloud(Shape):
         ----------
         pointcloud : :map:`PointCloud`
             The second pointcloud to compute distances between. This must be
-            of the same dimension as this PointCloud.
+            of the same dimension as this PointCloud. To only find the
+            closest points of large PointClouds, use :meth:`nearest`.
 
         Returns
         -------
@@ -739,22 +865,6 @@ class PointCloud(Shape):
                              "dimensionality.")
         return cdist(self.points, pointcloud.points, **kwargs)
 
-    def norm(self, **kwargs):
-        r"""
-        Returns the norm of this PointCloud. This is a translation and
-        rotation invariant measure of the point cloud's intrinsic size - in
-        other words, it is always taken around the point cloud's centre.
-
-        By default, the Frobenius norm is taken, but this can be changed by
-        setting kwargs - see ``numpy.linalg.norm`` for valid options.
-
-        Returns
-        -------
-        norm : `float`
-            The norm of this :map:`PointCloud`
-        """
-        return np.linalg.norm(self.points - self.centre(), **kwargs)
-
     def from_mask(self, mask):
         """
         A 1D boolean array with the same number of elements as the number of
@@ -783,3 +893,90 @@ class PointCloud(Shape):
         pc = self.copy()
         pc.points = pc.points[mask, :]
         return pc
+
+
+class LightPointCloud(PointCloudMixin, Vectorizable, Transformable,
+                      Landmarkable):
+    r"""
+    A lightweight alternative to :map:`PointCloud` for hot loops (e.g.
+    fitting) that create and discard many small shapes. Instances have no
+    ``__dict__`` (the state is held in ``__slots__``), the
+    :map:`LandmarkManager` is only created when the landmarks are first
+    accessed and :meth:`copy` copies the points directly.
+
+    A :map:`LightPointCloud` can be used in place of a :map:`PointCloud` by
+    transforms (``transform.apply(light_pointcloud)``) and as the source or
+    target of an :map:`Alignment`. Use :meth:`as_pointcloud` to obtain a
+    full :map:`PointCloud` (e.g. for viewing).
+
+    Parameters
+    ----------
+    points : ``(n_points, n_dims)`` `ndarray`
+        The array representing the points.
+    copy : `bool`, optional
+        If ``False``, the points will not be copied on assignment. Note that
+        this will miss out on additional checks. Further note that we still
+        demand that the array is C-contiguous - if it isn't, a copy will be
+        generated anyway.
+    """
+    __slots__ = ('points', '_landmarks')
+
+    def __init__(self, points, copy=True):
+        if copy or not points.flags.c_contiguous:
+            points = np.array(points, copy=True, order='C')
+        self.points = points
+        self._landmarks = None
+
+    def __getstate__(self):
+        return self.points, self._landmarks
+
+    def __setstate__(self, state):
+        self.points, self._landmarks = state
+
+    def copy(self):
+        r"""
+        Generate a copy of this object - the points and any landmarks are
+        copied.
+
+        Returns
+        -------
+        ``type(self)``
+            A copy of this object
+        """
+        new = self.__class__.__new__(self.__class__)
+        new.points = self.points.copy()
+        new._landmarks = (None if self._landmarks is None else
+                          self._landmarks.copy())
+        return new
+
+    def as_pointcloud(self):
+        r"""
+        A :map:`PointCloud` of (a copy of) the points and landmarks.
+
+        Returns
+        -------
+        pointcloud : :map:`PointCloud`
+            The pointcloud.
+        """
+        pc = PointCloud(self.points)
+        if self.has_landmarks:
+            pc.landmarks = self.landmarks
+        return pc
+
+    def from_vector_inplace(self, vector):
+        r"""
+        Updates the points in-place with the reshaped points from the
+        provided vector - see :meth:`PointCloud.from_vector_inplace`.
+
+        Parameters
+        ----------
+        vector : ``(n_points,)`` `ndarray`
+            The vector from which to create the points' array.
+        """
+        self.points = vector.reshape([-1, self.n_dims])
+
+    def _transform_inplace(self, transform):
+        if self.has_landmarks:
+            self.landmarks._transform_inplace(transform)
+        self.points = transform(self.points)
+        return self
@@ -0,0 +1,280 @@
+import numpy as np
+
+from menpo.base import Vectorizable
+from menpo.transform.base import Transformable
+
+from .pointcloud import PointCloud
+
+
+class PointCloudSet(Vectorizable, Transformable):
+    r"""
+    A collection of pointclouds that all have the same number of points,
+    e.g. the (landmark) shapes of a dataset. The points of every pointcloud
+    are held in a single ``(n_pointclouds, n_points, n_dims)`` `ndarray`, so
+    that group operations such as the :meth:`mean` or the :meth:`centre` of
+    every pointcloud are computed in a single vectorized operation.
+
+    Indexing a set returns a :map:`PointCloud` whose points are a view into
+    the points of the set - no data is copied.
+
+    Parameters
+    ----------
+    points : ``(n_pointclouds, n_points, n_dims)`` `ndarray`
+        The points of every pointcloud.
+    copy: `bool`, optional
+        If ``False``, the points will not be copied on assignment. In general
+        this should only be used if you know what you are doing.
+
+    Raises
+    ------
+    ValueError
+        If the points are not of shape ``(n_pointclouds, n_points, n_dims)``
+    """
+    def __init__(self, points, copy=True):
+        if points.ndim != 3:
+            raise ValueError('points must be of shape (n_pointclouds, '
+                             'n_points, n_dims), not {}'.format(points.shape))
+        if copy:
+            points = np.array(points, copy=True, order='C')
+        else:
+            points = np.require(points, requirements=['C'])
+        self.points = points
+
+    @classmethod
+    def init_from_pointclouds(cls, pointclouds):
+        r"""
+        Build a set from a list of :map:`PointCloud`. The points of the
+        pointclouds are copied into the set.
+
+        Parameters
+        ----------
+        pointclouds : `list` of :map:`PointCloud`
+            The pointclouds, which must all have the same number of points.
+
+        Returns
+        -------
+        pointcloud_set : :map:`PointCloudSet`
+            The set of pointclouds.
+
+        Raises
+        ------
+        ValueError
+            If the pointclouds do not all have the same number of points
+        """
+        return cls(_stack_points(pointclouds), copy=False)
+
+    def _pointcloud(self, points):
+        r"""
+        Builds the (view) pointcloud of the given points - subclasses
+        override this to attach their shared structure.
+        """
+        return PointCloud(points, copy=False)
+
+    def __str__(self):
+        return '{}: n_pointclouds: {}, n_points: {}, n_dims: {}'.format(
+            type(self).__name__, len(self), self.n_points, self.n_dims)
+
+    def __len__(self):
+        return self.points.shape[0]
+
+    def __getitem__(self, i):
+        return self._pointcloud(self.points[i])
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self[i]
+
+    @property
+    def n_pointclouds(self):
+        r"""
+        The number of pointclouds in the set.
+
+        :type: `int`
+        """
+        return self.points.shape[0]
+
+    @property
+    def n_points(self):
+        r"""
+        The number of points of each pointcloud.
+
+        :type: `int`
+        """
+        return self.points.shape[1]
+
+    @property
+    def n_dims(self):
+        r"""
+        The number of dimensions of the pointclouds.
+
+        :type: `int`
+        """
+        return self.points.shape[2]
+
+    def _as_vector(self):
+        r"""
+        Returns a flattened representation of the points of every
+        pointcloud, ordered pointcloud by pointcloud.
+
+        Returns
+        -------
+        vector : ``(n_pointclouds * n_points * n_dims,)`` `ndarray`
+            The flattened points.
+        """
+        return self.points.ravel()
+
+    def from_vector_inplace(self, vector):
+        r"""
+        Updates the points of every pointcloud from a flattened vector, as
+        returned by :meth:`as_vector`.
+
+        Parameters
+        ----------
+        vector : ``(n_pointclouds * n_points * n_dims,)`` `ndarray`
+            The new flattened points.
+        """
+        self.points = vector.reshape(self.points.shape)
+
+    def as_matrix(self):
+        r"""
+        The points of every pointcloud as the rows of a data matrix (the
+        layout of :func:`menpo.math.as_matrix`). This is a view of the
+        points.
+
+        Returns
+        -------
+        matrix : ``(n_pointclouds, n_points * n_dims)`` `ndarray`
+            The flattened points of each pointcloud.
+        """
+        return self.points.reshape([self.n_pointclouds, -1])
+
+    def _transform_inplace(self, transform):
+        r"""
+        Transform the points of every pointcloud with the same transform.
+        The points of the set are transformed together in a single call.
+        """
+        n_pointclouds, n_points = self.n_pointclouds, self.n_points
+        points = transform(self.points.reshape([n_pointclouds * n_points,
+                                                -1]))
+        self.points = np.require(points.reshape([n_pointclouds, n_points,
+                                                 -1]),
+                                 requirements=['C'])
+        return self
+
+    def apply(self, transforms):
+        r"""
+        Applies a different transform to each pointcloud, returning the
+        transformed set (this set is left unchanged). If every transform is
+        :map:`Homogeneous`, the transforms are applied together as a single
+        stack of homogeneous matrices.
+
+        To apply the same transform to every pointcloud, use
+        ``transform.apply(pointcloud_set)``.
+
+        Parameters
+        ----------
+        transforms : `list` of :map:`Transform`
+            One transform per pointcloud.
+
+        Returns
+        -------
+        transformed : ``type(self)``
+            A copy of this set with each pointcloud transformed.
+
+        Raises
+        ------
+        ValueError
+            If there is not one transform per pointcloud
+        """
+        # to avoid circular import
+        from menpo.transform.homogeneous import (
+            Homogeneous, apply_h_matrices, h_matrices_from_transforms)
+        if len(transforms) != self.n_pointclouds:
+            raise ValueError('{} transforms were provided for {} '
+                             'pointclouds'.format(len(transforms),
+                                                  self.n_pointclouds))
+        if all(isinstance(t, Homogeneous) for t in transforms):
+            points = apply_h_matrices(h_matrices_from_transforms(transforms),
+                                      self.points)
+        else:
+            points = np.array([t.apply(p)
+                               for t, p in zip(transforms, self.points)])
+        new = self.copy()
+        new.points = np.require(points, requirements=['C'])
+        return new
+
+    def mean(self):
+        r"""
+        The mean of the pointclouds.
+
+        Returns
+        -------
+        mean : :map:`PointCloud`
+            The mean pointcloud.
+        """
+        return self._pointcloud(self.points.mean(axis=0))
+
+    def centre(self):
+        r"""
+        The mean of the points of each pointcloud (its centre of mass) - see
+        :meth:`PointCloud.centre`.
+
+        Returns
+        -------
+        centres : ``(n_pointclouds, n_dims)`` `ndarray`
+            The centre of each pointcloud.
+        """
+        return self.points.mean(axis=1)
+
+    def norm(self):
+        r"""
+        The Frobenius norm of each pointcloud, taken around its centre - see
+        :meth:`PointCloud.norm`.
+
+        Returns
+        -------
+        norms : ``(n_pointclouds,)`` `ndarray`
+            The norm of each pointcloud.
+        """
+        centred = self.points - self.centre()[:, None, :]
+        return np.sqrt((centred ** 2).sum(axis=2).sum(axis=1))
+
+    def bounds(self, boundary=0):
+        r"""
+        The minimum to maximum extent of each pointcloud - see
+        :meth:`PointCloud.bounds`.
+
+        Parameters
+        ----------
+        boundary : `float`
+            A optional padding distance that is added to the bounds.
+
+        Returns
+        -------
+        min_b : ``(n_pointclouds, n_dims)`` `ndarray`
+            The minimum extent of each pointcloud along each dimension.
+        max_b : ``(n_pointclouds, n_dims)`` `ndarray`
+            The maximum extent of each pointcloud along each dimension.
+        """
+        return (self.points.min(axis=1) - boundary,
+                self.points.max(axis=1) + boundary)
+
+
+def _stack_points(pointclouds):
+    r"""
+    Copies the points of a list of pointclouds, which must all have the same
+    number of points, into a single ``(n_pointclouds, n_points, n_dims)``
+    `ndarray`.
+    """
+    pointclouds = list(pointclouds)
+    if len(pointclouds) == 0:
+        raise ValueError('At least one pointcloud is required')
+    shape = pointclouds[0].points.shape
+    points = np.empty((len(pointclouds),) + shape,
+                      dtype=pointclouds[0].points.dtype)
+    for i, pc in enumerate(pointclouds):
+        if pc.points.shape != shape:
+            raise ValueError('All the pointclouds must have the same number '
+                             'of points and dimensions')
+        points[i] = pc.points
+    return points
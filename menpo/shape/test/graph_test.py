@@ -185,6 +185,33 @@ def test_find_all_paths():
     assert (g_single.find_all_paths(0, 10) == [])
 
 
+def test_find_all_paths_bounded():
+    assert (g_undirected.find_all_paths(0, 5, max_paths=2) ==
+            [[0, 1, 2, 4, 3, 5], [0, 1, 3, 5]])
+    assert (g_undirected.find_all_paths(0, 5, max_length=3) ==
+            [[0, 1, 3, 5]])
+    assert (g_undirected.n_paths(0, 5, max_length=4) == 3)
+    assert next(g_undirected.iter_paths(0, 5)) == [0, 1, 2, 4, 3, 5]
+
+
+def test_n_paths_dag():
+    # a random DAG (edges only from lower to higher vertices)
+    rng = np.random.RandomState(0)
+    adjacency = np.triu(rng.rand(12, 12) < 0.4, k=1).astype(np.int)
+    dag = DirectedGraph(adjacency)
+    assert not dag.has_cycles()
+    n_paths = 0
+    for start in range(12):
+        for end in range(12):
+            paths = dag.find_all_paths(start, end)
+            n_paths += len(paths)
+            assert dag.n_paths(start, end) == len(paths)
+            for max_length in range(4):
+                assert (dag.n_paths(start, end, max_length=max_length) ==
+                        len([p for p in paths if len(p) - 1 <= max_length]))
+    assert n_paths > 100
+
+
 def test_find_path():
     assert (g_directed.find_all_paths(1, 4)[0] == g_directed.find_path(1, 4))
     assert (g_undirected.find_all_paths(0, 5)[1] ==
@@ -235,6 +262,37 @@ def test_tree():
     assert (g_tree.n_leaves == 3)
 
 
+def test_tree_structure_random():
+    # a random tree whose vertices are not numbered in breadth first order
+    rng = np.random.RandomState(0)
+    n_vertices = 200
+    labels = rng.permutation(n_vertices)
+    parents = [labels[rng.randint(i)] for i in range(1, n_vertices)]
+    tree = Tree(csr_matrix(([1] * (n_vertices - 1),
+                            (parents, labels[1:])),
+                           shape=(n_vertices, n_vertices)), labels[0],
+                skip_checks=True)
+
+    def brute_force_depth(v):
+        depth = 0
+        while v != tree.root_vertex:
+            v = tree.parent(v)
+            depth += 1
+        return depth
+
+    depths = [brute_force_depth(v) for v in range(n_vertices)]
+    assert [tree.depth_of_vertex(v) for v in range(n_vertices)] == depths
+    assert tree.maximum_depth == max(depths)
+    for d in range(tree.maximum_depth + 2):
+        assert (tree.vertices_at_depth(d) ==
+                [v for v in range(n_vertices) if depths[v] == d])
+        assert tree.n_vertices_at_depth(d) == depths.count(d)
+    assert tree.leaves == [v for v in range(n_vertices)
+                           if len(tree.adjacency_matrix[v].nonzero()[1]) == 0]
+    assert tree.bfs_order[0] == tree.root_vertex
+    assert np.all(np.diff([depths[v] for v in tree.bfs_order]) >= 0)
+
+
 def test_minimum_spanning_tree():
     adjacency_matrix = np.array([[0, 11, 13, 12],
                                  [11, 0, 0, 14],
@@ -250,6 +308,39 @@ def test_minimum_spanning_tree():
     assert t.predecessors_list == [None, 0, 3, 0]
 
 
+def test_batch_queries():
+    vertices = np.arange(6)
+    assert_allclose(g_directed.n_children(vertices),
+                    [len(g_directed.children(v)) for v in vertices])
+    assert_allclose(g_directed.n_parents(vertices),
+                    [len(g_directed.parents(v)) for v in vertices])
+    assert_allclose(g_undirected.n_neighbours(vertices),
+                    [len(g_undirected.neighbours(v)) for v in vertices])
+    assert_allclose(g_directed.is_edge([2, 3, 5, 1], [4, 1, 0, 0]),
+                    [True, False, False, True])
+
+
+@raises(ValueError)
+def test_batch_queries_invalid_vertex():
+    g_undirected.n_neighbours(np.array([0, 6]))
+
+
+def test_adjacency_index_cached_until_matrix_replaced():
+    g = UndirectedGraph(adj_undirected)
+    assert g._adjacency_index() is g._adjacency_index()
+    g.adjacency_matrix = csr_matrix(np.ones((6, 6)) - np.eye(6))
+    assert g.n_neighbours(5) == 5
+
+
+def test_adjacency_index_cache_not_pickled_or_copied():
+    import pickle
+    g = PointUndirectedGraph(points, adj_undirected)
+    g.n_neighbours(0)
+    for c in [pickle.loads(pickle.dumps(g)), g.copy()]:
+        assert '_adjacency_index_cache' not in c.__dict__
+        assert c.n_neighbours(0) == g.n_neighbours(0)
+
+
 def test_is_edge():
     assert g_directed.is_edge(2, 4)
     assert not g_directed.is_edge(3, 1)
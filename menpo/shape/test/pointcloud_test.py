@@ -107,3 +107,81 @@ def test_pointcloud_bounding_box_3d_fail():
 def test_bounding_box_creation():
     bb = bounding_box([0, 0], [1, 1])
     assert_allclose(bb.points, [[0, 0], [1, 0], [1, 1], [0, 1]])
+
+
+def test_pointcloud_nearest():
+    rng = np.random.RandomState(0)
+    template = PointCloud(rng.rand(200, 3))
+    scan = PointCloud(rng.rand(50, 3))
+    distances = scan.distance_to(template)
+    d, i = template.nearest(scan)
+    assert_allclose(i, distances.argmin(axis=1))
+    assert_allclose(d, distances.min(axis=1))
+    d, i = template.nearest(scan, k=3)
+    assert_allclose(d, np.sort(distances, axis=1)[:, :3])
+
+
+def test_pointcloud_within_radius():
+    rng = np.random.RandomState(1)
+    template = PointCloud(rng.rand(200, 2))
+    scan = PointCloud(rng.rand(20, 2))
+    distances = scan.distance_to(template)
+    neighbourhoods = template.within_radius(scan, 0.1)
+    for n, d in zip(neighbourhoods, distances):
+        assert n == list(np.nonzero(d <= 0.1)[0])
+
+
+def test_pointcloud_spatial_index_invalidated():
+    from menpo.transform import Translation
+    pc = PointCloud(np.random.RandomState(2).rand(30, 2))
+    index = pc.spatial_index()
+    assert pc.spatial_index() is index
+    Translation([5., 5.]).apply_inplace(pc)
+    assert pc.spatial_index() is not index
+    assert_allclose(pc.nearest(PointCloud(pc.points[:3]))[1], [0, 1, 2])
+    index = pc.spatial_index()
+    pc.from_vector_inplace(pc.as_vector() * 2)
+    assert pc.spatial_index() is not index
+    assert '_spatial_index_cache' not in pc.__getstate__()
+
+
+@raises(ValueError)
+def test_pointcloud_nearest_k_too_large():
+    pc = PointCloud(np.zeros([3, 2]))
+    pc.nearest(pc, k=4)
+
+
+def test_light_pointcloud_matches_pointcloud():
+    from menpo.shape import LightPointCloud
+    points = np.random.RandomState(3).rand(10, 2)
+    pc, light = PointCloud(points), LightPointCloud(points)
+    assert not hasattr(light, '__dict__')
+    assert light.n_points == pc.n_points and light.n_dims == pc.n_dims
+    assert_allclose(light.centre(), pc.centre())
+    assert_allclose(light.norm(), pc.norm())
+    assert_allclose(light.range(1), pc.range(1))
+    assert_allclose(light.as_vector(), pc.as_vector())
+    assert_allclose(light.from_vector(pc.as_vector() * 2).points,
+                    pc.points * 2)
+    assert_allclose(light.as_pointcloud().points, pc.points)
+
+
+def test_light_pointcloud_copy_and_transform():
+    import pickle
+    from menpo.shape import LightPointCloud
+    from menpo.transform import Translation, AlignmentSimilarity
+    light = LightPointCloud(np.random.RandomState(4).rand(10, 2))
+    light.landmarks['test'] = PointCloud(light.points[:3])
+    copy = light.copy()
+    assert copy.points is not light.points
+    assert_allclose(copy.landmarks['test'].lms.points, light.points[:3])
+    moved = Translation([1., 2.]).apply(light)
+    assert isinstance(moved, LightPointCloud)
+    assert_allclose(moved.points, light.points + [1., 2.])
+    assert_allclose(moved.landmarks['test'].lms.points,
+                    light.points[:3] + [1., 2.])
+    alignment = AlignmentSimilarity(light, moved)
+    assert_allclose(alignment.aligned_source().points, moved.points)
+    unpickled = pickle.loads(pickle.dumps(light))
+    assert_allclose(unpickled.points, light.points)
+    assert unpickled.has_landmarks
@@ -0,0 +1,77 @@
+import numpy as np
+from numpy.testing import assert_allclose, assert_equal
+from nose.tools import raises
+from menpo.shape import PointCloud, PointCloudSet, mean_pointcloud
+from menpo.transform import (Translation, UniformScale, Rotation,
+                             ThinPlateSplines)
+
+
+def random_set(n=5, n_points=10, n_dims=2, seed=0):
+    rng = np.random.RandomState(seed)
+    return PointCloudSet(rng.randn(n, n_points, n_dims))
+
+
+def test_pointcloudset_iteration_is_a_view():
+    pc_set = random_set()
+    pcs = list(pc_set)
+    assert_equal(len(pcs), 5)
+    pcs[2].points[0, 0] = 100
+    assert_equal(pc_set.points[2, 0, 0], 100)
+
+
+def test_pointcloudset_init_from_pointclouds():
+    pc_set = random_set()
+    rebuilt = PointCloudSet.init_from_pointclouds(list(pc_set))
+    assert_equal(rebuilt.points, pc_set.points)
+
+
+def test_pointcloudset_init_from_pointclouds_keeps_dtype():
+    pcs = [PointCloud(np.zeros([3, 2], dtype=np.float32)) for _ in range(2)]
+    assert PointCloudSet.init_from_pointclouds(pcs).points.dtype == np.float32
+
+
+@raises(ValueError)
+def test_pointcloudset_init_from_pointclouds_different_n_points():
+    PointCloudSet.init_from_pointclouds([PointCloud(np.zeros([3, 2])),
+                                         PointCloud(np.zeros([4, 2]))])
+
+
+def test_pointcloudset_group_operations():
+    pc_set = random_set()
+    assert_allclose(pc_set.mean().points,
+                    mean_pointcloud(list(pc_set)).points)
+    assert_allclose(mean_pointcloud(pc_set).points, pc_set.mean().points)
+    min_b, max_b = pc_set.bounds(boundary=1)
+    for i, pc in enumerate(pc_set):
+        assert_allclose(pc_set.centre()[i], pc.centre())
+        assert_allclose(pc_set.norm()[i], pc.norm())
+        assert_allclose(min_b[i], pc.bounds(boundary=1)[0])
+        assert_allclose(max_b[i], pc.bounds(boundary=1)[1])
+        assert_allclose(pc_set.as_matrix()[i], pc.as_vector())
+
+
+def test_pointcloudset_apply_transforms():
+    pc_set = random_set()
+    transforms = [Translation([i, -i]).compose_before(UniformScale(i + 1, 2))
+                  .compose_before(Rotation.init_from_2d_ccw_angle(10 * i))
+                  for i in range(5)]
+    transformed = pc_set.apply(transforms)
+    for t, pc, t_pc in zip(transforms, pc_set, transformed):
+        assert_allclose(t_pc.points, t.apply(pc).points)
+    # non-homogeneous transforms are applied one by one
+    src = PointCloud(np.array([[0., 0.], [1., 0.], [0., 1.], [1., 1.]]))
+    tps = ThinPlateSplines(src, PointCloud(src.points * 2))
+    transformed = pc_set.apply([tps] * 5)
+    assert_allclose(transformed[3].points, tps.apply(pc_set[3]).points)
+
+
+def test_pointcloudset_apply_same_transform():
+    pc_set = random_set()
+    translated = Translation([1., 2.]).apply(pc_set)
+    assert isinstance(translated, PointCloudSet)
+    assert_allclose(translated.points, pc_set.points + [1., 2.])
+
+
+@raises(ValueError)
+def test_pointcloudset_apply_wrong_number_of_transforms():
+    random_set().apply([Translation([1., 2.])])
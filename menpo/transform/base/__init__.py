@@ -242,6 +242,7 @@ class Transformable(Copyable):
 
     This allows for the object to define how it should transform itself.
     """
+    __slots__ = ()
 
     def _transform_inplace(self, transform):
         r"""
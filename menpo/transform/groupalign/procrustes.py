@@ -1,13 +1,13 @@
+from multiprocessing.pool import ThreadPool
 import numpy as np
 
-from ..homogeneous import AlignmentSimilarity
+from ..homogeneous import (AlignmentSimilarity, apply_h_matrices,
+                           h_matrices_from_transforms,
+                           procrustes_alignment_h_matrices)
 from .base import MultipleAlignment
 
 
-avoid_circular = None      # to avoid circular imports
-mean_pointcloud = None     # to avoid circular imports
 PointCloud = None          # to avoid circular imports
-scale_about_centre = None  # to avoid circular imports
 
 
 class GeneralizedProcrustesAnalysis(MultipleAlignment):
@@ -17,6 +17,11 @@ class GeneralizedProcrustesAnalysis(MultipleAlignment):
     After construction, the :map:`AlignmentSimilarity` transforms used to map
     each `source` optimally to the `target` can be found at `transforms`.
 
+    All the sources are held as a single ``(n_sources, n_points, n_dims)``
+    array, so that every iteration solves all the similarity alignments at
+    once with a batched SVD. The sources can be split into blocks that are
+    aligned concurrently across a pool of threads.
+
     Parameters
     ----------
     sources : `list` of :map:`PointCloud`
@@ -24,55 +29,83 @@ class GeneralizedProcrustesAnalysis(MultipleAlignment):
     target : :map:`PointCloud`, optional
         The target :map:`PointCloud` to align each source to.
         If ``None``, then the mean of the sources is used.
+    n_threads : `int`, optional
+        The number of threads across which the alignments of each iteration
+        are computed.
 
     Raises
     ------
     ValueError
         Need at least two sources to align
     """
-    def __init__(self, sources, target=None):
+    def __init__(self, sources, target=None, n_threads=1):
+        global PointCloud
+        if PointCloud is None:
+            from menpo.shape import PointCloud
         super(GeneralizedProcrustesAnalysis, self).__init__(sources,
                                                             target=target)
         initial_target = self.target
-        self.transforms = [AlignmentSimilarity(source, self.target)
-                           for source in self.sources]
+        self.n_threads = n_threads
         self.initial_target_scale = self.target.norm()
         self.n_iterations = 1
         self.max_iterations = 100
-        self.converged = self._recursive_procrustes()
+        h_matrices, self.converged = self._procrustes(
+            np.array([s.points for s in self.sources]))
+        self.transforms = [
+            AlignmentSimilarity._init_with_h_matrix(source, self.target, h)
+            for source, h in zip(self.sources, h_matrices)]
         if target is not None:
             self.target = initial_target
 
-    def _recursive_procrustes(self):
+    def _procrustes(self, sources):
         r"""
-        Recursively calculates a procrustes alignment.
+        Iteratively calculates a procrustes alignment of the stack of
+        ``sources``, updating the target to the rescaled mean of the aligned
+        sources until it converges.
+
+        Returns the homogeneous matrices of the alignments of the sources to
+        the final target, and whether the alignment converged.
         """
-        global mean_pointcloud, PointCloud, scale_about_centre, avoid_circular
-        if avoid_circular is None:
-            from menpo.shape import mean_pointcloud, PointCloud
-            from ..compositions import scale_about_centre
-            avoid_circular = True
-
-        if self.n_iterations > self.max_iterations:
-            return False
-        new_tgt = mean_pointcloud([PointCloud(t.aligned_source().points,
-                                              copy=False)
-                                   for t in self.transforms])
-        # rescale the new_target to be the same size as the original about
-        # it's centre
-        rescale = scale_about_centre(new_tgt,
-                                     self.initial_target_scale / new_tgt.norm())
-        rescale.apply_inplace(new_tgt)
-        # check to see if we have converged yet
-        delta_target = np.linalg.norm(self.target.points - new_tgt.points)
-        if delta_target < 1e-6:
-            return True
+        if self.n_threads > 1:
+            pool = ThreadPool(self.n_threads)
+            blocks = np.array_split(sources, self.n_threads)
         else:
-            self.n_iterations += 1
-            for t in self.transforms:
-                t.set_target(new_tgt)
-            self.target = new_tgt
-            return self._recursive_procrustes()
+            pool, blocks = None, [sources]
+
+        def align(target):
+            # align each block of sources to the target, returning the
+            # alignments and the sum of the aligned sources of each block
+            def align_block(block):
+                h = procrustes_alignment_h_matrices(block, target)
+                return h, apply_h_matrices(h, block).sum(axis=0)
+            results = (pool.map(align_block, blocks) if pool is not None
+                       else [align_block(b) for b in blocks])
+            h_matrices = np.concatenate([r[0] for r in results])
+            return h_matrices, sum(r[1] for r in results)
+
+        try:
+            converged = False
+            h_matrices, aligned_sum = align(self.target.points)
+            while self.n_iterations <= self.max_iterations:
+                new_tgt = aligned_sum / self.n_sources
+                # rescale the new_target to be the same size as the original
+                # about it's centre
+                centre = np.mean(new_tgt, axis=0)
+                new_tgt -= centre
+                new_tgt *= self.initial_target_scale / np.linalg.norm(new_tgt)
+                new_tgt += centre
+                # check to see if we have converged yet
+                delta_target = np.linalg.norm(self.target.points - new_tgt)
+                if delta_target < 1e-6:
+                    converged = True
+                    break
+                self.n_iterations += 1
+                self.target = PointCloud(new_tgt, copy=False)
+                h_matrices, aligned_sum = align(new_tgt)
+        finally:
+            if pool is not None:
+                pool.close()
+        return h_matrices, converged
 
     def mean_aligned_shape(self):
         r"""
@@ -90,8 +123,12 @@ class GeneralizedProcrustesAnalysis(MultipleAlignment):
 
         :type: `float`
         """
-        return sum([t.alignment_error() for t in
-                    self.transforms])/self.n_sources
+        h_matrices = h_matrices_from_transforms(self.transforms)
+        sources = np.array([t.source.points for t in self.transforms])
+        targets = np.array([t.target.points for t in self.transforms])
+        errors = apply_h_matrices(h_matrices, sources) - targets
+        errors = np.sqrt(np.sum(errors ** 2, axis=(1, 2)))
+        return np.sum(errors) / self.n_sources
 
     def __str__(self):
         if self.converged:
@@ -1,6 +1,12 @@
-from .base import Homogeneous
-from .affine import Affine, AlignmentAffine
-from .similarity import Similarity, AlignmentSimilarity
-from .rotation import Rotation, AlignmentRotation
+from .base import (Homogeneous, apply_h_matrices, compose_h_matrices_before,
+                   pseudoinverse_h_matrices, h_matrices_from_transforms,
+                   transforms_from_h_matrices)
+from .affine import (Affine, AlignmentAffine, affine_alignment_h_matrices,
+                     alignment_affines)
+from .similarity import (Similarity, AlignmentSimilarity,
+                         procrustes_alignment_h_matrices,
+                         alignment_similarities)
+from .rotation import (Rotation, AlignmentRotation, optimal_rotation_matrix,
+                       optimal_rotation_matrices)
 from .translation import Translation, AlignmentTranslation
 from .scale import Scale, NonUniformScale, UniformScale, AlignmentUniformScale
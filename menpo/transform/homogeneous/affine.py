@@ -1,6 +1,7 @@
 import numpy as np
 
-from .base import Homogeneous, HomogFamilyAlignment
+from .base import (Homogeneous, HomogFamilyAlignment, _pointclouds_as_stack,
+                   _alignments_from_h_matrices)
 from functools import reduce
 
 
@@ -336,6 +337,60 @@ class AlignmentAffine(HomogFamilyAlignment, Affine):
         return Affine(self.h_matrix, skip_checks=True)
 
 
+def affine_alignment_h_matrices(sources, targets):
+    r"""
+    Vectorized version of the :map:`AlignmentAffine` optimisation that
+    returns the homogeneous matrices of the affine transforms that align many
+    `sources` to `targets` at once, by solving a stack of normal equations.
+
+    Parameters
+    ----------
+    sources : ``(n_shapes, n_points, n_dims)`` `ndarray`
+        The stack of source points.
+    targets : ``(n_shapes, n_points, n_dims)`` `ndarray`
+        The stack of target points. A single ``(n_points, n_dims)`` target is
+        broadcast to every source.
+
+    Returns
+    -------
+    h_matrices : ``(n_shapes, n_dims + 1, n_dims + 1)`` `ndarray`
+        The homogeneous matrix of the affine transform that optimally aligns
+        each source to its target.
+    """
+    def h_points(points):
+        return np.concatenate([points, np.ones(points.shape[:-1] + (1,))],
+                              axis=-1)
+    a, b = h_points(sources), h_points(targets)
+    # (a a') M' = a b' for every source, as for AlignmentAffine
+    aa = np.einsum('...pi,...pj->...ij', a, a)
+    ab = np.einsum('...pi,...pj->...ij', a, b)
+    return np.swapaxes(np.linalg.solve(aa, ab), -1, -2)
+
+
+def alignment_affines(sources, targets):
+    r"""
+    Constructs an :map:`AlignmentAffine` for every `source`, solving all the
+    alignments at once with :func:`affine_alignment_h_matrices`.
+
+    Parameters
+    ----------
+    sources : `list` of :map:`PointCloud`
+        The source pointclouds used in the alignments.
+    targets : `list` of :map:`PointCloud` or :map:`PointCloud`
+        The target pointcloud of each alignment. A single :map:`PointCloud`
+        is used as the target of every alignment.
+
+    Returns
+    -------
+    alignments : `list` of :map:`AlignmentAffine`
+        The optimal affine alignment of each source to its target.
+    """
+    h_matrices = affine_alignment_h_matrices(_pointclouds_as_stack(sources),
+                                             _pointclouds_as_stack(targets))
+    return _alignments_from_h_matrices(AlignmentAffine, sources, targets,
+                                       h_matrices)
+
+
 class DiscreteAffine(object):
     r"""
     A discrete Affine transform operation (such as a :meth:`Scale`,
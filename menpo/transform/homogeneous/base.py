@@ -26,6 +26,32 @@ class HomogFamilyAlignment(Alignment):
         """
         raise NotImplementedError()
 
+    @classmethod
+    def _init_with_h_matrix(cls, source, target, h_matrix):
+        r"""
+        Build an alignment between `source` and `target` from an already
+        optimal ``h_matrix``, skipping the alignment optimisation. The
+        ``h_matrix`` is neither copied nor checked.
+
+        Parameters
+        ----------
+        source : :map:`PointCloud`
+            The source pointcloud instance used in the alignment
+        target : :map:`PointCloud`
+            The target pointcloud instance used in the alignment
+        h_matrix : ``(n_dims + 1, n_dims + 1)`` `ndarray`
+            The homogeneous matrix that optimally aligns `source` to `target`.
+
+        Returns
+        -------
+        transform : ``cls``
+            The alignment.
+        """
+        new = cls.__new__(cls)
+        HomogFamilyAlignment.__init__(new, source, target)
+        new._h_matrix = h_matrix
+        return new
+
     def copy(self):
         r"""
         Generate an efficient copy of this :map:`HomogFamilyAlignment`.
@@ -429,5 +455,153 @@ class Homogeneous(ComposableTransform, Vectorizable, VComposable, VInvertible):
     def _h_matrix_pseudoinverse(self):
         return np.linalg.inv(self.h_matrix)
 
+
+def _is_affine_stack(h_matrices):
+    # True iff every matrix in the stack has a bottom row of [0, ..., 0, 1]
+    bottom = h_matrices[..., -1, :]
+    return np.all(bottom[..., :-1] == 0) and np.all(bottom[..., -1] == 1)
+
+
+def apply_h_matrices(h_matrices, points):
+    r"""
+    Applies a stack of homogeneous matrices to a stack of point sets in a
+    single vectorized operation.
+
+    The ``i``'th matrix is applied to the ``i``'th point set. Standard
+    broadcasting rules apply, so a single matrix can be applied to many point
+    sets, or many matrices to a single point set.
+
+    Parameters
+    ----------
+    h_matrices : ``(n_transforms, n_dims + 1, n_dims + 1)`` `ndarray`
+        The stack of homogeneous matrices.
+    points : ``(n_shapes, n_points, n_dims)`` `ndarray`
+        The stack of point sets to transform.
+
+    Returns
+    -------
+    transformed : ``(n, n_points, n_dims_output)`` `ndarray`
+        The transformed point sets.
+    """
+    h_matrices = np.asarray(h_matrices)
+    points = np.asarray(points)
+    if _is_affine_stack(h_matrices):
+        # no need to normalize by the homogeneous coordinate
+        y = np.einsum('...ij,...kj->...ki', h_matrices[..., :-1, :-1], points)
+        y += h_matrices[..., None, :-1, -1]
+        return y
+    y = np.einsum('...ij,...kj->...ki', h_matrices[..., :-1], points)
+    y += h_matrices[..., None, :, -1]
+    return y[..., :-1] / y[..., -1:]
+
+
+def compose_h_matrices_before(h_matrices, h_matrices_after):
+    r"""
+    Composes a stack of homogeneous matrices **before** another stack, such
+    that for each ``i`` the result is the homogeneous matrix of::
+
+        Homogeneous(h_matrices[i]).compose_before(
+            Homogeneous(h_matrices_after[i]))
+
+    Parameters
+    ----------
+    h_matrices : ``(n_transforms, n_dims + 1, n_dims + 1)`` `ndarray`
+        The stack of homogeneous matrices to be applied first.
+    h_matrices_after : ``(n_transforms, n_dims + 1, n_dims + 1)`` `ndarray`
+        The stack of homogeneous matrices to be applied **after**
+        ``h_matrices``.
+
+    Returns
+    -------
+    composed : ``(n_transforms, n_dims + 1, n_dims + 1)`` `ndarray`
+        The stack of composed homogeneous matrices.
+    """
+    return np.einsum('...ij,...jk->...ik', h_matrices_after, h_matrices)
+
+
+def pseudoinverse_h_matrices(h_matrices):
+    r"""
+    The pseudoinverse of every homogeneous matrix in a stack. As for
+    :map:`Homogeneous`, the pseudoinverse is the true inverse.
+
+    Parameters
+    ----------
+    h_matrices : ``(n_transforms, n_dims + 1, n_dims + 1)`` `ndarray`
+        The stack of homogeneous matrices.
+
+    Returns
+    -------
+    inverted : ``(n_transforms, n_dims + 1, n_dims + 1)`` `ndarray`
+        The stack of inverted homogeneous matrices.
+    """
+    return np.linalg.inv(h_matrices)
+
+
+def h_matrices_from_transforms(transforms):
+    r"""
+    Stack the homogeneous matrices of a list of :map:`Homogeneous` transforms.
+
+    Parameters
+    ----------
+    transforms : `list` of :map:`Homogeneous`
+        The transforms. All must have the same dimensionality.
+
+    Returns
+    -------
+    h_matrices : ``(n_transforms, n_dims + 1, n_dims + 1)`` `ndarray`
+        The stack of homogeneous matrices.
+    """
+    return np.array([t.h_matrix for t in transforms])
+
+
+def transforms_from_h_matrices(h_matrices, transform_cls=None):
+    r"""
+    Build a list of transforms from a stack of homogeneous matrices. Each
+    transform holds a view onto the stack (no copies are made).
+
+    Parameters
+    ----------
+    h_matrices : ``(n_transforms, n_dims + 1, n_dims + 1)`` `ndarray`
+        The stack of homogeneous matrices.
+    transform_cls : `type`, optional
+        The :map:`Homogeneous` subclass to build, which must be constructable
+        from an ``h_matrix`` (e.g. :map:`Affine` or :map:`Similarity`). The
+        matrices are not checked, so must be valid for this class. If
+        ``None``, :map:`Homogeneous` is used.
+
+    Returns
+    -------
+    transforms : `list` of ``transform_cls``
+        A transform for every matrix in the stack.
+    """
+    if transform_cls is None:
+        transform_cls = Homogeneous
+    return [transform_cls(h, copy=False, skip_checks=True)
+            for h in h_matrices]
+
+
+def _pointclouds_as_stack(pointclouds):
+    r"""
+    The points of a `list` of :map:`PointCloud` as a single
+    ``(n_shapes, n_points, n_dims)`` `ndarray`. A single :map:`PointCloud` is
+    returned as a ``(n_points, n_dims)`` `ndarray`, to be broadcast.
+    """
+    if hasattr(pointclouds, 'points'):
+        return pointclouds.points
+    return np.array([pc.points for pc in pointclouds])
+
+
+def _alignments_from_h_matrices(alignment_cls, sources, targets, h_matrices):
+    r"""
+    Build a `list` of ``alignment_cls`` from the stack of already optimal
+    ``h_matrices`` aligning each of the ``sources`` to the ``targets`` (a
+    `list` or a single :map:`PointCloud` shared by all the alignments).
+    """
+    if hasattr(targets, 'points'):
+        targets = [targets] * len(sources)
+    return [alignment_cls._init_with_h_matrix(s, t, h)
+            for s, t, h in zip(sources, targets, h_matrices)]
+
+
 from .affine import Affine
 from .similarity import Similarity
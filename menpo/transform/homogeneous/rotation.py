@@ -27,6 +27,30 @@ def optimal_rotation_matrix(source, target):
     return np.dot(U, Vt)
 
 
+def optimal_rotation_matrices(sources, targets):
+    r"""
+    Vectorized version of :func:`optimal_rotation_matrix` that finds the
+    optimal rotation between many `sources` and `targets` at once by
+    performing a batched SVD on the stack of correlation matrices.
+
+    Parameters
+    ----------
+    sources : ``(n_shapes, n_points, n_dims)`` `ndarray`
+        The stack of source points to be aligned.
+    targets : ``(n_shapes, n_points, n_dims)`` `ndarray`
+        The stack of target points to be aligned. A single
+        ``(n_points, n_dims)`` target is broadcast to every source.
+
+    Returns
+    -------
+    rotations : ``(n_shapes, n_dims, n_dims)`` `ndarray`
+        The optimal square rotation matrix for every source.
+    """
+    correlations = np.einsum('...pi,...pj->...ij', targets, sources)
+    U, D, Vt = np.linalg.svd(correlations)
+    return np.einsum('...ij,...jk->...ik', U, Vt)
+
+
 # TODO build rotations about axis, euler angles etc
 # see http://en.wikipedia.org/wiki/Rotation_matrix#Rotation_matrix_from_axis_and_angle
 # for details
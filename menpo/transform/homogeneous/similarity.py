@@ -1,6 +1,7 @@
 import numpy as np
 
-from .base import HomogFamilyAlignment
+from .base import (HomogFamilyAlignment, _pointclouds_as_stack,
+                   _alignments_from_h_matrices)
 from .affine import Affine
 from functools import reduce
 
@@ -284,3 +285,78 @@ def procrustes_alignment(source, target, rotation=True):
     # finally, translate the target back
     p.compose_before_inplace(tgt_t.pseudoinverse())
     return p
+
+
+def procrustes_alignment_h_matrices(sources, targets, rotation=True):
+    r"""
+    Vectorized version of :func:`procrustes_alignment` that returns the
+    homogeneous matrices of the similarity transforms that align many
+    `sources` to `targets` at once.
+
+    Parameters
+    ----------
+    sources : ``(n_shapes, n_points, n_dims)`` `ndarray`
+        The stack of source points.
+    targets : ``(n_shapes, n_points, n_dims)`` `ndarray`
+        The stack of target points. A single ``(n_points, n_dims)`` target is
+        broadcast to every source.
+    rotation : `bool`, optional
+        If ``True``, rotation is allowed in the Procrustes calculation. If
+        ``False``, only scale and translation effects are used.
+
+    Returns
+    -------
+    h_matrices : ``(n_shapes, n_dims + 1, n_dims + 1)`` `ndarray`
+        The homogeneous matrix of the similarity transform that optimally
+        aligns each source to its target.
+    """
+    n_dims = sources.shape[-1]
+    src_centre = np.mean(sources, axis=-2)
+    tgt_centre = np.mean(targets, axis=-2)
+    src = sources - src_centre[..., None, :]
+    tgt = targets - tgt_centre[..., None, :]
+    # a scale that matches the norm of each source to the norm of its target
+    scale = (np.sqrt(np.sum(tgt ** 2, axis=(-2, -1))) /
+             np.sqrt(np.sum(src ** 2, axis=(-2, -1))))
+    if rotation:
+        from .rotation import optimal_rotation_matrices
+        # the (positive) scale does not change the optimal rotation
+        linear = optimal_rotation_matrices(src, tgt)
+    else:
+        linear = np.eye(n_dims)
+    linear = linear * scale[..., None, None]
+    h_matrices = np.zeros(linear.shape[:-2] + (n_dims + 1, n_dims + 1))
+    h_matrices[..., :n_dims, :n_dims] = linear
+    # translate the centre of the source onto the centre of the target
+    h_matrices[..., :n_dims, n_dims] = tgt_centre - np.einsum(
+        '...ij,...j->...i', linear, src_centre)
+    h_matrices[..., n_dims, n_dims] = 1
+    return h_matrices
+
+
+def alignment_similarities(sources, targets, rotation=True):
+    r"""
+    Constructs an :map:`AlignmentSimilarity` for every `source`, solving all
+    the alignments at once with :func:`procrustes_alignment_h_matrices`.
+
+    Parameters
+    ----------
+    sources : `list` of :map:`PointCloud`
+        The source pointclouds used in the alignments.
+    targets : `list` of :map:`PointCloud` or :map:`PointCloud`
+        The target pointcloud of each alignment. A single :map:`PointCloud`
+        is used as the target of every alignment.
+    rotation : `bool`, optional
+        If ``False``, the rotation component of the similarity transforms is
+        not inferred.
+
+    Returns
+    -------
+    alignments : `list` of :map:`AlignmentSimilarity`
+        The optimal similarity alignment of each source to its target.
+    """
+    h_matrices = procrustes_alignment_h_matrices(
+        _pointclouds_as_stack(sources), _pointclouds_as_stack(targets),
+        rotation=rotation)
+    return _alignments_from_h_matrices(AlignmentSimilarity, sources, targets,
+                                       h_matrices)
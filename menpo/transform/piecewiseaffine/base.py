@@ -205,19 +205,30 @@ class AbstractPWA(Alignment, Transform, Invertible):
     target : :map:`PointCloud`
         The target points. Note that the trilist is entirely decided by the
         source.
+    configuration : `hashable`, optional
+        The landmark configuration of the source points. If provided (and
+        the source is not a TriMesh), the template triangle list registered
+        for it with :func:`register_template_trilist` is used instead of a
+        Delaunay triangulation.
 
     Raises
     ------
     ValueError
         Source and target must both be 2D.
+    ValueError
+        If no template triangle list is registered for the `configuration`
+        or it is registered for a different number of points.
     TriangleContainmentError
         All points to apply must be contained in a source triangle. Check
         `error.points_outside_source_domain` to handle this case.
     """
-    def __init__(self, source, target):
-        from menpo.shape import TriMesh  # to avoid circular import
+    def __init__(self, source, target, configuration=None):
+        # to avoid circular import
+        from menpo.shape import TriMesh, template_trilist
         if not isinstance(source, TriMesh):
-            source = TriMesh(source.points)
+            trilist = (None if configuration is None else
+                       template_trilist(configuration, source.n_points))
+            source = TriMesh(source.points, trilist=trilist)
         Alignment.__init__(self, source, target)
         if self.n_dims != 2:
             raise ValueError("source and target must be 2 "
@@ -375,8 +386,9 @@ class AbstractPWA(Alignment, Transform, Invertible):
 
 class PythonPWA(AbstractPWA):
 
-    def __init__(self, source, target):
-        super(PythonPWA, self).__init__(source, target)
+    def __init__(self, source, target, configuration=None):
+        super(PythonPWA, self).__init__(source, target,
+                                        configuration=configuration)
         si, sij, sik = barycentric_vectors(self.source.points, self.trilist)
         self.s, self.sij, self.sik = si, sij, sik
 
@@ -386,8 +398,9 @@ class PythonPWA(AbstractPWA):
 
 class CachedPWA(PythonPWA):
 
-    def __init__(self, source, target):
-        super(CachedPWA, self).__init__(source, target)
+    def __init__(self, source, target, configuration=None):
+        super(CachedPWA, self).__init__(source, target,
+                                        configuration=configuration)
         self._applied_points, self._iab = None, None
 
     def index_alpha_beta(self, points):
@@ -416,18 +429,27 @@ class CythonPWA(AbstractPWA):
     target : :class:`PointCloud`
         The target points. Note that the trilist is entirely decided by
         the source.
+    configuration : `hashable`, optional
+        The landmark configuration of the source points. If provided (and
+        the source is not a TriMesh), the template triangle list registered
+        for it with :func:`register_template_trilist` is used instead of a
+        Delaunay triangulation.
 
     Raises
     ------
     ValueError
         Source and target must both be 2D.
+    ValueError
+        If no template triangle list is registered for the `configuration`
+        or it is registered for a different number of points.
 
     TriangleContainmentError
         All points to apply must be contained in a source triangle. Check
         `error.points_outside_source_domain` to handle this case.
     """
-    def __init__(self, source, target):
-        super(CythonPWA, self).__init__(source, target)
+    def __init__(self, source, target, configuration=None):
+        super(CythonPWA, self).__init__(source, target,
+                                        configuration=configuration)
         # make sure the source and target satisfy the c requirements
         source_c = np.require(self.source.points, dtype=np.float64,
                               requirements=['C'])
@@ -3,6 +3,41 @@ from scipy.spatial.distance import cdist
 from .base import Transform
 
 
+# The default upper bound (in bytes) on the size of the temporary kernel
+# blocks that are allocated by RadialBasisFunction.apply_dot
+DEFAULT_RBF_MAX_MEMORY = 2 ** 27
+
+
+def rbf_block_size(n_centres, max_memory=None, n_buffers=2, itemsize=8):
+    r"""
+    The number of points that can be evaluated against ``n_centres`` centres
+    at a time whilst keeping the temporary kernel blocks within a memory
+    budget.
+
+    Parameters
+    ----------
+    n_centres : `int`
+        The number of centres of the basis.
+    max_memory : `int`, optional
+        The memory budget in bytes. If ``None``,
+        ``DEFAULT_RBF_MAX_MEMORY`` is used.
+    n_buffers : `int`, optional
+        The number of ``(block_size, n_centres)`` temporaries that are
+        alive at once during the kernel evaluation.
+    itemsize : `int`, optional
+        The number of bytes per element of the temporaries.
+
+    Returns
+    -------
+    block_size : `int`
+        The number of points per block (always at least ``1``).
+    """
+    if max_memory is None:
+        max_memory = DEFAULT_RBF_MAX_MEMORY
+    bytes_per_point = max(n_centres, 1) * n_buffers * itemsize
+    return max(int(max_memory // bytes_per_point), 1)
+
+
 class RadialBasisFunction(Transform):
     r"""
     Radial Basis Functions are a class of transform that is used by
@@ -47,6 +82,67 @@ class RadialBasisFunction(Transform):
         """
         return self.n_centres
 
+    def _apply(self, x, **kwargs):
+        return self._kernel(cdist(x, self.c, 'sqeuclidean'))
+
+    def _kernel(self, r2):
+        r"""
+        Evaluate the basis function on a block of squared distances. The
+        evaluation may be performed inplace, reusing the memory of ``r2``.
+
+        Parameters
+        ----------
+        r2 : ``(n_points, n_centres)`` `ndarray`
+            The squared euclidean distances between a set of points and the
+            centres. May be destroyed by this call.
+
+        Returns
+        -------
+        u : ``(n_points, n_centres)`` `ndarray`
+            The basis function applied to each distance.
+        """
+        raise NotImplementedError()
+
+    def apply_dot(self, x, weights, max_memory=None):
+        r"""
+        Computes ``self.apply(x).dot(weights)`` without materialising the full
+        ``(n_points, n_centres)`` kernel matrix.
+
+        The points are streamed through the kernel in blocks, such that the
+        distance computation, kernel evaluation and dot product are performed
+        a block at a time. The size of each block is chosen so that the
+        temporaries stay within ``max_memory`` bytes.
+
+        Parameters
+        ----------
+        x : ``(n_points, n_dims)`` `ndarray`
+            Set of points to apply the basis to.
+        weights : ``(n_centres, k)`` `ndarray`
+            The weighting of each centre.
+        max_memory : `int`, optional
+            The upper bound (in bytes) on the memory used by the kernel
+            temporaries. If ``None``, ``DEFAULT_RBF_MAX_MEMORY`` is used.
+
+        Returns
+        -------
+        f : ``(n_points, k)`` `ndarray`
+            The weighted sum of the basis functions at each point.
+        """
+        if weights.shape[0] != self.n_centres:
+            raise ValueError('weights must have one row per centre - '
+                             '{} != {}'.format(weights.shape[0],
+                                               self.n_centres))
+        n_points = x.shape[0]
+        block_size = rbf_block_size(self.n_centres, max_memory=max_memory)
+        if block_size >= n_points:
+            return self._apply(x).dot(weights)
+        f = np.empty((n_points,) + weights.shape[1:],
+                     dtype=np.result_type(x.dtype, weights.dtype, np.float))
+        for i in range(0, n_points, block_size):
+            j = i + block_size
+            np.dot(self._apply(x[i:j]), weights, out=f[i:j])
+        return f
+
 
 class R2LogR2RBF(RadialBasisFunction):
     r"""
@@ -67,32 +163,30 @@ class R2LogR2RBF(RadialBasisFunction):
     def __init__(self, c):
         super(R2LogR2RBF, self).__init__(c)
 
-    def _apply(self, x, **kwargs):
-        """
-        Apply the basis function.
+    def _kernel(self, r2):
+        r"""
+        Apply the basis function inplace on a block of squared distances.
 
         .. note::
 
-            :math:`r^2 \log{r^2} === r^2 2 \log{r}`
+            :math:`r^2 \log{r^2}` is evaluated directly on the squared
+            distances, avoiding the square root.
 
         Parameters
         ----------
-        x : ``(n_points, n_dims)`` `ndarray`
-            Set of points to apply the basis to.
+        r2 : ``(n_points, n_centres)`` `ndarray`
+            The squared distances, :math:`\lVert x - c \rVert^2`. Destroyed
+            by this call.
 
         Returns
         -------
         u : ``(n_points, n_centres)`` `ndarray`
-            The basis function applied to each distance,
-            :math:`\lVert x - c \rVert`.
+            The basis function applied to each distance.
         """
-        euclidean_distance = cdist(x, self.c)
-        mask = euclidean_distance == 0
-        with np.errstate(divide='ignore', invalid='ignore'):
-            u = (euclidean_distance ** 2 *
-                 (2 * np.log(euclidean_distance)))
-        # reset singularities to 0
-        u[mask] = 0
+        # log(1) == 0, so the singularities are reset to 0
+        r2[r2 == 0] = 1
+        u = np.log(r2)
+        u *= r2
         return u
 
 
@@ -115,25 +209,29 @@ class R2LogRRBF(RadialBasisFunction):
     def __init__(self, c):
         super(R2LogRRBF, self).__init__(c)
 
-    def _apply(self, points, **kwargs):
-        """
-        Apply the basis function :math:`r^2 \log{r}`.
+    def _kernel(self, r2):
+        r"""
+        Apply the basis function :math:`r^2 \log{r}` inplace on a block of
+        squared distances.
+
+        .. note::
+
+            :math:`r^2 \log{r} === \frac{1}{2} r^2 \log{r^2}`
 
         Parameters
         ----------
-        points : ``(n_points, n_dims)`` `ndarray`
-            Set of points to apply the basis to.
+        r2 : ``(n_points, n_centres)`` `ndarray`
+            The squared distances, :math:`\lVert x - c \rVert^2`. Destroyed
+            by this call.
 
         Returns
         -------
         u : ``(n_points, n_centres)`` `ndarray`
-            The basis function applied to each distance,
-            :math:`\lVert points - c \rVert`.
+            The basis function applied to each distance.
         """
-        euclidean_distance = cdist(points, self.c)
-        mask = euclidean_distance == 0
-        with np.errstate(divide='ignore', invalid='ignore'):
-            u = euclidean_distance ** 2 * np.log(euclidean_distance)
-        # reset singularities to 0
-        u[mask] = 0
+        # log(1) == 0, so the singularities are reset to 0
+        r2[r2 == 0] = 1
+        u = np.log(r2)
+        u *= r2
+        u *= 0.5
         return u
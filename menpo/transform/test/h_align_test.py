@@ -5,7 +5,11 @@ from menpo.transform import (Affine, AlignmentAffine,
                              Similarity, AlignmentSimilarity,
                              Rotation, AlignmentRotation,
                              Translation, AlignmentTranslation,
-                             UniformScale, AlignmentUniformScale)
+                             UniformScale, AlignmentUniformScale,
+                             procrustes_alignment_h_matrices,
+                             affine_alignment_h_matrices,
+                             alignment_similarities, alignment_affines,
+                             optimal_rotation_matrices)
 
 # TODO check composition works correctly on all alignment methods
 
@@ -360,3 +364,75 @@ def test_align_2d_translation_from_vector():
     # check the new estimate has the source and target correct
     assert_allclose(new_est.source.points, source.points)
     assert_allclose(new_est.target.points, target.points)
+
+
+def test_procrustes_alignment_h_matrices():
+    sources = np.random.randn(4, 6, 2)
+    target = np.random.randn(6, 2)
+    h_matrices = procrustes_alignment_h_matrices(sources, target)
+    for s, h in zip(sources, h_matrices):
+        expected = AlignmentSimilarity(PointCloud(s), PointCloud(target))
+        assert_allclose(h, expected.h_matrix)
+
+
+def test_procrustes_alignment_h_matrices_no_rotation():
+    sources = np.random.randn(3, 6, 2)
+    targets = np.random.randn(3, 6, 2)
+    h_matrices = procrustes_alignment_h_matrices(sources, targets,
+                                                 rotation=False)
+    for s, t, h in zip(sources, targets, h_matrices):
+        expected = AlignmentSimilarity(PointCloud(s), PointCloud(t),
+                                       rotation=False)
+        assert_allclose(h, expected.h_matrix)
+
+
+def test_affine_alignment_h_matrices():
+    sources = np.random.randn(4, 6, 2)
+    targets = np.random.randn(4, 6, 2)
+    h_matrices = affine_alignment_h_matrices(sources, targets)
+    for s, t, h in zip(sources, targets, h_matrices):
+        expected = AlignmentAffine(PointCloud(s), PointCloud(t))
+        assert_allclose(h, expected.h_matrix, atol=1e-12)
+
+
+def test_affine_alignment_h_matrices_3d_shared_target():
+    sources = np.random.randn(3, 8, 3)
+    target = np.random.randn(8, 3)
+    h_matrices = affine_alignment_h_matrices(sources, target)
+    for s, h in zip(sources, h_matrices):
+        expected = AlignmentAffine(PointCloud(s), PointCloud(target))
+        assert_allclose(h, expected.h_matrix, atol=1e-12)
+
+
+def test_optimal_rotation_matrices():
+    sources = np.random.randn(3, 5, 3)
+    targets = np.random.randn(3, 5, 3)
+    rotations = optimal_rotation_matrices(sources, targets)
+    for s, t, r in zip(sources, targets, rotations):
+        expected = AlignmentRotation(PointCloud(s), PointCloud(t))
+        assert_allclose(r, expected.rotation_matrix)
+
+
+def test_alignment_similarities():
+    sources = [PointCloud(p) for p in np.random.randn(3, 6, 2)]
+    targets = [PointCloud(p) for p in np.random.randn(3, 6, 2)]
+    alignments = alignment_similarities(sources, targets)
+    for s, t, a in zip(sources, targets, alignments):
+        assert type(a) == AlignmentSimilarity
+        assert a.source is s
+        assert a.target is t
+        assert_allclose(a.h_matrix, AlignmentSimilarity(s, t).h_matrix)
+
+
+def test_alignment_affines_shared_target():
+    sources = [PointCloud(p) for p in np.random.randn(3, 6, 2)]
+    target = PointCloud(np.random.randn(6, 2))
+    alignments = alignment_affines(sources, target)
+    for s, a in zip(sources, alignments):
+        assert type(a) == AlignmentAffine
+        assert a.target is target
+        assert_allclose(a.h_matrix, AlignmentAffine(s, target).h_matrix,
+                        atol=1e-12)
+        # the alignments remain fully functional
+        a.set_target(s)
+        assert_allclose(a.h_matrix, np.eye(3), atol=1e-10)
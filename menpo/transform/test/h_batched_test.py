@@ -0,0 +1,72 @@
+import numpy as np
+from numpy.testing import assert_allclose
+from menpo.transform import (Homogeneous, Affine, Similarity,
+                             apply_h_matrices, compose_h_matrices_before,
+                             pseudoinverse_h_matrices,
+                             h_matrices_from_transforms,
+                             transforms_from_h_matrices)
+
+
+def random_affine_h_matrices(n, n_dims=2):
+    h = np.tile(np.eye(n_dims + 1), [n, 1, 1])
+    h[:, :-1] += np.random.randn(n, n_dims, n_dims + 1) * 0.1
+    return h
+
+
+def test_apply_h_matrices():
+    h = random_affine_h_matrices(5)
+    points = np.random.randn(5, 10, 2)
+    result = apply_h_matrices(h, points)
+    for h_i, p_i, r_i in zip(h, points, result):
+        assert_allclose(r_i, Affine(h_i).apply(p_i))
+
+
+def test_apply_h_matrices_projective():
+    h = random_affine_h_matrices(4, n_dims=3)
+    h[:, -1, :-1] = np.random.rand(4, 3) * 0.1
+    points = np.random.randn(4, 7, 3)
+    result = apply_h_matrices(h, points)
+    for h_i, p_i, r_i in zip(h, points, result):
+        assert_allclose(r_i, Homogeneous(h_i).apply(p_i))
+
+
+def test_apply_h_matrices_broadcast_points():
+    h = random_affine_h_matrices(3)
+    points = np.random.randn(10, 2)
+    result = apply_h_matrices(h, points)
+    assert result.shape == (3, 10, 2)
+    assert_allclose(result[1], Affine(h[1]).apply(points))
+
+
+def test_compose_h_matrices_before():
+    a = random_affine_h_matrices(4)
+    b = random_affine_h_matrices(4)
+    result = compose_h_matrices_before(a, b)
+    for a_i, b_i, r_i in zip(a, b, result):
+        expected = Affine(a_i).compose_before(Affine(b_i)).h_matrix
+        assert_allclose(r_i, expected)
+
+
+def test_pseudoinverse_h_matrices():
+    h = random_affine_h_matrices(4)
+    result = pseudoinverse_h_matrices(h)
+    for h_i, r_i in zip(h, result):
+        assert_allclose(r_i, Affine(h_i).pseudoinverse().h_matrix)
+
+
+def test_h_matrices_round_trip():
+    h = random_affine_h_matrices(3)
+    transforms = transforms_from_h_matrices(h, transform_cls=Affine)
+    assert all(type(t) == Affine for t in transforms)
+    assert_allclose(h_matrices_from_transforms(transforms), h)
+
+
+def test_transforms_from_h_matrices_default_homogeneous():
+    transforms = transforms_from_h_matrices(np.tile(np.eye(3), [2, 1, 1]))
+    assert all(type(t) == Homogeneous for t in transforms)
+
+
+def test_h_matrices_from_similarities():
+    s = [Similarity.init_identity(2), Similarity.init_identity(2)]
+    assert_allclose(h_matrices_from_transforms(s), np.tile(np.eye(3),
+                                                           [2, 1, 1]))
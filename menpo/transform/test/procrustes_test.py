@@ -2,7 +2,8 @@ import numpy as np
 from numpy.testing import assert_allclose
 
 from menpo.shape import PointCloud
-from menpo.transform import GeneralizedProcrustesAnalysis
+from menpo.transform import (GeneralizedProcrustesAnalysis,
+                             AlignmentSimilarity)
 
 
 def test_procrustes_no_target():
@@ -56,3 +57,27 @@ def test_procrustes_with_target():
     mean = np.array([[2.0, -0.5], [4.5, 1.8], [6.0, 0.5], [3.5, -1.8]])
     assert_allclose(np.around(gpa.mean_aligned_shape().points, decimals=1),
                     mean)
+
+
+def test_procrustes_n_threads_matches_single_thread():
+    np.random.seed(0)
+    base = np.random.randn(10, 2)
+    sources = [PointCloud(base + np.random.randn(10, 2) * 0.1)
+               for _ in range(20)]
+    gpa = GeneralizedProcrustesAnalysis(sources)
+    gpa_threaded = GeneralizedProcrustesAnalysis(sources, n_threads=3)
+    assert(gpa.n_iterations == gpa_threaded.n_iterations)
+    assert_allclose(gpa.target.points, gpa_threaded.target.points)
+    for t, t_threaded in zip(gpa.transforms, gpa_threaded.transforms):
+        assert_allclose(t.h_matrix, t_threaded.h_matrix)
+
+
+def test_procrustes_transforms_are_optimal_alignments():
+    np.random.seed(0)
+    base = np.random.randn(10, 2)
+    sources = [PointCloud(base + np.random.randn(10, 2) * 0.1)
+               for _ in range(5)]
+    gpa = GeneralizedProcrustesAnalysis(sources)
+    for t, source in zip(gpa.transforms, sources):
+        expected = AlignmentSimilarity(source, t.target)
+        assert_allclose(t.h_matrix, expected.h_matrix)
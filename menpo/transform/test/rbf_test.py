@@ -1,6 +1,8 @@
 from numpy.testing import assert_allclose
 import numpy as np
+from nose.tools import raises
 from menpo.transform import R2LogR2RBF, R2LogRRBF
+from menpo.transform.rbf import rbf_block_size
 
 centers = np.array([[-1.0, -1.0], [-1, 1], [1, -1], [1, 1]])
 points = np.array([[-0.4, -1.5], [-0.1, 1.1], [0.1, -2], [2.3, 0.3]])
@@ -22,3 +24,28 @@ def test_rbf_r2logr_apply():
                          [0.87625673, 11.86079176, 0.53696079, 11.20008815],
                          [15.9269609, 13.83726877, 2.05820995, 0.84946412]])
     assert_allclose(result, expected)
+
+
+def test_rbf_r2logr2_apply_dot_blocked():
+    rbf = R2LogR2RBF(centers)
+    weights = np.arange(8, dtype=np.float).reshape([4, 2])
+    # a budget of a single byte forces a block size of one point
+    result = rbf.apply_dot(points, weights, max_memory=1)
+    assert_allclose(result, rbf.apply(points).dot(weights))
+
+
+def test_rbf_r2logr_apply_dot_blocked():
+    rbf = R2LogRRBF(centers)
+    weights = np.arange(8, dtype=np.float).reshape([4, 2])
+    result = rbf.apply_dot(points, weights, max_memory=100)
+    assert_allclose(result, rbf.apply(points).dot(weights))
+
+
+@raises(ValueError)
+def test_rbf_apply_dot_wrong_n_weights_raises_value_error():
+    R2LogR2RBF(centers).apply_dot(points, np.ones([3, 2]))
+
+
+def test_rbf_block_size():
+    assert rbf_block_size(4, max_memory=1) == 1
+    assert rbf_block_size(4, max_memory=4 * 2 * 8 * 10) == 10
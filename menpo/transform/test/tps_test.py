@@ -1,5 +1,6 @@
 import numpy as np
 from numpy.testing import assert_allclose
+from nose.tools import raises
 
 from menpo.transform.thinplatesplines import ThinPlateSplines
 from menpo.shape import PointCloud
@@ -67,3 +68,33 @@ def test_tps_apply_batched():
     result = tps.apply(pts, batch_size=2)
     expected = np.array([[-0.2, -2.], [-1., 2.], [4.2, -5.]])
     assert_allclose(result.points, expected)
+
+
+def test_tps_apply_max_memory():
+    tps = ThinPlateSplines(src, tgt_perturbed)
+    result = tps.apply(square_sample_points, max_memory=1000)
+    expected = tps.apply(square_sample_points)
+    assert_allclose(result, expected)
+
+
+def test_tps_apply_to_grid_exact():
+    tps = ThinPlateSplines(src, tgt_perturbed)
+    grid = np.indices((7, 9)).reshape([2, -1]).T
+    assert_allclose(tps.apply_to_grid((7, 9)), tps.apply(grid))
+
+
+def test_tps_apply_to_grid_approx_within_tolerance():
+    s = PointCloud(np.array([[0., 0], [0, 100], [100, 0], [100, 100],
+                             [40, 60]]))
+    t = PointCloud(s.points + np.array([[1., 2], [-2, 1], [0, 3], [2, -1],
+                                        [4, -4]]))
+    tps = ThinPlateSplines(s, t)
+    grid = np.indices((101, 121)).reshape([2, -1]).T
+    result = tps.apply_to_grid((101, 121), tolerance=0.05)
+    error = np.sqrt(np.sum((result - tps.apply(grid)) ** 2, axis=1))
+    assert np.max(error) < 0.1
+
+
+@raises(ValueError)
+def test_tps_apply_to_grid_3d_raises_value_error():
+    ThinPlateSplines(src, tgt).apply_to_grid((2, 3, 4))
@@ -69,14 +69,20 @@ class ThinPlateSplines(Alignment, Transform, Invertible):
         # coefficients.
         self._build_coefficients()
 
-    def _apply(self, points, **kwargs):
+    def _apply(self, points, max_memory=None, **kwargs):
         r"""
         Performs a TPS transform on the given points.
 
+        The kernel is evaluated in blocks of points so that the full
+        ``(N, n_centres)`` kernel matrix is never held in memory.
+
         Parameters
         ----------
         points : ``(N, D)`` `ndarray`
             The points to transform.
+        max_memory : `int`, optional
+            The upper bound (in bytes) on the memory used by the kernel
+            temporaries. If ``None``, the kernel's default budget is used.
 
         Returns
         -------
@@ -90,23 +96,74 @@ class ThinPlateSplines(Alignment, Transform, Invertible):
         """
         if points.shape[1] != self.n_dims:
             raise ValueError('TPS can only be applied to 2D data.')
-        x = points[..., 0][:, None]
-        y = points[..., 1][:, None]
-        # calculate the affine coefficients of the warp
-        # (C = Constant component, then X, Y respectively)
-        c_affine_c = self.coefficients[-3]
-        c_affine_x = self.coefficients[-2]
-        c_affine_y = self.coefficients[-1]
-        # the affine warp component
-        f_affine = c_affine_c + c_affine_x * x + c_affine_y * y
-        # calculate a distance matrix (for L2 Norm) between every source
-        # and the target
-        kernel_dist = self.kernel.apply(points)
         # grab the affine free components of the warp
         c_affine_free = self.coefficients[:-3]
-        # build the affine free warp component
-        f_affine_free = kernel_dist.dot(c_affine_free)
-        return f_affine + f_affine_free
+        # build the affine free warp component by streaming the points
+        # through the kernel (distance + kernel + dot fused per block)
+        f = self.kernel.apply_dot(points, c_affine_free,
+                                  max_memory=max_memory)
+        # add the affine component of the warp inplace
+        # (C = Constant component, then X, Y respectively)
+        f += self.coefficients[-3]
+        f += points[:, :1] * self.coefficients[-2]
+        f += points[:, 1:2] * self.coefficients[-1]
+        return f
+
+    def apply_to_grid(self, shape, tolerance=None, initial_step=32,
+                      max_memory=None):
+        r"""
+        Applies the TPS to the index of every pixel of a grid of the given
+        shape.
+
+        As the TPS is smooth, the transform can be approximated by
+        evaluating it exactly on a coarse grid of control points and
+        bilinearly interpolating the result to every pixel. The spacing of
+        the coarse grid is halved until the error of the interpolation,
+        estimated at the centre of each coarse cell (where bilinear
+        interpolation is least accurate), is below ``tolerance``. If the
+        spacing reaches a single pixel the exact transform is used.
+
+        Parameters
+        ----------
+        shape : ``(2,)`` `tuple` or `ndarray`
+            The shape of the grid.
+        tolerance : `float`, optional
+            The allowed error (in pixels) of the approximation, as estimated
+            at the cell centres - not a bound on the error at every pixel.
+            If ``None``, the transform is evaluated exactly at every pixel.
+        initial_step : `int`, optional
+            The spacing (in pixels) of the first coarse grid that is tried.
+        max_memory : `int`, optional
+            The upper bound (in bytes) on the memory used by the kernel
+            temporaries. If ``None``, the kernel's default budget is used.
+
+        Returns
+        -------
+        f : ``(prod(shape), 2)`` `ndarray`
+            The transformed pixel indices, in the same (C) order as
+            ``np.indices(shape)``.
+        """
+        shape = tuple(int(s) for s in shape)
+        if len(shape) != self.n_dims:
+            raise ValueError('TPS can only be applied to 2D grids.')
+        step = int(initial_step)
+        while tolerance is not None and step > 1 and min(shape) > 1:
+            knots = [_grid_knots(n, step) for n in shape]
+            coarse = self._apply(_grid_points(*knots), max_memory=max_memory)
+            coarse = coarse.reshape(tuple(k.size for k in knots) + (2,))
+            centres = [(k[:-1] + k[1:]) / 2.0 for k in knots]
+            exact = self._apply(_grid_points(*centres), max_memory=max_memory)
+            # bilinear interpolation at the centre of each cell is the mean
+            # of its corners
+            approx = (coarse[:-1, :-1] + coarse[:-1, 1:] +
+                      coarse[1:, :-1] + coarse[1:, 1:]) / 4.0
+            error = np.max(np.sqrt(np.sum(
+                (approx.reshape([-1, 2]) - exact) ** 2, axis=1)))
+            if error <= tolerance:
+                return _bilinear_upsample(coarse, knots, shape)
+            step //= 2
+        return self._apply(_grid_points(*[np.arange(n) for n in shape]),
+                           max_memory=max_memory)
 
     @property
     def has_true_inverse(self):
@@ -125,3 +182,40 @@ class ThinPlateSplines(Alignment, Transform, Invertible):
         :type: ``type(self)``
         """
         return ThinPlateSplines(self.target, self.source, kernel=self.kernel)
+
+
+def _grid_knots(n, step):
+    # knots spaced every step pixels, always including the last pixel
+    knots = np.arange(0, n, step)
+    if knots[-1] != n - 1:
+        knots = np.append(knots, n - 1)
+    return knots
+
+
+def _grid_points(y, x):
+    # the (len(y) * len(x), 2) points of the grid in C order
+    points = np.empty((y.size, x.size, 2))
+    points[..., 0] = y[:, None]
+    points[..., 1] = x[None, :]
+    return points.reshape([-1, 2])
+
+
+def _interpolation_weights(knots, n):
+    # for every pixel along an axis the index of the knot to the left and
+    # the linear weight of the knot to the right
+    left = np.searchsorted(knots, np.arange(n), side='right') - 1
+    left = np.clip(left, 0, knots.size - 2)
+    width = knots[left + 1] - knots[left]
+    return left, (np.arange(n) - knots[left]) / width.astype(np.float)
+
+
+def _bilinear_upsample(coarse, knots, shape):
+    # separably interpolate a (n_knots_y, n_knots_x, 2) field to every
+    # pixel of a grid of the given shape
+    (y_l, y_w), (x_l, x_w) = [_interpolation_weights(k, n)
+                              for k, n in zip(knots, shape)]
+    rows = coarse[y_l] * (1 - y_w)[:, None, None]
+    rows += coarse[y_l + 1] * y_w[:, None, None]
+    f = rows[:, x_l] * (1 - x_w)[None, :, None]
+    f += rows[:, x_l + 1] * x_w[None, :, None]
+    return f.reshape([-1, 2])